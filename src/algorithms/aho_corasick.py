@@ -28,26 +28,39 @@ def build_failure_links(root):
             child['output'] += child['fail']['output']
             queue.append(child)
 
+class AhoCorasickAutomaton:
+    """
+    Automaton built once from a set of patterns and reused for many texts.
+    Patterns are matched case-insensitively; the text passed in is lowercased.
+    """
+
+    def __init__(self, patterns):
+        # Pola duplikat hanya dimasukkan sekali agar output tidak berulang
+        self.patterns = list(dict.fromkeys(p.lower() for p in patterns if p))
+        self.root = build_trie(self.patterns)
+        build_failure_links(self.root)
+
+    def iter_matches(self, text, lowercase=True):
+        """Yield (start_position, pattern) for every (possibly overlapping) occurrence"""
+        root = self.root
+        node = root
+        if lowercase:
+            text = text.lower()
+        for index, char in enumerate(text):
+            while node is not None and char not in node['children']:
+                node = node['fail']
+            if node is None:
+                node = root
+                continue
+            node = node['children'][char]
+            for match in node['output']:
+                yield index - len(match) + 1, match
+
+    def search(self, text):
+        return [{'pattern': match, 'position': position} for position, match in self.iter_matches(text)]
+
 def aho_corasick_search(text, patterns):
-    root = build_trie(patterns)
-    build_failure_links(root)
-
-    results = []
-    node = root
-    text = text.lower()
-    for index, char in enumerate(text):
-        while node is not None and char not in node['children']:
-            node = node['fail']
-        if node is None:
-            node = root
-            continue
-        node = node['children'][char]
-        for match in node['output']:
-            results.append({
-                'pattern': match,
-                'position': index - len(match) + 1
-            })
-    return results
+    return AhoCorasickAutomaton(patterns).search(text)
 
 if __name__ == "__main__":
     text = "This example shows how Aho-Corasick works for multi-pattern search."
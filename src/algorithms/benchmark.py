@@ -0,0 +1,60 @@
+"""
+Correctness check and micro-benchmark of the single-pattern engines.
+
+Run from src/:
+    python -m algorithms.benchmark
+Every engine must return exactly the positions found by KMP on every workload;
+the table then shows the best-of-N time per engine in milliseconds.
+"""
+import random
+import time
+
+from utils.search_engine import SINGLE_PATTERN_ENGINES, get_single_pattern_search
+
+REPEATS = 5
+
+
+def _natural_text(size, rng):
+    words = ["python", "java", "javascript", "experience", "project", "team", "developed",
+             "university", "machine", "learning", "data", "analysis", "sql", "system", "design"]
+    return " ".join(rng.choice(words) for _ in range(size // 7))[:size]
+
+
+def _repetitive_text(size, rng):
+    return "".join(rng.choice("ab") for _ in range(size))
+
+
+def workloads(rng):
+    natural = _natural_text(50000, rng)
+    repetitive = _repetitive_text(50000, rng)
+    return [
+        ("natural, short keyword", natural, "sql"),
+        ("natural, medium keyword", natural, "javascript"),
+        ("natural, long keyword", natural, "machine learning data analysis"),
+        ("natural, absent keyword", natural, "kubernetes"),
+        ("repetitive, short keyword", repetitive, "aab"),
+        ("repetitive, long keyword", repetitive, "abababaabb" * 2),
+        ("single character run", "a" * 50000, "a" * 20),
+    ]
+
+
+def run(seed=0):
+    rng = random.Random(seed)
+    engines = {name: get_single_pattern_search(name) for name in SINGLE_PATTERN_ENGINES}
+    width = max(len(name) for name in engines)
+
+    for label, text, pattern in workloads(rng):
+        expected = engines["KMP"](text, pattern)
+        print(f"\n{label} (n={len(text)}, m={len(pattern)}, {len(expected)} matches)")
+        for name, search in engines.items():
+            best = float("inf")
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                result = search(text, pattern)
+                best = min(best, time.perf_counter() - start)
+            status = "ok" if result == expected else "MISMATCH"
+            print(f"  {name:<{width}}  {best * 1000:8.2f} ms  {status}")
+
+
+if __name__ == "__main__":
+    run()
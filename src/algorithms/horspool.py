@@ -0,0 +1,37 @@
+def build_shift_table(pattern):
+    """Shift for each character of pattern[:-1]: distance from its last occurrence to the end"""
+    m = len(pattern)
+    shift = {}
+    for i in range(m - 1):
+        shift[pattern[i]] = m - 1 - i
+    return shift
+
+def horspool_search(text, pattern):
+    """
+    Boyer-Moore-Horspool string searching algorithm
+    Returns list of starting positions where pattern is found in text
+    """
+    if not pattern or not text:
+        return []
+    
+    text = text.lower()
+    pattern = pattern.lower()
+    
+    n = len(text)
+    m = len(pattern)
+    
+    shift = build_shift_table(pattern)
+    last_char = pattern[-1]
+    
+    matches = []
+    s = 0
+    
+    while s <= n - m:
+        c = text[s + m - 1]
+        # Check the last character first, then compare the full window
+        if c == last_char and text.startswith(pattern, s):
+            matches.append(s)
+        # Shift by the text character under the last pattern position
+        s += shift.get(c, m)
+        
+    return matches
@@ -26,17 +26,61 @@ def levenshtein_distance(s1: str, s2: str) -> int:
             
     return dp[m][n]
 
-def find_most_similar(keyword: str, text: str, threshold: int = 2) -> list[str]:
-    words = text.lower().split()
-    similar_words = []
-    
-    for word in words:
-        # Menghapus tanda baca umum dari kata
-        cleaned_word = ''.join(filter(str.isalnum, word))
-        if levenshtein_distance(keyword, cleaned_word) <= threshold:
-            similar_words.append(cleaned_word)
-            
-    return list(set(similar_words))
+def _encode_words(words: list[str]):
+    """
+    Mengubah daftar kata menjadi matriks kode karakter (N x L) yang di-padding 0.
+    Jika semua kata ASCII dipakai uint8, selain itu uint32 (code point UTF-32).
+    Mengembalikan (matriks, panjang tiap kata).
+    """
+    import numpy as np
+
+    max_len = max(1, max(len(word) for word in words))
+    lengths = np.fromiter((len(word) for word in words), dtype=np.int64, count=len(words))
+    if all(word.isascii() for word in words):
+        encoded = np.array([word.encode('ascii') for word in words], dtype=f'S{max_len}')
+        return encoded.view(np.uint8).reshape(len(words), max_len), lengths
+    encoded = np.array(words, dtype=f'<U{max_len}')
+    return encoded.view(np.uint32).reshape(len(words), max_len), lengths
+
+def levenshtein_batch(keyword: str, words: list[str]):
+    """
+    Menghitung Levenshtein distance antara satu keyword dan banyak kata sekaligus
+    dengan NumPy. Setiap baris DP dihitung untuk semua kata dalam satu operasi
+    vektor; dependensi insertion (dari kiri) diselesaikan dengan running minimum,
+    sehingga hanya ada len(keyword) iterasi Python.
+    Mengembalikan array int distance dengan urutan yang sama seperti `words`.
+    """
+    import numpy as np
+
+    if not words:
+        return np.zeros(0, dtype=np.int32)
+
+    keyword = keyword.lower()
+    words = [word.lower() for word in words]
+    encoded, lengths = _encode_words(words)
+    n_words, max_len = encoded.shape
+
+    cols = np.arange(max_len + 1, dtype=np.int32)
+    prev = np.broadcast_to(cols, (n_words, max_len + 1)).copy()  # dp[0][j] = j
+    cur = np.empty_like(prev)
+
+    for i, char in enumerate(keyword, 1):
+        code = ord(char)
+        if encoded.dtype == np.uint8 and code > 0x7F:
+            cost = np.ones(encoded.shape, dtype=np.int32)  # tidak mungkin sama dengan kata ASCII
+        else:
+            cost = (encoded != code).astype(np.int32)
+        cur[:, 0] = i
+        # deletion (dari atas) dan substitution (diagonal)
+        np.minimum(prev[:, 1:] + 1, prev[:, :-1] + cost, out=cur[:, 1:])
+        # insertion: dp[i][j] = min_k(dp'[i][k] + (j - k)) = j + cummin(dp'[i][k] - k)
+        cur -= cols
+        np.minimum.accumulate(cur, axis=1, out=cur)
+        cur += cols
+        prev, cur = cur, prev
+
+    # Distance tiap kata diambil pada kolom sepanjang kata itu sendiri (length mask)
+    return prev[np.arange(n_words), lengths]
 
 def calculate_dynamic_threshold(keyword: str) -> int:
 
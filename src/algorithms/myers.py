@@ -0,0 +1,117 @@
+def build_peq(patterns, lane_offsets):
+    """
+    Match masks for the packed patterns: bit (offset + i) of peq[char] is 1
+    where pattern[i] is that character
+    """
+    peq = {}
+    for pattern, offset in zip(patterns, lane_offsets):
+        for i, char in enumerate(pattern):
+            peq[char] = peq.get(char, 0) | (1 << (offset + i))
+    return peq
+
+def myers_search_many(text, patterns, max_edits):
+    """
+    Myers' bit-parallel approximate string matching (Hyyro's formulation of
+    the Sellers DP) for several patterns in one pass over the text.
+    Each pattern occupies its own lane of bits in a single integer; lane-wise
+    addition and masked shifts keep carries from crossing lanes, so every
+    text character costs a constant number of big-integer operations
+    whatever the number of patterns.
+    max_edits is one edit budget per pattern; a pattern listed more than once
+    is searched once and must have the same budget every time (ValueError otherwise).
+    Returns {pattern: list of end positions (inclusive) where a substring of
+    text is within max_edits Levenshtein edits of the pattern}
+    """
+    if len(patterns) != len(max_edits):
+        raise ValueError(f"{len(patterns)} patterns but {len(max_edits)} edit budgets")
+    results = {pattern: [] for pattern in patterns}
+    budgets = {}
+    for pattern, k in zip(patterns, max_edits):
+        if not pattern:
+            continue
+        if budgets.setdefault(pattern, k) != k:
+            raise ValueError(f"Pattern {pattern!r} given with edit budgets {budgets[pattern]} and {k}")
+    lanes = [(pattern.lower(), k) for pattern, k in budgets.items()]
+    lane_results = [results[pattern] for pattern in budgets]
+    if not lanes or not text:
+        return results
+
+    text = text.lower()
+    lane_offsets = []
+    offset = 0
+    for pattern, _ in lanes:
+        lane_offsets.append(offset)
+        offset += len(pattern)
+    all_ones = (1 << offset) - 1
+    low_bits = 0   # lowest bit of every lane
+    high_bits = 0  # highest bit of every lane (the last row of each DP column)
+    lane_of_high_bit = {}
+    for lane, ((pattern, _), lane_offset) in enumerate(zip(lanes, lane_offsets)):
+        low_bits |= 1 << lane_offset
+        high_bit = 1 << (lane_offset + len(pattern) - 1)
+        high_bits |= high_bit
+        lane_of_high_bit[high_bit] = lane
+    not_high = all_ones & ~high_bits
+    shift_mask = all_ones & ~low_bits
+    peq = build_peq([pattern for pattern, _ in lanes], lane_offsets)
+
+    # Distance of each whole pattern to the best substring ending at the current position
+    scores = [len(pattern) for pattern, _ in lanes]
+    limits = [k for _, k in lanes]
+    matching = {lane for lane in range(len(lanes)) if scores[lane] <= limits[lane]}
+
+    pv = all_ones  # vertical +1 deltas
+    mv = 0         # vertical -1 deltas
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        carry_free = eq & pv
+        # ((eq & pv) + pv) computed lane by lane: high bits are added without carry-out
+        added = ((carry_free & not_high) + (pv & not_high)) ^ ((carry_free ^ pv) & high_bits)
+        xh = (added ^ pv) | eq
+        ph = mv | (~(xh | pv) & all_ones)
+        mh = pv & xh
+
+        changed = (ph | mh) & high_bits
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            lane = lane_of_high_bit[bit]
+            scores[lane] += 1 if ph & bit else -1
+            if scores[lane] <= limits[lane]:
+                matching.add(lane)
+            else:
+                matching.discard(lane)
+        for lane in matching:
+            lane_results[lane].append(j)
+
+        # Row 0 of the Sellers DP is all zeros, so nothing is shifted in
+        ph = (ph << 1) & shift_mask
+        mh = (mh << 1) & shift_mask
+        pv = mh | (~(xv | ph) & all_ones)
+        mv = ph & xv
+
+    return results
+
+def myers_search(text, pattern, max_edits):
+    """
+    Myers' bit-parallel approximate string matching
+    Returns list of end positions (inclusive) where a substring of text is
+    within max_edits Levenshtein edits of the pattern
+    """
+    return myers_search_many(text, [pattern], [max_edits])[pattern]
+
+def count_occurrences(end_positions, pattern_length, max_edits):
+    """
+    Collapse end positions into occurrences: one approximate occurrence ends at
+    several neighbouring positions, while two separate occurrences end at
+    least pattern_length - max_edits characters apart
+    """
+    min_gap = max(1, pattern_length - max_edits)
+    count = 0
+    last_end = None
+    for end in end_positions:
+        if last_end is None or end - last_end >= min_gap:
+            count += 1
+            last_end = end
+    return count
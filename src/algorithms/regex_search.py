@@ -1,83 +1,543 @@
+import multiprocessing
 import re
-from typing import List, Dict
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+# The parser behind re.compile, used to inspect patterns before running them
+import re._parser as _sre_parser
+import re._constants as _sre_constants
+
+_POSSESSIVE_REPEAT = getattr(_sre_constants, 'POSSESSIVE_REPEAT', None)
+_ATOMIC_GROUP = getattr(_sre_constants, 'ATOMIC_GROUP', None)
+
+MAX_PATTERN_LENGTH = 500
+# More adjacent unbounded repeats over overlapping characters than this (e.g. \w*\w*\w*) are rejected
+MAX_ADJACENT_OVERLAPPING_REPEATS = 2
+PATTERN_CACHE_SIZE = 128
+# Extra time the sandbox gets past the budget to report what it found before it is killed
+SANDBOX_GRACE = 0.05
+
+class RegexPatternError(ValueError):
+    """Raised for patterns that are invalid or considered too expensive to run"""
+
+def analyze_pattern_complexity(pattern: str) -> List[str]:
+    """
+    Inspect a pattern's parse tree for constructs that can backtrack
+    catastrophically, before it is ever run against a document.
+    Returns a list of problems (empty if the pattern looks safe).
+    """
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        return [f"pattern lebih dari {MAX_PATTERN_LENGTH} karakter"]
+    try:
+        parsed = _sre_parser.parse(pattern)
+    except re.error as e:
+        return [f"regex tidak valid: {e}"]
+
+    problems = []
+    _walk_pattern(parsed, False, problems)
+    return list(dict.fromkeys(problems))
+
+def _is_unbounded(max_count) -> bool:
+    return max_count == _sre_constants.MAXREPEAT or max_count > 1000
+
+def _first_literal(items):
+    """First literal character of a sub-pattern, or None if it does not start with one"""
+    for op, av in items:
+        if op is _sre_constants.LITERAL:
+            return av
+        if op is _sre_constants.SUBPATTERN:
+            return _first_literal(av[-1])
+        return None
+    return None
+
+def _class_matches(char: str, items) -> bool:
+    """Whether a character falls in a [...] class (or category) of the parse tree"""
+    code = ord(char)
+    negate = False
+    matched = False
+    for op, av in items:
+        if op is _sre_constants.NEGATE:
+            negate = True
+        elif op is _sre_constants.LITERAL:
+            matched = matched or code == av
+        elif op is _sre_constants.RANGE:
+            matched = matched or av[0] <= code <= av[1]
+        elif op is _sre_constants.CATEGORY:
+            category = _CATEGORY_TESTS.get(av)
+            # Unknown categories are assumed to match (conservative)
+            matched = matched or category is None or category(char)
+        else:
+            matched = True
+    return matched != negate
+
+_CATEGORY_TESTS = {
+    _sre_constants.CATEGORY_DIGIT: str.isdigit,
+    _sre_constants.CATEGORY_NOT_DIGIT: lambda c: not c.isdigit(),
+    _sre_constants.CATEGORY_SPACE: str.isspace,
+    _sre_constants.CATEGORY_NOT_SPACE: lambda c: not c.isspace(),
+    _sre_constants.CATEGORY_WORD: lambda c: c.isalnum() or c == "_",
+    _sre_constants.CATEGORY_NOT_WORD: lambda c: not (c.isalnum() or c == "_"),
+}
+# Representative characters used to decide whether two repeats can consume the same input
+_PROBE_CHARS = [chr(code) for code in range(32, 127)] + ["\n", "\t", "é", "ß", "中", "\u00a0"]
+
+def _char_set(items) -> frozenset:
+    """
+    Probe characters a sub-pattern can consume anywhere (case-folded, as
+    patterns run with IGNORECASE); constructs that are not understood are
+    assumed to match everything.
+    """
+    chars = set()
+    for op, av in items:
+        if op is _sre_constants.LITERAL:
+            chars.add(chr(av))
+        elif op is _sre_constants.NOT_LITERAL:
+            chars.update(c for c in _PROBE_CHARS if ord(c) != av)
+        elif op is _sre_constants.ANY:
+            chars.update(c for c in _PROBE_CHARS if c != "\n")
+        elif op is _sre_constants.IN:
+            chars.update(c for c in _PROBE_CHARS if _class_matches(c, av))
+        elif op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT) or op in (_POSSESSIVE_REPEAT,):
+            chars |= _char_set(av[2])
+        elif op is _sre_constants.SUBPATTERN or op is _ATOMIC_GROUP:
+            chars |= _char_set(av[-1] if op is _sre_constants.SUBPATTERN else av)
+        elif op is _sre_constants.BRANCH:
+            for alternative in av[1]:
+                chars |= _char_set(alternative)
+        elif op is _sre_constants.AT or op in (_sre_constants.ASSERT, _sre_constants.ASSERT_NOT):
+            continue  # zero-width
+        else:
+            chars.update(_PROBE_CHARS)
+    return frozenset(c.lower() for c in chars)
+
+def _walk_pattern(items, in_repeat, problems: List[str]):
+    """
+    in_repeat is None outside any repeat, "unbounded" inside * / + / {n,},
+    "counted" inside a bounded repeat such as {12}: an unbounded repeat inside
+    either kind multiplies the ways the input can be split between iterations.
+    """
+    # Per character: how many adjacent unbounded repeats of this sequence can consume it
+    contenders = {}
+    for op, av in items:
+        if op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT):
+            _, max_count, sub = av
+            unbounded = _is_unbounded(max_count)
+            if unbounded and in_repeat == "unbounded":
+                problems.append("quantifier bersarang (mis. (a+)+) dapat menyebabkan backtracking eksponensial")
+            elif unbounded and in_repeat == "counted":
+                problems.append("quantifier tak terbatas di dalam pengulangan berhitung (mis. (.*a){12}) "
+                                "dapat menyebabkan backtracking eksponensial")
+            if unbounded:
+                for char in _char_set(sub):
+                    contenders[char] = contenders.get(char, 0) + 1
+                if contenders and max(contenders.values()) > MAX_ADJACENT_OVERLAPPING_REPEATS:
+                    problems.append("quantifier tak terbatas berurutan yang tumpang tindih (mis. \\w*\\w*\\w*) "
+                                    "dapat menyebabkan backtracking polinomial berderajat tinggi")
+            else:
+                contenders = {}
+            if unbounded:
+                inner = "unbounded"
+            elif max_count > 1:
+                inner = in_repeat or "counted"
+            else:
+                inner = in_repeat
+            _walk_pattern(sub, inner, problems)
+            continue
+        if op is not _sre_constants.AT:
+            contenders = {}
+        if op is _sre_constants.BRANCH:
+            alternatives = av[1]
+            if in_repeat:
+                first_chars = [_first_literal(alt) for alt in alternatives]
+                if None in first_chars or len(set(first_chars)) != len(first_chars):
+                    problems.append("alternatif yang saling tumpang tindih di dalam quantifier (mis. (a|ab)*)")
+            for alternative in alternatives:
+                _walk_pattern(alternative, in_repeat, problems)
+        elif op is _sre_constants.SUBPATTERN:
+            _walk_pattern(av[-1], in_repeat, problems)
+        elif op in (_sre_constants.ASSERT, _sre_constants.ASSERT_NOT):
+            _walk_pattern(av[1], in_repeat, problems)
+        elif op is _sre_constants.GROUPREF or op is _sre_constants.GROUPREF_EXISTS:
+            problems.append("backreference tidak didukung pada pencarian korpus")
+        elif op in (_POSSESSIVE_REPEAT, _ATOMIC_GROUP):
+            # Possessive quantifiers / atomic groups never backtrack into themselves
+            continue
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def pattern_needs_sandbox(pattern: str) -> bool:
+    """
+    Whether a pattern that passes the complexity check can still backtrack
+    polynomially on long inputs: two or more unbounded repeats that can run
+    across whitespace (e.g. a.*b.*c), or an unbounded repeat inside a
+    lookaround. Such patterns are matched in a RegexSandbox, all others in-process.
+    """
+    try:
+        parsed = _sre_parser.parse(pattern)
+    except re.error:
+        return False
+    return _count_spanning_repeats(parsed) >= 2
+
+def _count_spanning_repeats(items) -> int:
+    count = 0
+    for op, av in items:
+        if op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT):
+            _, max_count, sub = av
+            if _is_unbounded(max_count) and " " in _char_set(sub):
+                count += 1
+            count += _count_spanning_repeats(sub)
+        elif op is _sre_constants.SUBPATTERN:
+            count += _count_spanning_repeats(av[-1])
+        elif op is _sre_constants.BRANCH:
+            count += max(_count_spanning_repeats(alternative) for alternative in av[1])
+        elif op in (_sre_constants.ASSERT, _sre_constants.ASSERT_NOT):
+            # A lookaround is re-run at every position it is reached from
+            if _count_spanning_repeats(av[1]) or _has_unbounded_repeat(av[1]):
+                count += 2
+    return count
+
+def _has_unbounded_repeat(items) -> bool:
+    for op, av in items:
+        if op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT):
+            if _is_unbounded(av[1]) or _has_unbounded_repeat(av[2]):
+                return True
+        elif op is _sre_constants.SUBPATTERN:
+            if _has_unbounded_repeat(av[-1]):
+                return True
+        elif op is _sre_constants.BRANCH:
+            if any(_has_unbounded_repeat(alternative) for alternative in av[1]):
+                return True
+    return False
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str, flags=re.IGNORECASE, check_complexity: bool = True) -> re.Pattern:
+    """
+    Compile a pattern through a bounded LRU cache.
+    Raises RegexPatternError if the pattern is invalid or fails the complexity check.
+    """
+    if check_complexity:
+        problems = analyze_pattern_complexity(pattern)
+        if problems:
+            raise RegexPatternError(f"Pattern '{pattern}' ditolak: " + "; ".join(problems))
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise RegexPatternError(f"Regex error: {e}")
+
+def regex_find_spans(text: str, pattern: str, flags=re.IGNORECASE, time_budget: Optional[float] = None,
+                     max_matches: Optional[int] = None) -> Tuple[List[Tuple[int, int]], bool]:
+    """
+    Find matches as compact (start, end) tuples.
+    The scan stops once `time_budget` seconds or `max_matches` hits are exceeded;
+    the second return value tells whether the result was truncated. The budget
+    is only checked between matches: a single runaway match attempt is not
+    interrupted here; patterns flagged by pattern_needs_sandbox() go through
+    RegexSandbox for that.
+    """
+    if not pattern or not text:
+        return [], False
+
+    compiled = compile_pattern(pattern, flags)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    spans = []
+    for match in compiled.finditer(text):
+        spans.append(match.span())
+        if max_matches is not None and len(spans) >= max_matches:
+            return spans, True
+        if deadline is not None and time.perf_counter() > deadline:
+            return spans, True
+    return spans, False
+
+def _sandbox_main(connection):
+    """Loop of the sandbox process: one (text, patterns, flags, budget) job at a time"""
+    connection.send(("ready",))
+    while True:
+        try:
+            text, patterns, flags, time_budget = connection.recv()
+        except (EOFError, OSError):
+            return
+        deadline = time.perf_counter() + time_budget
+        for pattern in patterns:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                connection.send(("expired", pattern))
+                break
+            try:
+                spans, truncated = regex_find_spans(text, pattern, flags, time_budget=remaining)
+            except RegexPatternError as e:
+                connection.send(("error", str(e)))
+                break
+            connection.send(("count", pattern, len(spans), truncated))
+            if truncated:
+                break
+        connection.send(("done",))
+
+class RegexSandbox:
+    """
+    Runs regex matching in a helper process that is killed once the time
+    budget is spent. re keeps the GIL for a whole match attempt and cannot be
+    interrupted by a timer or a signal, so this is the only way to stop a
+    pattern that backtracks catastrophically on one document.
+    The text travels over a pipe, so only patterns flagged by
+    pattern_needs_sandbox() are sent here. The process is reused across
+    calls. Once one has been killed, a booted spare is kept so that several
+    slow documents in a row do not each wait for an interpreter start-up.
+    """
+
+    def __init__(self):
+        self._current = None  # (process, connection)
+        self._spare = None
+
+    @staticmethod
+    def _spawn():
+        # spawn: the caller may be a Qt thread, where forking is not safe
+        context = multiprocessing.get_context("spawn")
+        parent_end, child_end = context.Pipe()
+        process = context.Process(target=_sandbox_main, args=(child_end,), name="regex-sandbox", daemon=True)
+        process.start()
+        child_end.close()
+        return process, parent_end
+
+    def _ensure_ready(self):
+        if self._current is not None and not self._current[0].is_alive():
+            self._kill(self._current)
+            self._current = None
+        if self._current is None:
+            if self._spare is not None and self._spare[0].is_alive():
+                # The next spare boots while this one works through the document
+                self._current, self._spare = self._spare, self._spawn()
+            else:
+                self._current = self._spawn()
+            # Interpreter start-up must not eat into the document's budget
+            self._current[1].recv()
+
+    def _replace_current(self):
+        """Kill the stuck process; a booted spare (started now if missing) takes over on the next call"""
+        self._kill(self._current)
+        self._current = None
+        if self._spare is None:
+            self._spare = self._spawn()
+
+    @staticmethod
+    def _kill(entry):
+        process, connection = entry
+        process.kill()
+        process.join()
+        connection.close()
+
+    def count_matches(self, text: str, patterns: List[str], time_budget: float,
+                      flags=re.IGNORECASE) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Count the matches of every pattern, all patterns sharing one budget.
+        Returns ({pattern: count}, patterns the budget ran out on or before).
+        Raises RegexPatternError for invalid or unsafe patterns.
+        """
+        self._ensure_ready()
+        connection = self._current[1]
+        connection.send((text, list(patterns), flags, time_budget))
+        deadline = time.perf_counter() + time_budget + SANDBOX_GRACE
+        counts = {}
+        timed_out = []
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not connection.poll(remaining):
+                # Stuck inside one match attempt: kill it, keep what was reported
+                self._replace_current()
+                break
+            message = connection.recv()
+            if message[0] == "count":
+                _, pattern, count, truncated = message
+                counts[pattern] = count
+                if truncated:
+                    timed_out.append(pattern)
+            elif message[0] == "expired":
+                timed_out.append(message[1])
+            elif message[0] == "error":
+                connection.recv()  # the "done" that follows
+                raise RegexPatternError(message[1])
+            else:
+                break
+        return counts, timed_out + [pattern for pattern in patterns if pattern not in counts and pattern not in timed_out]
+
+    def close(self):
+        for entry in (self._current, self._spare):
+            if entry is not None:
+                self._kill(entry)
+        self._current = self._spare = None
+
+_idle_sandboxes: List[RegexSandbox] = []
+_sandbox_lock = threading.Lock()
+
+@contextmanager
+def regex_sandbox():
+    """Borrow an idle RegexSandbox (one per concurrent caller), creating one if needed"""
+    with _sandbox_lock:
+        sandbox = _idle_sandboxes.pop() if _idle_sandboxes else RegexSandbox()
+    try:
+        yield sandbox
+    finally:
+        with _sandbox_lock:
+            _idle_sandboxes.append(sandbox)
 
 def regex_search(text: str, pattern: str, flags=re.IGNORECASE) -> List[Dict]:
     """
     Perform regex search on text
     Returns list of matches with positions and context
+    Raises RegexPatternError for invalid or unsafe patterns
     """
-    if not pattern or not text:
-        return []
-    
-    try:
-        matches = []
-        for match in re.finditer(pattern, text, flags):
-            start_pos = match.start()
-            end_pos = match.end()
-            matched_text = match.group()
-            
-            # Get context around the match
-            context_start = max(0, start_pos - 50)
-            context_end = min(len(text), end_pos + 50)
-            context = text[context_start:context_end]
-            
-            matches.append({
-                'position': start_pos,
-                'end_position': end_pos,
-                'match': matched_text,
-                'context': context,
-                'full_match': match
-            })
-        
-        return matches
+    spans, _ = regex_find_spans(text, pattern, flags)
+    matches = []
+    for start_pos, end_pos in spans:
+        # Get context around the match
+        context_start = max(0, start_pos - 50)
+        context_end = min(len(text), end_pos + 50)
         
-    except re.error as e:
-        print(f"Regex error: {e}")
-        return []
+        matches.append({
+            'position': start_pos,
+            'end_position': end_pos,
+            'match': text[start_pos:end_pos],
+            'context': text[context_start:context_end]
+        })
+    
+    return matches
+
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+PHONE_PATTERNS = [
+    r'\+?\d{1,4}[-.\s]?\(?\d{1,3}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}',
+    r'\(\d{3}\)\s*\d{3}-\d{4}',
+    r'\d{3}-\d{3}-\d{4}',
+    r'\d{3}\.\d{3}\.\d{4}'
+]
+DEGREE_PATTERN = r'\b(?:Bachelor|Master|PhD|MBA|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.Tech|M\.Tech)\b'
+EDUCATION_PATTERNS = [
+    DEGREE_PATTERN + r'.*?(?:\n|\.)',
+    r'\b(?:University|College|Institute)\s+of\s+\w+',
+    r'\b\d{4}\s*-\s*\d{4}\b',  # Years
+    r'\bGPA\s*:?\s*\d+\.?\d*'
+]
+DEFAULT_SKILLS = ["Python", "Java", "React", "SQL", "HTML", "CSS", "JavaScript", "Project Management", "Data Analysis"]
+
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
+_PHONE_RES = [re.compile(pattern) for pattern in PHONE_PATTERNS]
+_EDUCATION_RES = [re.compile(pattern, re.IGNORECASE) for pattern in EDUCATION_PATTERNS]
 
 def extract_email_addresses(text: str) -> List[str]:
     """Extract email addresses from text"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return re.findall(email_pattern, text)
+    return _EMAIL_RE.findall(text)
 
 def extract_phone_numbers(text: str) -> List[str]:
     """Extract phone numbers from text"""
-    phone_patterns = [
-        r'\+?\d{1,4}[-.\s]?\(?\d{1,3}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}',
-        r'\(\d{3}\)\s*\d{3}-\d{4}',
-        r'\d{3}-\d{3}-\d{4}',
-        r'\d{3}\.\d{3}\.\d{4}'
-    ]
-    
     phone_numbers = []
-    for pattern in phone_patterns:
-        phone_numbers.extend(re.findall(pattern, text))
+    for pattern in _PHONE_RES:
+        phone_numbers.extend(pattern.findall(text))
     
     return list(set(phone_numbers))  # Remove duplicates
 
+@lru_cache(maxsize=16)
+def _skills_matcher_for(skills: tuple):
+    from algorithms.skills_matcher import SkillsMatcher
+    return SkillsMatcher.from_skills(skills)
+
 def extract_skills_keywords(text: str, skills_list: List[str]) -> List[str]:
-    """Extract programming skills and technologies from text"""
-    found_skills = []
-    text_lower = text.lower()
-    
-    for skill in skills_list:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
-    
-    return found_skills
+    """
+    Extract programming skills and technologies from text.
+    Skills are matched as whole words in one Aho-Corasick pass
+    (so "Java" is not reported for "JavaScript").
+    """
+    return _skills_matcher_for(tuple(skills_list)).find_skills(text)
 
 def extract_education_info(text: str) -> List[str]:
     """Extract education-related information"""
-    education_patterns = [
-        r'\b(?:Bachelor|Master|PhD|MBA|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.Tech|M\.Tech)\b.*?(?:\n|\.)',
-        r'\b(?:University|College|Institute)\s+of\s+\w+',
-        r'\b\d{4}\s*-\s*\d{4}\b',  # Years
-        r'\bGPA\s*:?\s*\d+\.?\d*'
-    ]
-    
     education_info = []
-    for pattern in education_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        education_info.extend(matches)
+    for pattern in _EDUCATION_RES:
+        education_info.extend(pattern.findall(text))
     
     return education_info
+
+class FieldExtractor:
+    """
+    Single-pass extractor for the structured fields shown in a CV summary.
+
+    All field patterns are compiled into one alternation of named groups, so
+    the text is walked once and every hit is sorted into its field by the
+    group that matched. Where patterns overlap at the same position the
+    earlier alternative wins (e.g. "2019 - 2023" is an education year range,
+    not a phone number). Skills come from a SkillsMatcher, which makes its
+    own single pass with an Aho-Corasick automaton.
+    """
+
+    # Bump whenever patterns/skills change so cached summaries are recomputed
+    VERSION = 2
+
+    # Order matters: at a given position the first matching alternative wins
+    _FIELD_PATTERNS = [
+        ('email', EMAIL_PATTERN),
+        ('years', EDUCATION_PATTERNS[2]),
+        ('gpa', EDUCATION_PATTERNS[3]),
+        ('phone_1', PHONE_PATTERNS[1]),
+        ('phone_2', PHONE_PATTERNS[2]),
+        ('phone_3', PHONE_PATTERNS[3]),
+        ('phone_0', PHONE_PATTERNS[0]),
+        ('institution', EDUCATION_PATTERNS[1]),
+        # Only the degree keyword is consumed; the rest of the line is sliced
+        # out afterwards so hits inside it (GPA, years) are still scanned
+        ('degree', DEGREE_PATTERN),
+    ]
+
+    def __init__(self, skills_matcher=None):
+        """skills_matcher defaults to the shared taxonomy matcher (see get_skills_matcher)"""
+        if skills_matcher is None:
+            from algorithms.skills_matcher import get_skills_matcher
+            skills_matcher = get_skills_matcher()
+        self.skills_matcher = skills_matcher
+        alternatives = [f'(?P<{name}>{pattern})' for name, pattern in self._FIELD_PATTERNS]
+        self._scanner = re.compile('|'.join(alternatives), re.IGNORECASE)
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """Return {'emails', 'phones', 'skills', 'education'} found in one scan of text"""
+        emails, phones, education = [], [], []
+
+        for match in self._scanner.finditer(text):
+            field = match.lastgroup
+            if field == 'email':
+                emails.append(match.group())
+            elif field.startswith('phone_'):
+                phones.append(match.group())
+            elif field == 'degree':
+                # Same as DEGREE_PATTERN + r'.*?(?:\n|\.)': up to the first newline or period
+                end = _find_line_end(text, match.end())
+                if end != -1:
+                    education.append(text[match.start():end + 1])
+            else:
+                education.append(match.group())
+
+        return {
+            'emails': list(dict.fromkeys(emails)),
+            'phones': list(dict.fromkeys(phones)),
+            'skills': self.skills_matcher.find_skills(text),
+            'education': education,
+        }
+
+    def extract_many(self, texts: Dict) -> Dict:
+        """Batch mode: {key: text} -> {key: fields}, reusing the compiled scanner"""
+        return {key: self.extract(text) for key, text in texts.items()}
+
+def _find_line_end(text: str, start: int) -> int:
+    newline = text.find('\n', start)
+    period = text.find('.', start)
+    if newline == -1:
+        return period
+    if period == -1:
+        return newline
+    return min(newline, period)
+
+_default_extractor = None
+
+def get_field_extractor() -> FieldExtractor:
+    """Shared extractor using the skills taxonomy, compiled on first use"""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = FieldExtractor()
+    return _default_extractor
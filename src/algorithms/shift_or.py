@@ -0,0 +1,35 @@
+def build_masks(pattern):
+    """Bit mask per pattern character: bit i is 0 where pattern[i] is that character"""
+    m = len(pattern)
+    all_ones = (1 << m) - 1
+    masks = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, all_ones) & ~(1 << i)
+    return masks
+
+def shift_or_search(text, pattern):
+    """
+    Bit-parallel Shift-Or (Baeza-Yates-Gonnet) string searching algorithm
+    Every prefix of the pattern is tracked as one bit of a single integer
+    Returns list of starting positions where pattern is found in text
+    """
+    if not pattern or not text:
+        return []
+    
+    text = text.lower()
+    pattern = pattern.lower()
+    
+    m = len(pattern)
+    all_ones = (1 << m) - 1
+    found_bit = 1 << (m - 1)
+    masks = build_masks(pattern)
+    
+    matches = []
+    state = all_ones
+    
+    for i, char in enumerate(text):
+        state = ((state << 1) | masks.get(char, all_ones)) & all_ones
+        if not state & found_bit:
+            matches.append(i - m + 1)
+            
+    return matches
@@ -0,0 +1,126 @@
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+from algorithms.aho_corasick import AhoCorasickAutomaton
+
+DEFAULT_TAXONOMY_PATH = os.getenv(
+    "SKILLS_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "skills_taxonomy.txt"),
+)
+
+
+def load_taxonomy(path: str) -> Dict[str, List[str]]:
+    """
+    Load a skills taxonomy file.
+    Each non-empty line is `Canonical Name | synonym, synonym, ...`;
+    lines starting with '#' are comments.
+    Returns {canonical name: [synonyms]}.
+    """
+    taxonomy = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            canonical, _, synonyms = line.partition("|")
+            canonical = canonical.strip()
+            if canonical:
+                taxonomy[canonical] = [s.strip() for s in synonyms.split(",") if s.strip()]
+    return taxonomy
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class SkillsMatcher:
+    """
+    Detect skills in text with a single Aho-Corasick pass.
+
+    Every canonical skill name and synonym is a pattern in one prebuilt
+    automaton. A hit only counts if it is not glued to a neighbouring word
+    character (so "Java" is not found in "JavaScript"), overlapping hits are
+    resolved leftmost-longest ("machine learning" beats "learning"), and
+    synonyms are reported under their canonical name.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self.canonical_names = list(taxonomy)
+        self._canonical_of: Dict[str, str] = {}
+        for canonical, synonyms in taxonomy.items():
+            for term in [canonical, *synonyms]:
+                term = self._normalize(term)
+                if term:
+                    self._canonical_of.setdefault(term, canonical)
+        self._automaton = AhoCorasickAutomaton(self._canonical_of)
+
+    @classmethod
+    def from_skills(cls, skills_list: Iterable[str]) -> "SkillsMatcher":
+        return cls({skill: [] for skill in skills_list})
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TAXONOMY_PATH) -> "SkillsMatcher":
+        return cls(load_taxonomy(path))
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text.lower()).strip()
+
+    def find_occurrences(self, text: str, normalized: bool = False) -> List[Dict]:
+        """
+        Return non-overlapping skill hits as
+        {'skill': canonical, 'term': matched term, 'position': start}.
+        Pass normalized=True if text is already lowercased with collapsed
+        whitespace (the 'processed' CV format).
+        """
+        if not normalized:
+            text = self._normalize(text)
+
+        candidates = []
+        n = len(text)
+        for position, term in self._automaton.iter_matches(text, lowercase=False):
+            end = position + len(term)
+            if _is_word_char(term[0]) and position > 0 and _is_word_char(text[position - 1]):
+                continue
+            if _is_word_char(term[-1]) and end < n and _is_word_char(text[end]):
+                continue
+            candidates.append((position, end, term))
+
+        # Leftmost-longest, non-overlapping
+        candidates.sort(key=lambda hit: (hit[0], -hit[1]))
+        occurrences = []
+        last_end = 0
+        for position, end, term in candidates:
+            if position >= last_end:
+                occurrences.append({'skill': self._canonical_of[term], 'term': term, 'position': position})
+                last_end = end
+        return occurrences
+
+    def find_skills(self, text: str, normalized: bool = False) -> List[str]:
+        """Canonical skills present in text, in taxonomy order"""
+        found = {hit['skill'] for hit in self.find_occurrences(text, normalized)}
+        return [skill for skill in self.canonical_names if skill in found]
+
+    def find_skills_many(self, texts: Dict, normalized: bool = False) -> Dict:
+        """Batch mode for ingest: {key: text} -> {key: [skills]}"""
+        return {key: self.find_skills(text, normalized) for key, text in texts.items()}
+
+
+_default_matcher: Optional[SkillsMatcher] = None
+
+
+def get_skills_matcher() -> SkillsMatcher:
+    """
+    Shared matcher built from the taxonomy file on first use.
+    Falls back to the built-in short skills list if the file is missing.
+    """
+    global _default_matcher
+    if _default_matcher is None:
+        try:
+            _default_matcher = SkillsMatcher.from_file()
+        except OSError as e:
+            from algorithms.regex_search import DEFAULT_SKILLS
+            print(f"Skills taxonomy not available ({e}), using the built-in skills list")
+            _default_matcher = SkillsMatcher.from_skills(DEFAULT_SKILLS)
+    return _default_matcher
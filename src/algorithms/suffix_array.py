@@ -0,0 +1,219 @@
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# File layout (all little endian except the text region):
+#   header      : magic (8 bytes) | version (u32) | doc count (u32) | text length in characters (u64)
+#   doc starts  : int64 x count, offset of each document in the concatenated text
+#   doc keys    : 32 bytes x count, raw SHA-256 content hash of each document
+#   suffixes    : int32 x text length, the suffix array
+#   text        : UTF-32-BE, documents joined by SEPARATOR
+# UTF-32-BE keeps one character per 4 bytes and makes byte order equal to
+# code point order, so queries compare directly against the mapped file and
+# neither the text nor the suffix array has to be loaded into memory.
+SUFFIX_MAGIC = b"ATSSUFX\0"
+SUFFIX_VERSION = 1
+_HEADER = struct.Struct("<8sIIQ")
+_HASH_SIZE = 32
+_CHAR_SIZE = 4
+
+# Never appears in processed CV text or in a query, so no match can span two documents
+SEPARATOR = "\0"
+# Construction needs roughly 40 bytes of scratch memory per character
+DEFAULT_MAX_CHARS = 8_000_000
+
+
+def build_suffix_array(text: str) -> np.ndarray:
+    """
+    Suffix array of text by prefix doubling.
+    Each round sorts suffixes by the pair (rank of the first k characters,
+    rank of the next k characters) with one vectorized argsort, and stops as
+    soon as all ranks are distinct: O(n log n) per round, at most log n rounds.
+    """
+    n = len(text)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    _, rank = np.unique(codes, return_inverse=True)
+    rank = rank.astype(np.int64)
+
+    k = 1
+    while True:
+        second = np.zeros(n, dtype=np.int64)
+        if k < n:
+            second[:n - k] = rank[k:] + 1  # 0 means "past the end", sorts first
+        keys = rank * (n + 1) + second
+        suffixes = np.argsort(keys, kind="stable")
+        sorted_keys = keys[suffixes]
+
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[suffixes] = np.concatenate(([0], np.cumsum(sorted_keys[1:] != sorted_keys[:-1])))
+        rank = new_rank
+        if rank.max() == n - 1 or k >= n:
+            return suffixes.astype(np.int32)
+        k *= 2
+
+
+def write_suffix_index(path: str, documents: Iterable[Tuple[str, str]],
+                       max_chars: int = DEFAULT_MAX_CHARS) -> int:
+    """
+    Build a suffix index over (content_hash, processed_text) documents and
+    publish it atomically. Raises ValueError if the corpus is larger than
+    max_chars, so construction time and memory stay bounded.
+    Returns the number of documents indexed.
+    """
+    keys = []
+    parts = []
+    starts = []
+    position = 0
+    for content_hash, text in dict(documents).items():
+        text = text.replace(SEPARATOR, " ")
+        keys.append(content_hash)
+        starts.append(position)
+        parts.append(text)
+        position += len(text) + 1
+        if position > max_chars:
+            raise ValueError(f"corpus exceeds {max_chars} characters")
+
+    text = SEPARATOR.join(parts) + (SEPARATOR if parts else "")
+    suffixes = build_suffix_array(text)
+    count = len(keys)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".suffix-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(SUFFIX_MAGIC, SUFFIX_VERSION, count, len(text)))
+            f.write(struct.pack(f"<{count}q", *starts))
+            f.write(b"".join(bytes.fromhex(key) for key in keys))
+            f.write(suffixes.astype("<i4").tobytes())
+            f.write(text.encode("utf-32-be"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+class SuffixIndex:
+    """
+    Read-only, memory-mapped suffix index over the processed corpus.
+    Counting a substring takes two binary searches over the suffix array,
+    O(m log n) for a pattern of length m, independent of how many CVs there are.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count, length = _HEADER.unpack_from(self._mmap, 0)
+        except (ValueError, struct.error):
+            self._file.close()
+            raise ValueError(f"{path} is not a suffix index")
+        if magic != SUFFIX_MAGIC or version != SUFFIX_VERSION:
+            self._mmap.close()
+            self._file.close()
+            raise ValueError(f"{path} is not a version {SUFFIX_VERSION} suffix index")
+
+        position = _HEADER.size
+        self._starts = np.frombuffer(self._mmap, dtype="<i8", count=count, offset=position)
+        position += 8 * count
+        hashes = self._mmap[position:position + _HASH_SIZE * count]
+        self._keys = [hashes[i * _HASH_SIZE:(i + 1) * _HASH_SIZE].hex() for i in range(count)]
+        self._key_set = set(self._keys)
+        position += _HASH_SIZE * count
+        self._suffixes = np.frombuffer(self._mmap, dtype="<i4", count=length, offset=position)
+        self._text_offset = position + 4 * length
+        self._length = length
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_set
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def _prefix(self, rank: int, size: int) -> bytes:
+        start = self._text_offset + _CHAR_SIZE * int(self._suffixes[rank])
+        return self._mmap[start:min(start + size, self._text_offset + _CHAR_SIZE * self._length)]
+
+    def _range(self, pattern: str) -> Tuple[int, int]:
+        """[lo, hi) range of suffix ranks that start with pattern"""
+        needle = pattern.lower().encode("utf-32-be")
+        size = len(needle)
+
+        lo, hi = 0, self._length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix(mid, size) < needle:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+
+        hi = self._length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix(mid, size) <= needle:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def count(self, pattern: str) -> int:
+        """Total number of (possibly overlapping) occurrences in the corpus"""
+        if not pattern or SEPARATOR in pattern:
+            return 0
+        lo, hi = self._range(pattern)
+        return hi - lo
+
+    def count_per_doc(self, pattern: str) -> Dict[str, int]:
+        """{content_hash: occurrences} for every document containing pattern"""
+        if not pattern or SEPARATOR in pattern:
+            return {}
+        lo, hi = self._range(pattern)
+        if lo == hi:
+            return {}
+        docs = np.searchsorted(self._starts, self._suffixes[lo:hi], side="right") - 1
+        counts = np.bincount(docs, minlength=len(self._keys))
+        return {self._keys[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def close(self):
+        if self._mmap is None:
+            return
+        # numpy views keep the buffer exported; drop them before unmapping
+        self._starts = self._suffixes = None
+        self._mmap.close()
+        self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_suffix_index(path: str) -> Optional[SuffixIndex]:
+    """Open a suffix index, returning None if it is missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return SuffixIndex(path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring suffix index {path}: {e}")
+        return None
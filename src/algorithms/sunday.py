@@ -0,0 +1,36 @@
+def build_shift_table(pattern):
+    """Shift for each character of pattern: distance from its last occurrence to one past the end"""
+    m = len(pattern)
+    shift = {}
+    for i in range(m):
+        shift[pattern[i]] = m - i
+    return shift
+
+def sunday_search(text, pattern):
+    """
+    Sunday (Quick Search) string searching algorithm
+    Returns list of starting positions where pattern is found in text
+    """
+    if not pattern or not text:
+        return []
+    
+    text = text.lower()
+    pattern = pattern.lower()
+    
+    n = len(text)
+    m = len(pattern)
+    
+    shift = build_shift_table(pattern)
+    
+    matches = []
+    s = 0
+    
+    while s <= n - m:
+        if text.startswith(pattern, s):
+            matches.append(s)
+        if s + m >= n:
+            break
+        # Shift by the text character just past the window
+        s += shift.get(text[s + m], m + 1)
+        
+    return matches
@@ -0,0 +1,92 @@
+def maximal_suffix(pattern, reverse=False):
+    """
+    Position (minus one) and period of the maximal suffix of pattern
+    under the alphabet order, or under the reversed order if reverse is True
+    """
+    m = len(pattern)
+    ms = -1  # the maximal suffix starts at ms + 1
+    j = 0
+    k = p = 1
+    
+    while j + k < m:
+        a = pattern[j + k]
+        b = pattern[ms + k]
+        if (a > b) if reverse else (a < b):
+            j += k
+            k = 1
+            p = j - ms
+        elif a == b:
+            if k != p:
+                k += 1
+            else:
+                j += p
+                k = 1
+        else:
+            ms = j
+            j = ms + 1
+            k = p = 1
+    return ms, p
+
+def critical_factorization(pattern):
+    """Critical position (ell) and period of pattern, from the larger of the two maximal suffixes"""
+    ms, p = maximal_suffix(pattern)
+    ms_reverse, p_reverse = maximal_suffix(pattern, reverse=True)
+    if ms > ms_reverse:
+        return ms, p
+    return ms_reverse, p_reverse
+
+def two_way_search(text, pattern):
+    """
+    Crochemore-Perrin Two-Way string searching algorithm
+    Linear time with constant extra space
+    Returns list of starting positions where pattern is found in text
+    """
+    if not pattern or not text:
+        return []
+    
+    text = text.lower()
+    pattern = pattern.lower()
+    
+    n = len(text)
+    m = len(pattern)
+    
+    ell, period = critical_factorization(pattern)
+    matches = []
+    j = 0
+    
+    if pattern[:ell + 1] == pattern[period:period + ell + 1]:
+        # Periodic pattern: remember how much of the left part is already known to match
+        memory = -1
+        while j <= n - m:
+            i = max(ell, memory) + 1
+            while i < m and pattern[i] == text[i + j]:
+                i += 1
+            if i >= m:
+                i = ell
+                while i > memory and pattern[i] == text[i + j]:
+                    i -= 1
+                if i <= memory:
+                    matches.append(j)
+                j += period
+                memory = m - period - 1
+            else:
+                j += i - ell
+                memory = -1
+    else:
+        period = max(ell + 1, m - ell - 1) + 1
+        while j <= n - m:
+            # Scan the right part left to right, then the left part right to left
+            i = ell + 1
+            while i < m and pattern[i] == text[i + j]:
+                i += 1
+            if i >= m:
+                i = ell
+                while i >= 0 and pattern[i] == text[i + j]:
+                    i -= 1
+                if i < 0:
+                    matches.append(j)
+                j += period
+            else:
+                j += i - ell
+                
+    return matches
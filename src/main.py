@@ -1,184 +1,703 @@
+import time
+
+STARTUP_T0 = time.perf_counter()
+
 import sys
 import os
-import time
 from dotenv import load_dotenv
-import mysql.connector
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QMessageBox, QTextEdit, QScrollArea,
-    QLineEdit, QRadioButton, QSpinBox, QDialog, QFrame, QFileDialog,
-    QGroupBox, QCheckBox, QProgressBar
+    QPushButton, QLabel, QMessageBox, QTextEdit,
+    QLineEdit, QRadioButton, QSpinBox, QDialog, QFrame, QFileDialog, QComboBox,
+    QGroupBox, QCheckBox, QProgressBar, QScrollArea, QDoubleSpinBox, QDateEdit
 )
-from PyQt6.QtCore import Qt, QUrl, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QUrl, QThread, QDate, pyqtSignal
 from PyQt6.QtGui import QDesktopServices
 
-from utils.pdf_processor import PDFProcessor
-from algorithms.boyer_moore import boyer_moore_search
-from algorithms.kmp import kmp_search
-from algorithms.aho_corasick import aho_corasick_search
-from algorithms.levenshtein import find_most_similar , calculate_dynamic_threshold
-from algorithms.regex_search import (
-    extract_email_addresses, extract_phone_numbers,
-    extract_education_info, extract_skills_keywords
-)
-from PyQt6.QtCore import pyqtSignal
+from utils.cv_cache import CVTextCache
 from utils.flow_layout import FlowLayout
+from utils.results_view import ResultsView
+from utils.startup import HEAVY_MODULES, timed_import, import_timings, format_timings
+from utils.search_engine import (
+    EXACT_ALGORITHMS, REGEX_TIME_BUDGET, ParallelSearcher, MultiQueryMatcher, exact_match_counts, parse_batch_queries,
+    split_keywords
+)
+from utils.corpus_store import write_corpus_store, open_corpus_store
+from utils.trigram_index import TrigramIndex, keywords_query, fuzzy_keywords_query
+from utils.inverted_index import InvertedIndex, is_proximity_query, parse_query
+from utils.algorithm_selector import get_cost_model
+from utils.database import open_db_connection, query_cv_catalog, cv_source_from_row, catalog_filter_clauses
+from utils.sharding import SHARD_ALGORITHMS, DEFAULT_SHARD_TIMEOUT, ShardCoordinator, ShardEngine, detail_id_key, merge_ranked, parse_addresses
+from utils.search_history import SearchHistory, query_cache_key, corpus_fingerprint, restore_results
+from utils.streaming import TopN, RateLimiter
+
+# PyMuPDF, mysql.connector dan modul algoritma tidak diimpor di sini, melainkan
+# saat pertama kali dipakai atau oleh StartupWorker setelah jendela tampil
 
 load_dotenv()
 
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join("data", "cv_cache.snap"))
+CORPUS_STORE_PATH = os.getenv("CORPUS_STORE_PATH", os.path.join("data", "corpus.store"))
+SEARCH_PROCESSES = int(os.getenv("SEARCH_PROCESSES", "0"))
+# Alamat shard server ("host:port,host:port"); jika diisi, pencarian exact dijalankan di shard
+SHARD_ADDRESSES = os.getenv("SHARD_ADDRESSES", "")
+SUFFIX_INDEX_PATH = os.getenv("SUFFIX_INDEX_PATH", os.path.join("data", "cv_suffix.idx"))
+SUFFIX_INDEX_MAX_CHARS = int(os.getenv("SUFFIX_INDEX_MAX_CHARS", "8000000"))
+# Interval minimum (detik) antar sinyal progress dan antar ranking sementara ke GUI
+PROGRESS_INTERVAL = 0.1
+PARTIAL_RESULTS_INTERVAL = 0.25
+# Mode ranking: jumlah kemunculan keyword (bawaan) atau relevansi BM25 dari inverted index
+RANKING_COUNT = "Jumlah Kemunculan"
+RANKING_BM25 = "BM25"
+ALL_ROLES = "Semua Role"
+
+class StartupWorker(QThread):
+    """Menyambungkan DB, memuat katalog, modul berat dan cache CV di background"""
+    status = pyqtSignal(str)
+    db_ready = pyqtSignal(object, list)
+    db_failed = pyqtSignal(str)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, text_cache, trigram_index, inverted_index):
+        super().__init__()
+        self.text_cache = text_cache
+        self.trigram_index = trigram_index
+        self.inverted_index = inverted_index
+        self._is_cancelled = False
+
+    def cancel(self):
+        self._is_cancelled = True
+
+    def run(self):
+        timings = {}
+
+        # Snapshot dari sesi sebelumnya: hanya manifest yang dibaca, teks dimuat saat dipakai
+        step_start = time.perf_counter()
+        self.status.emit("Memuat snapshot cache...")
+        snapshot_docs = self.text_cache.load_snapshot(SNAPSHOT_PATH)
+        timings[f"snapshot ({snapshot_docs} dokumen)"] = time.perf_counter() - step_start
+
+        step_start = time.perf_counter()
+        self.status.emit("Menyambungkan ke database...")
+        catalog = []
+        try:
+            connection = open_db_connection()
+            catalog = query_cv_catalog(connection)
+            self.db_ready.emit(connection, catalog)
+        except Exception as e:
+            self.db_failed.emit(str(e))
+        timings["database + katalog"] = time.perf_counter() - step_start
+
+        step_start = time.perf_counter()
+        self.status.emit("Memuat modul pencarian...")
+        for module_name in HEAVY_MODULES:
+            if self._is_cancelled:
+                return
+            timed_import(module_name)
+        timings["import modul"] = time.perf_counter() - step_start
+
+        # Cost model untuk mode Auto; dikalibrasi sekali (micro-benchmark) pada run pertama
+        step_start = time.perf_counter()
+        self.status.emit("Memuat cost model algoritma...")
+        get_cost_model()
+        timings["cost model"] = time.perf_counter() - step_start
+
+        # Postings trigram/inverted index dari snapshot; dokumen yang sudah tidak ada di katalog dibuang
+        step_start = time.perf_counter()
+        cv_paths = [row["cv_path"] for row in catalog if row.get("cv_path") and os.path.exists(row["cv_path"])]
+        live_hashes = {self.text_cache.content_hash(cv_path) for cv_path in cv_paths} - {None}
+        indexes = {"trigram_index": self.trigram_index, "inverted_index": self.inverted_index}
+        for name, index in indexes.items():
+            data = self.text_cache.snapshot_global(name)
+            if data is None:
+                continue
+            try:
+                index.load_bytes(data, live_hashes)
+            except (ValueError, KeyError) as e:
+                print(f"❌ Postings {name} di snapshot tidak terbaca, index dibangun ulang: {e}")
+        timings[f"index dari snapshot ({len(self.inverted_index)} dokumen)"] = time.perf_counter() - step_start
+
+        # Hanya CV baru/berubah yang diekstrak dan di-index ulang
+        step_start = time.perf_counter()
+        indexed_docs = 0
+        for i, cv_path in enumerate(cv_paths, 1):
+            if self._is_cancelled:
+                return
+            self.status.emit(f"Memuat cache CV {i}/{len(cv_paths)}...")
+            self.text_cache.get_summary(cv_path)
+            content_hash = self.text_cache.content_hash(cv_path)
+            if not content_hash or (content_hash in self.trigram_index and content_hash in self.inverted_index):
+                continue
+            processed_text = self.text_cache.get_text(cv_path)['processed']
+            if processed_text:
+                self.trigram_index.add_document(content_hash, processed_text)
+                self.inverted_index.add_document(content_hash, processed_text)
+                indexed_docs += 1
+        timings[f"cache CV ({len(self.text_cache)} dokumen unik, {indexed_docs} di-index)"] = time.perf_counter() - step_start
+
+        # Simpan kembali jika ada perubahan
+        step_start = time.perf_counter()
+        if self.text_cache.save_snapshot(SNAPSHOT_PATH, force=indexed_docs > 0, indexes=indexes):
+            timings["simpan snapshot"] = time.perf_counter() - step_start
+
+        # Corpus store untuk pencarian multi-process (hanya jika diaktifkan)
+        if SEARCH_PROCESSES > 1 and catalog:
+            step_start = time.perf_counter()
+            self.status.emit("Menyusun corpus store...")
+            documents = []
+            for row in catalog:
+                cv_path = row.get("cv_path")
+                content_hash = self.text_cache.content_hash(cv_path) if cv_path and os.path.exists(cv_path) else None
+                if content_hash:
+                    documents.append((row["detail_id"], content_hash, self.text_cache.get_text(cv_path)['processed']))
+            try:
+                write_corpus_store(CORPUS_STORE_PATH, documents)
+                timings["corpus store"] = time.perf_counter() - step_start
+            except OSError as e:
+                print(f"❌ Gagal menyusun corpus store: {e}")
+
+        # Suffix index untuk mode "Suffix Array", dibangun ulang hanya jika isi korpus berubah
+        if SUFFIX_INDEX_MAX_CHARS > 0 and cv_paths:
+            step_start = time.perf_counter()
+            suffix_array = timed_import("algorithms.suffix_array")
+            documents = {}
+            for cv_path in cv_paths:
+                content_hash = self.text_cache.content_hash(cv_path)
+                processed_text = self.text_cache.get_text(cv_path)['processed']
+                if content_hash and processed_text:
+                    documents.setdefault(content_hash, processed_text)
+            existing_index = suffix_array.open_suffix_index(SUFFIX_INDEX_PATH)
+            up_to_date = existing_index is not None and set(existing_index.keys()) == set(documents)
+            if existing_index:
+                existing_index.close()
+            if not up_to_date and not self._is_cancelled:
+                self.status.emit("Menyusun suffix index...")
+                try:
+                    suffix_array.write_suffix_index(SUFFIX_INDEX_PATH, documents.items(), SUFFIX_INDEX_MAX_CHARS)
+                    timings[f"suffix index ({len(documents)} dokumen)"] = time.perf_counter() - step_start
+                except (OSError, ValueError) as e:
+                    print(f"❌ Gagal menyusun suffix index: {e}")
+
+        self.finished.emit(timings)
+
 class SearchWorker(QThread):
     progress = pyqtSignal(int, str)
+    partial_results = pyqtSignal(list)
     finished = pyqtSignal(list, float, float, int)
     error = pyqtSignal(str)
+    fingerprint_ready = pyqtSignal(str)
+    cached_results = pyqtSignal(list, int)
     
-    def __init__(self, keywords, all_cv_sources, top_n, is_ac_selected, is_kmp_selected, use_fuzzy, keyword_map):
+    def __init__(self, keywords, all_cv_sources, top_n, algorithm, use_fuzzy, keyword_map, text_cache,
+                 parallel_searcher=None, corpus_store=None, trigram_index=None, suffix_index=None,
+                 ranking=RANKING_COUNT, inverted_index=None, fuzzy_penalty=0.5,
+                 search_history=None, query_key=None, cacheable=False, use_database=False):
         super().__init__()
         self.keywords = keywords
         self.all_cv_sources = all_cv_sources
         self.top_n = top_n
-        self.is_ac_selected = is_ac_selected
-        self.is_kmp_selected = is_kmp_selected
+        self.algorithm = algorithm
         self.use_fuzzy = use_fuzzy
         self.keyword_map = keyword_map
+        self.text_cache = text_cache
+        self.parallel_searcher = parallel_searcher
+        self.corpus_store = corpus_store
+        self.trigram_index = trigram_index
+        self.suffix_index = suffix_index
+        self.ranking = ranking
+        self.inverted_index = inverted_index if inverted_index is not None else InvertedIndex()
+        self.fuzzy_penalty = fuzzy_penalty
+        self.search_history = search_history
+        self.query_key = query_key
+        self.cacheable = cacheable
+        self.use_database = use_database
         self._is_cancelled = False
     
     def cancel(self):
         """Method untuk membatalkan pencarian"""
         self._is_cancelled = True
     
+    def check_search_history(self):
+        """
+        Hitung fingerprint korpus lalu cari hasil query identik di riwayat pencarian.
+        Fingerprint meng-hash setiap file CV, jadi dikerjakan di thread ini, bukan di GUI.
+        Return True jika hasil dari riwayat sudah dikirim lewat cached_results.
+        """
+        self.progress.emit(2, "Memeriksa riwayat pencarian...")
+        fingerprint = corpus_fingerprint(self.all_cv_sources, self.text_cache)
+        self.fingerprint_ready.emit(fingerprint)
+        if not self.cacheable or self._is_cancelled:
+            return False
+        rows = self.search_history.lookup(self.query_key, fingerprint, self.use_database)
+        if rows is None:
+            return False
+        cached_results = restore_results(rows, self.all_cv_sources, self.ranking == RANKING_COUNT)
+        if cached_results is None:
+            return False
+        self.cached_results.emit(cached_results, len(self.all_cv_sources))
+        return True
+    
     def run(self):
         """Method utama yang dijalankan di thread terpisah"""
         try:
+            from algorithms.levenshtein import calculate_dynamic_threshold
+            from algorithms.myers import myers_search_many, count_occurrences
+            from algorithms.regex_search import compile_pattern
+
             self.progress.emit(0, "Memulai pencarian...")
             
-            search_algo = None
-            if not self.is_ac_selected:
-                search_algo = kmp_search if self.is_kmp_selected else boyer_moore_search
+            if self.algorithm == "Regex":
+                # Pattern tidak valid/berbahaya ditolak sebelum menyentuh dokumen apa pun
+                for pattern in self.keywords:
+                    compile_pattern(pattern)
+            
+            if self.search_history is not None and self.check_search_history():
+                return
+            
+            # CV dengan isi file identik hanya diproses sekali, hasilnya dibagikan
+            # ke semua applicant yang mereferensikan file tersebut
+            self.progress.emit(5, "Mengelompokkan CV berdasarkan isi file...")
+            unique_docs = self.text_cache.group_by_content(self.all_cv_sources)
+            
+            if self.ranking == RANKING_BM25:
+                self.run_bm25(unique_docs)
+                return
+            
+            # Keyword NEAR/k dan ONEAR/k (proximity) dijawab dari positional index
+            # tanpa scan teks; keyword lainnya dicocokkan dengan algoritma terpilih
+            proximity_keywords = []
+            if self.algorithm != "Regex":
+                proximity_keywords = [kw for kw in self.keywords if is_proximity_query(kw)]
+            scan_keywords = [kw for kw in self.keywords if kw not in proximity_keywords]
             
             # ---- EXACT MATCHING ----
             self.progress.emit(10, "Melakukan exact matching...")
             start_time_exact = time.time()
-            results = []
-            unmatched_keywords = set(kw.lower() for kw in self.keywords)
+            doc_results = {}  # content_hash -> {"matches": {...}, "score": int}
+            unmatched_keywords = set(kw.lower() for kw in scan_keywords)
+            
+            proximity_counts = {}  # content_hash -> {keyword: jumlah kemunculan}
+            if proximity_keywords:
+                if not self.index_missing_documents(unique_docs, 10, 15):
+                    return
+                for keyword in proximity_keywords:
+                    for content_hash, count in self.inverted_index.match_counts(keyword, unique_docs.keys()).items():
+                        proximity_counts.setdefault(content_hash, {})[keyword] = count
+                self.progress.emit(15, f"Positional index: {len(proximity_counts)} CV cocok dengan keyword proximity")
+            
+            # Trigram index mempersempit CV yang perlu di-scan; CV yang pasti tidak
+            # mengandung keyword/pattern mana pun dilewati pada tahap exact matching
+            scan_hashes = list(unique_docs) if scan_keywords else []
+            if self.trigram_index is not None and scan_hashes:
+                scan_hashes = self.trigram_index.candidates(keywords_query(scan_keywords, self.algorithm), scan_hashes)
+                self.progress.emit(15, f"Trigram index: {len(scan_hashes)}/{len(unique_docs)} CV kandidat")
+            
+            total_docs = max(1, len(scan_hashes))
+            processed_docs = 0
+            regex_timeout_docs = 0  # CV yang pattern regex-nya terpotong batas waktu
+            
+            # Mode Suffix Array: CV yang ada di suffix index dihitung lewat binary search
+            # per keyword; CV yang belum ter-index (mis. upload baru) di-scan dengan KMP
+            scan_algorithm = self.algorithm
+            indexed_counts = {}
+            auto_choice = None
+            if self.algorithm == "Auto" and scan_hashes:
+                # Pilih engine dengan prediksi waktu terkecil untuk query dan korpus ini
+                cost_model = get_cost_model()
+                scan_chars = sum(len(self.text_cache.get_text(unique_docs[h][0]["cv_path"])['processed']) for h in scan_hashes)
+                auto_choice = cost_model.choose(scan_keywords, len(scan_hashes), scan_chars)
+                scan_algorithm = auto_choice["engine"]
+                predicted = auto_choice["predictions"][scan_algorithm]
+                self.progress.emit(18, f"Auto: memilih {scan_algorithm} (prediksi {predicted * 1000:.1f} ms)")
+            if self.algorithm == "Suffix Array":
+                scan_algorithm = "KMP"
+                indexed_hashes = [h for h in scan_hashes if self.suffix_index is not None and h in self.suffix_index]
+                if indexed_hashes:
+                    indexed_set = set(indexed_hashes)
+                    indexed_counts = {h: {} for h in indexed_hashes}
+                    for kw in scan_keywords:
+                        for content_hash, frequency in self.suffix_index.count_per_doc(kw).items():
+                            if content_hash in indexed_set:
+                                indexed_counts[content_hash][kw] = frequency
+                    scan_hashes = [h for h in scan_hashes if h not in indexed_set]
+                    processed_docs = len(indexed_hashes)
+                    self.progress.emit(20, f"Suffix index: {processed_docs}/{total_docs} CV")
+            
+            # Dokumen yang ada di corpus store (dengan isi yang sama) dikerjakan oleh
+            # worker process; sisanya (mis. file upload baru) diproses di thread ini
+            parallel_docs = {}  # detail_id -> content_hash
+            if self.parallel_searcher and self.corpus_store:
+                for content_hash in scan_hashes:
+                    for cv_source in unique_docs[content_hash]:
+                        detail_id = cv_source["applicant"].get("detail_id")
+                        if detail_id in self.corpus_store and self.corpus_store.content_hash(detail_id) == content_hash:
+                            parallel_docs[detail_id] = content_hash
+                            break
+            parallel_hashes = set(parallel_docs.values())
+            local_hashes = [h for h in scan_hashes if h not in parallel_hashes]
+            
+            # Ranking top-N dijaga incremental; ranking sementara dikirim ke GUI
+            # paling sering tiap PARTIAL_RESULTS_INTERVAL detik
+            progress_limiter = RateLimiter(PROGRESS_INTERVAL)
+            partial_limiter = RateLimiter(PARTIAL_RESULTS_INTERVAL)
+            top_results = TopN(self.top_n, tie_break=detail_id_key)
+            
+            def push_doc_result(collector, content_hash):
+                doc_result = doc_results[content_hash]
+                for cv_source in unique_docs[content_hash]:
+                    collector.push(doc_result["score"], {
+                        "applicant": cv_source["applicant"],
+                        "matches": dict(doc_result["matches"]),
+                        "score": doc_result["score"]
+                    })
+            
+            def emit_partial_results(force=False):
+                if top_results.changed and partial_limiter.ready(force):
+                    top_results.changed = False
+                    self.partial_results.emit(top_results.ranked())
+            
+            def record_exact_result(content_hash, matched_kw_freq):
+                nonlocal unmatched_keywords
+                if content_hash in proximity_counts:
+                    matched_kw_freq = {**matched_kw_freq, **proximity_counts.pop(content_hash)}
+                if matched_kw_freq:
+                    found_patterns = {p.lower() for p in matched_kw_freq.keys()}
+                    unmatched_keywords -= found_patterns
+
+                if matched_kw_freq:
+                    total_matches = sum(matched_kw_freq.values())
+                    doc_results[content_hash] = {
+                        "matches": matched_kw_freq,
+                        "score": total_matches
+                    }
+                    push_doc_result(top_results, content_hash)
+                    emit_partial_results()
             
-            total_cvs = len(self.all_cv_sources)
-            processed_cvs = 0
+            for content_hash, matched_kw_freq in indexed_counts.items():
+                record_exact_result(content_hash, matched_kw_freq)
+            
+            if parallel_docs:
+                for detail_id, matched_kw_freq, timed_out in self.parallel_searcher.search(
+                        list(parallel_docs), scan_keywords, scan_algorithm, self.keyword_map):
+                    if self._is_cancelled:
+                        return
+                    processed_docs += 1
+                    regex_timeout_docs += bool(timed_out)
+                    if progress_limiter.ready():
+                        progress_percent = int(20 + (processed_docs / total_docs) * 40)
+                        self.progress.emit(progress_percent, f"Memproses CV {processed_docs}/{total_docs} (paralel)")
+                    record_exact_result(parallel_docs[detail_id], matched_kw_freq)
             
-            for cv_source in self.all_cv_sources:
+            for content_hash in local_hashes:
                 if self._is_cancelled:
                     return
                 
-                applicant = cv_source["applicant"]
-                cv_path = cv_source["cv_path"]
+                cv_group = unique_docs[content_hash]
+                applicant = cv_group[0]["applicant"]
                 
                 # Update progress
-                processed_cvs += 1
-                progress_percent = int(20 + (processed_cvs / total_cvs) * 40)  # 20-60% untuk exact matching
-                self.progress.emit(progress_percent, f"Memproses CV {processed_cvs}/{total_cvs}: {applicant['first_name']}")
-                
-                if not cv_path or not os.path.exists(cv_path):
-                    continue
+                processed_docs += 1
+                if progress_limiter.ready():
+                    progress_percent = int(20 + (processed_docs / total_docs) * 40)  # 20-60% untuk exact matching
+                    self.progress.emit(progress_percent, f"Memproses CV {processed_docs}/{total_docs}: {applicant['first_name']}")
                 
-                cv_text = PDFProcessor.extract_text_dual_format(cv_path)['processed']
+                cv_text = self.text_cache.get_text(cv_group[0]["cv_path"])['processed']
                 if not cv_text:
                     continue
+                if self.trigram_index is not None:
+                    self.trigram_index.add_document(content_hash, cv_text)
                 
-                matched_kw_freq = {}
-                if self.is_ac_selected:
-                    matches = aho_corasick_search(cv_text, self.keywords)
-                    for match in matches:
-                        lw_pattern = match['pattern']
-                        original_pattern = self.keyword_map.get(lw_pattern)
-                        if original_pattern:
-                            matched_kw_freq[original_pattern] = matched_kw_freq.get(original_pattern, 0) + 1
-                else:
-                    for kw in self.keywords:
-                        matches = search_algo(cv_text, kw)
-                        if matches:
-                            matched_kw_freq[kw] = len(matches)
-
-                if matched_kw_freq:
-                    found_patterns = {p.lower() for p in matched_kw_freq.keys()}
-                    unmatched_keywords -= found_patterns
-
-                if matched_kw_freq:
-                    total_matches = sum(matched_kw_freq.values())
-                    results.append({
-                        "applicant": applicant,
-                        "matches": matched_kw_freq,
-                        "score": total_matches
-                    })
+                timed_out = []
+                record_exact_result(content_hash, exact_match_counts(cv_text, scan_keywords, scan_algorithm,
+                                                                     self.keyword_map, timed_out))
+                regex_timeout_docs += bool(timed_out)
+            
+            # CV yang hanya cocok dengan keyword proximity (tidak ikut di-scan)
+            for content_hash in list(proximity_counts):
+                record_exact_result(content_hash, {})
             
             duration_exact = time.time() - start_time_exact
+            emit_partial_results(force=True)
+            if auto_choice:
+                cost_model.log_choice(auto_choice, scan_keywords, len(scan_hashes), scan_chars, duration_exact)
+                print(f"⏱️ Auto memilih {scan_algorithm}: prediksi {auto_choice['predictions'][scan_algorithm] * 1000:.1f} ms, "
+                      f"aktual {duration_exact * 1000:.1f} ms")
+            if regex_timeout_docs:
+                print(f"⏱️ Batas waktu regex per dokumen ({REGEX_TIME_BUDGET * 1000:.0f} ms) habis pada "
+                      f"{regex_timeout_docs} CV; jumlah kecocokannya mungkin tidak lengkap")
             
             # ---- FUZZY MATCHING ----
             duration_fuzzy = 0
-            if self.use_fuzzy and unmatched_keywords and not self._is_cancelled:
+            if self.use_fuzzy and self.algorithm != "Regex" and unmatched_keywords and not self._is_cancelled:
                 self.progress.emit(60, f"Melakukan fuzzy matching untuk {len(unmatched_keywords)} keyword...")
                 start_time_fuzzy = time.time()
                 
+                # Semua keyword yang belum ditemukan dicari sekaligus (Myers bit-parallel) sebagai
+                # substring dengan toleransi edit, sehingga typo antar kata / frasa ikut tertangkap
+                fuzzy_keywords = [kw for kw in unmatched_keywords if calculate_dynamic_threshold(kw) > 0]
+                fuzzy_thresholds = [calculate_dynamic_threshold(kw) for kw in fuzzy_keywords]
+                
+                # q-gram lemma: CV yang trigram-nya terlalu sedikit sama dengan keyword
+                # tidak mungkin berisi kecocokan dalam batas edit, jadi tidak di-scan
+                fuzzy_hashes = list(unique_docs)
+                if self.trigram_index is not None and fuzzy_keywords:
+                    fuzzy_hashes = self.trigram_index.candidates(
+                        fuzzy_keywords_query(fuzzy_keywords, fuzzy_thresholds), fuzzy_hashes)
+                    self.progress.emit(60, f"Trigram index: {len(fuzzy_hashes)}/{len(unique_docs)} CV kandidat fuzzy")
+                
                 processed_fuzzy = 0
-                for cv_source in self.all_cv_sources:
+                for content_hash in fuzzy_hashes:
                     if self._is_cancelled:
                         return
                     
-                    applicant = cv_source["applicant"]
-                    cv_path = cv_source["cv_path"]
+                    cv_group = unique_docs[content_hash]
+                    applicant = cv_group[0]["applicant"]
                     
                     processed_fuzzy += 1
-                    progress_percent = int(60 + (processed_fuzzy / total_cvs) * 30)  # 60-90% untuk fuzzy matching
-                    self.progress.emit(progress_percent, f"Fuzzy matching {processed_fuzzy}/{total_cvs}: {applicant['first_name']}")
+                    if progress_limiter.ready():
+                        progress_percent = int(60 + (processed_fuzzy / len(fuzzy_hashes)) * 30)  # 60-90% untuk fuzzy matching
+                        self.progress.emit(progress_percent, f"Fuzzy matching {processed_fuzzy}/{len(fuzzy_hashes)}: {applicant['first_name']}")
 
-                    if not cv_path or not os.path.exists(cv_path):
-                        continue
-
-                    cv_text = PDFProcessor.extract_text_dual_format(cv_path)['processed']
+                    cv_text = self.text_cache.get_text(cv_group[0]["cv_path"])['processed']
                     if not cv_text:
                         continue
                     
                     fuzzy_matches_for_cv = {}
-                    for keyword in unmatched_keywords:
-                        threshold = calculate_dynamic_threshold(keyword)
-                        if threshold == 0:
-                            continue
-
-                        similar_words = find_most_similar(keyword, cv_text, threshold=threshold)
-                        if similar_words:
+                    end_positions = myers_search_many(cv_text, fuzzy_keywords, fuzzy_thresholds)
+                    for keyword, threshold in zip(fuzzy_keywords, fuzzy_thresholds):
+                        occurrences = count_occurrences(end_positions[keyword], len(keyword), threshold)
+                        if occurrences:
                             fuzzy_key = f"{keyword} (fuzzy)"
-                            fuzzy_matches_for_cv[fuzzy_key] = len(similar_words)
+                            fuzzy_matches_for_cv[fuzzy_key] = occurrences
                     
                     if fuzzy_matches_for_cv:
-                        applicant_id = applicant["applicant_id"]
-                        
-                        existing_result = next((r for r in results if r["applicant"]["applicant_id"] == applicant_id), None)
+                        existing_result = doc_results.get(content_hash)
 
                         if existing_result:
                             existing_result["matches"].update(fuzzy_matches_for_cv)
                             existing_result["score"] += sum(fuzzy_matches_for_cv.values())
                         else:
-                            results.append({
-                                "applicant": applicant,
+                            doc_results[content_hash] = {
                                 "matches": fuzzy_matches_for_cv,
                                 "score": sum(fuzzy_matches_for_cv.values())
-                            })
+                            }
+                        
+                        # Skor dokumen berubah, jadi ranking sementara disusun ulang dari doc_results
+                        if partial_limiter.ready():
+                            top_results = TopN(self.top_n, tie_break=detail_id_key)
+                            for hash_so_far in doc_results:
+                                push_doc_result(top_results, hash_so_far)
+                            top_results.changed = False
+                            self.partial_results.emit(top_results.ranked())
                 
                 duration_fuzzy = time.time() - start_time_fuzzy
             
             if self._is_cancelled:
                 return
             
+            # Sebarkan hasil per dokumen unik ke setiap applicant yang memakainya;
+            # hanya top-N yang disimpan (heap terbatas), tanpa sort seluruh hasil
             self.progress.emit(90, "Mengurutkan hasil...")
-            sorted_results = sorted(results, key=lambda x: x['score'], reverse=True)
-            top_results = sorted_results[:self.top_n]
+            final_results = TopN(self.top_n, tie_break=detail_id_key)
+            for content_hash in doc_results:
+                push_doc_result(final_results, content_hash)
             
             self.progress.emit(100, "Pencarian selesai!")
             
             # Emit hasil akhir
-            self.finished.emit(top_results, duration_exact, duration_fuzzy, len(self.all_cv_sources))
+            self.finished.emit(final_results.ranked(), duration_exact, duration_fuzzy, len(self.all_cv_sources))
             
         except Exception as e:
             self.error.emit(f"Error during search: {str(e)}")
 
+    def index_missing_documents(self, unique_docs, progress_start, progress_end):
+        """Tambahkan CV yang belum ter-index (mis. upload baru atau warm-up belum selesai) ke inverted index"""
+        progress_limiter = RateLimiter(PROGRESS_INTERVAL)
+        for i, (content_hash, cv_group) in enumerate(unique_docs.items(), 1):
+            if self._is_cancelled:
+                return False
+            if content_hash in self.inverted_index:
+                continue
+            if progress_limiter.ready():
+                progress_percent = int(progress_start + (i / len(unique_docs)) * (progress_end - progress_start))
+                self.progress.emit(progress_percent, f"Mengindeks CV {i}/{len(unique_docs)}")
+            cv_text = self.text_cache.get_text(cv_group[0]["cv_path"])['processed']
+            if cv_text:
+                self.inverted_index.add_document(content_hash, cv_text)
+        return True
+
+    def run_bm25(self, unique_docs):
+        """
+        Ranking relevansi BM25 dari inverted index dengan pruning MaxScore.
+        Fuzzy matching memakai kata di vocabulary yang mirip keyword, dengan skor dikali fuzzy_penalty.
+        """
+        start_time = time.time()
+        self.progress.emit(10, "Menyiapkan inverted index...")
+        if not self.index_missing_documents(unique_docs, 10, 70):
+            return
+        
+        self.progress.emit(70, "Menghitung skor BM25...")
+        fuzzy_penalty = self.fuzzy_penalty if self.use_fuzzy else 0.0
+        ranked_docs = self.inverted_index.top_k(self.keywords, self.top_n, unique_docs.keys(), fuzzy_penalty)
+        if self._is_cancelled:
+            return
+        
+        # Satu dokumen bisa dipakai beberapa applicant, jadi top-N dokumen cukup untuk top-N applicant
+        final_results = TopN(self.top_n, tie_break=detail_id_key)
+        for content_hash, score, matches in ranked_docs:
+            display_matches = {}
+            for term, frequency in matches.items():
+                base_term, fuzzy_suffix, _ = term.partition(" (fuzzy)")
+                display_matches[self.keyword_map.get(base_term.lower(), base_term) + fuzzy_suffix] = frequency
+            for cv_source in unique_docs[content_hash]:
+                final_results.push(score, {
+                    "applicant": cv_source["applicant"],
+                    "matches": dict(display_matches),
+                    "score": round(score, 4)
+                })
+        
+        self.progress.emit(100, "Pencarian selesai!")
+        self.finished.emit(final_results.ranked(), time.time() - start_time, 0.0, len(self.all_cv_sources))
+
+class ShardSearchWorker(QThread):
+    """Pencarian exact yang disebar ke shard server lalu digabung (scatter-gather)"""
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(list, float, float, int)
+    error = pyqtSignal(str)
+    shard_reports = pyqtSignal(list)
+
+    def __init__(self, keywords, algorithm, top_n, coordinator, local_cv_sources, text_cache):
+        super().__init__()
+        self.keywords = keywords
+        self.algorithm = algorithm
+        self.top_n = top_n
+        self.coordinator = coordinator
+        self.local_cv_sources = local_cv_sources
+        self.text_cache = text_cache
+        self._is_cancelled = False
+
+    def cancel(self):
+        self._is_cancelled = True
+
+    def run(self):
+        try:
+            start_time = time.time()
+            self.progress.emit(10, f"Mengirim query ke {len(self.coordinator.addresses)} shard...")
+            gathered = self.coordinator.search(self.keywords, self.algorithm, self.top_n)
+            if self._is_cancelled:
+                return
+
+            ranked_lists = [gathered["results"]]
+            total_scanned = sum(report.get("scanned", 0) for report in gathered["shards"])
+            if self.local_cv_sources:
+                # CV upload tidak ada di shard mana pun, jadi dicari di proses ini
+                self.progress.emit(70, f"Mencari {len(self.local_cv_sources)} CV upload lokal...")
+                local = ShardEngine(-1, self.local_cv_sources, self.text_cache).search(self.keywords, self.algorithm, self.top_n)
+                ranked_lists.append(local["results"])
+                total_scanned += local["scanned"]
+
+            for report in gathered["shards"]:
+                if report["status"] == "ok":
+                    print(f"🧩 Shard {report['shard']} ({report['address']}): {report['duration'] * 1000:.1f} ms, "
+                          f"{report['candidates']}/{report['scanned']} CV di-scan"
+                          + (f", batas waktu regex habis pada {report['regex_timeouts']} CV" if report["regex_timeouts"] else ""))
+                else:
+                    print(f"🧩 Shard {report['shard']} ({report['address']}): {report['status']} {report.get('error', '')}")
+
+            self.progress.emit(100, "Pencarian selesai!")
+            self.shard_reports.emit(gathered["shards"])
+            self.finished.emit(merge_ranked(ranked_lists, self.top_n), time.time() - start_time, 0.0, total_scanned)
+        except Exception as e:
+            self.error.emit(f"Error during shard search: {str(e)}")
+
+class BatchSearchWorker(QThread):
+    """Screening banyak lowongan sekaligus: setiap CV hanya di-scan sekali untuk semua query"""
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(dict, float, int)
+    error = pyqtSignal(str)
+
+    def __init__(self, queries, all_cv_sources, top_n, text_cache, trigram_index=None):
+        super().__init__()
+        self.queries = queries
+        self.all_cv_sources = all_cv_sources
+        self.top_n = top_n
+        self.text_cache = text_cache
+        self.trigram_index = trigram_index
+        self._is_cancelled = False
+
+    def cancel(self):
+        self._is_cancelled = True
+
+    def run(self):
+        try:
+            self.progress.emit(0, f"Menyiapkan automaton untuk {len(self.queries)} lowongan...")
+            start_time = time.time()
+            matcher = MultiQueryMatcher(self.queries)
+            unique_docs = self.text_cache.group_by_content(self.all_cv_sources)
+
+            scan_hashes = list(unique_docs)
+            if self.trigram_index is not None:
+                scan_hashes = self.trigram_index.candidates(keywords_query(matcher.patterns, "Aho-Corasick"), scan_hashes)
+
+            doc_results = {name: {} for name in self.queries}  # query -> content_hash -> matches
+            total_docs = max(1, len(scan_hashes))
+            progress_limiter = RateLimiter(PROGRESS_INTERVAL)
+            for processed_docs, content_hash in enumerate(scan_hashes, 1):
+                if self._is_cancelled:
+                    return
+                cv_group = unique_docs[content_hash]
+                if progress_limiter.ready():
+                    progress_percent = int(10 + (processed_docs / total_docs) * 80)
+                    self.progress.emit(progress_percent, f"Memproses CV {processed_docs}/{total_docs}: {cv_group[0]['applicant']['first_name']}")
+
+                cv_text = self.text_cache.get_text(cv_group[0]["cv_path"])['processed']
+                if not cv_text:
+                    continue
+                if self.trigram_index is not None:
+                    self.trigram_index.add_document(content_hash, cv_text)
+                for name, matched_kw_freq in matcher.match(cv_text).items():
+                    doc_results[name][content_hash] = matched_kw_freq
+
+            self.progress.emit(90, "Menyusun ranking per lowongan...")
+            rankings = {}
+            for name, per_doc in doc_results.items():
+                top_results = TopN(self.top_n, tie_break=detail_id_key)
+                for content_hash, matched_kw_freq in per_doc.items():
+                    score = sum(matched_kw_freq.values())
+                    for cv_source in unique_docs[content_hash]:
+                        top_results.push(score, {
+                            "applicant": cv_source["applicant"],
+                            "matches": dict(matched_kw_freq),
+                            "score": score
+                        })
+                rankings[name] = top_results.ranked()
+
+            self.progress.emit(100, "Screening selesai!")
+            self.finished.emit(rankings, time.time() - start_time, len(self.all_cv_sources))
+        except Exception as e:
+            self.error.emit(f"Error during batch screening: {str(e)}")
+
+class SummaryPrefetchWorker(QThread):
+    """Menghitung summary CV hasil pencarian di background agar dialog Summary instan"""
+
+    def __init__(self, text_cache, cv_paths):
+        super().__init__()
+        self.text_cache = text_cache
+        self.cv_paths = cv_paths
+        self._is_cancelled = False
+
+    def cancel(self):
+        self._is_cancelled = True
+
+    def run(self):
+        for cv_path in self.cv_paths:
+            if self._is_cancelled:
+                return
+            try:
+                self.text_cache.get_summary(cv_path)
+            except Exception as e:
+                print(f"❌ Gagal menyiapkan summary {os.path.basename(cv_path)}: {e}")
+
 class KeywordTag(QFrame):
     removed = pyqtSignal(str)
 
@@ -203,8 +722,56 @@ class KeywordTag(QFrame):
     def emit_removed_signal(self):
         self.removed.emit(self.keyword_text)
 
+class KeywordImportDialog(QDialog):
+    """Import banyak keyword sekaligus dari teks yang di-paste atau dari file"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Import Keyword")
+        self.setMinimumSize(450, 350)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Paste daftar keyword atau deskripsi pekerjaan (dipisah koma, titik koma atau baris baru):"))
+
+        self.text_input = QTextEdit()
+        self.text_input.setAcceptRichText(False)
+        self.text_input.textChanged.connect(self.update_count)
+        layout.addWidget(self.text_input)
+
+        self.count_label = QLabel("0 keyword unik")
+        layout.addWidget(self.count_label)
+
+        button_layout = QHBoxLayout()
+        load_button = QPushButton("📁 Muat dari File")
+        load_button.clicked.connect(self.load_file)
+        import_button = QPushButton("Import")
+        import_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Batal")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(load_button)
+        button_layout.addStretch()
+        button_layout.addWidget(import_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+    def load_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Pilih File Keyword", "", "Text Files (*.txt *.csv);;All Files (*)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                self.text_input.setPlainText(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.warning(self, "Gagal Membaca File", str(e))
+
+    def update_count(self):
+        self.count_label.setText(f"{len(self.keywords())} keyword unik")
+
+    def keywords(self):
+        return split_keywords(self.text_input.toPlainText())
+
 class SummaryDialog(QDialog):
-    def __init__(self, applicant_data, cv_text, parent=None):
+    def __init__(self, applicant_data, fields, parent=None):
         super().__init__(parent)
         self.setWindowTitle(f"CV Summary - {applicant_data['first_name']} {applicant_data['last_name']}")
         self.setGeometry(150, 150, 600, 500)
@@ -233,16 +800,16 @@ class SummaryDialog(QDialog):
         layout.addWidget(self.create_separator())
         layout.addWidget(QLabel("<b>Informasi Tambahan (Ekstraksi dari CV)</b>"))
         
-        emails = extract_email_addresses(cv_text)
-        phones = extract_phone_numbers(cv_text)
+        # Field hasil ekstraksi sudah dihitung sebelumnya (lihat CVTextCache.get_summary)
+        emails = fields['emails']
+        phones = fields['phones']
         layout.addWidget(QLabel(f"<b>Email di CV:</b> {', '.join(emails) if emails else 'Tidak ditemukan'}"))
         layout.addWidget(QLabel(f"<b>Telepon di CV:</b> {', '.join(phones) if phones else 'Tidak ditemukan'}"))
 
-        skills_list = ["Python", "Java", "React", "SQL", "HTML", "CSS", "JavaScript", "Project Management", "Data Analysis"]
-        found_skills = extract_skills_keywords(cv_text, skills_list)
+        found_skills = fields['skills']
         layout.addWidget(QLabel(f"<b>Keahlian Terdeteksi:</b> {', '.join(found_skills) if found_skills else 'Tidak ditemukan'}"))
         
-        education = extract_education_info(cv_text)
+        education = fields['education']
         layout.addWidget(QLabel("<b>Riwayat Pendidikan:</b>"))
         education_text = "\n".join(f"- {info.strip()}" for info in education) if education else "Tidak ditemukan"
         edu_display = QTextEdit(education_text)
@@ -259,60 +826,6 @@ class SummaryDialog(QDialog):
         separator.setFrameShadow(QFrame.Shadow.Sunken)
         return separator
 
-class CVCard(QFrame):
-    def __init__(self, applicant_data, matched_keywords, parent=None):
-        super().__init__(parent)
-        self.applicant_data = applicant_data
-        
-        layout = QVBoxLayout(self)
-        self.setFrameStyle(QFrame.Shape.StyledPanel | QFrame.Shadow.Raised)
-
-        name = f"{applicant_data['first_name']} {applicant_data['last_name']}"
-        match_count = len(matched_keywords)
-        header_label = QLabel(f"<b>{name}</b><br>{match_count} keyword cocok")
-        layout.addWidget(header_label)
-
-        keywords_str = ""
-        for kw, freq in matched_keywords.items():
-            keywords_str += f"- {kw}: {freq} kemunculan\n"
-        
-        keywords_display = QTextEdit(keywords_str.strip())
-        keywords_display.setReadOnly(True)
-        keywords_display.setMaximumHeight(80)
-        layout.addWidget(keywords_display)
-        
-        button_layout = QHBoxLayout()
-        summary_btn = QPushButton("Summary")
-        view_cv_btn = QPushButton("View CV")
-        
-        summary_btn.clicked.connect(self.show_summary)
-        view_cv_btn.clicked.connect(self.view_cv)
-
-        button_layout.addWidget(summary_btn)
-        button_layout.addWidget(view_cv_btn)
-        layout.addLayout(button_layout)
-        
-    def show_summary(self):
-        cv_path = self.applicant_data.get("cv_path")
-        if not cv_path or not os.path.exists(cv_path):
-            QMessageBox.warning(self, "Error", f"File CV tidak ditemukan di path: {cv_path}")
-            return
-            
-        extracted_text = PDFProcessor.extract_text_dual_format(cv_path)['normal']
-        if not extracted_text:
-            QMessageBox.warning(self, "Error", f"Gagal mengekstrak teks dari {os.path.basename(cv_path)}.")
-            return
-
-        dialog = SummaryDialog(self.applicant_data, extracted_text, self)
-        dialog.exec()
-
-    def view_cv(self):
-        cv_path = self.applicant_data.get("cv_path")
-        if cv_path and os.path.exists(cv_path):
-            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(cv_path)))
-        else:
-            QMessageBox.warning(self, "Error", f"File CV tidak ditemukan di path: {cv_path}")
-
 class MainWindow(QMainWindow):
     """Kelas utama untuk aplikasi GUI ATS."""
 
@@ -322,15 +835,29 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 800, 700)
         
         self.db_connection = None
+        self.cv_catalog = None
+        self.filtered_catalog = None  # (kondisi SQL + parameter, baris katalog) dari query terfilter terakhir
         self.uploaded_pdf_files = []
-        self.connect_to_database()
+        self.text_cache = CVTextCache()
+        self.startup_worker = None
+        self.corpus_store = None
+        self.parallel_searcher = None
+        self.trigram_index = TrigramIndex()
+        self.inverted_index = InvertedIndex()
+        self.suffix_index = None
+        self.search_history = SearchHistory()
+        self.pending_search = None
+        self.shard_coordinator = ShardCoordinator(parse_addresses(SHARD_ADDRESSES), DEFAULT_SHARD_TIMEOUT) if SHARD_ADDRESSES else None
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         self.main_layout = QVBoxLayout(self.central_widget)
         
         self.current_keywords = []
+        self.keyword_tags = {}  # keyword.lower() -> KeywordTag
         self.search_worker = None
+        self.summary_worker = None
+        self.batch_rankings = {}
         
         # input
         input_groupbox = QGroupBox("Kata Kunci")
@@ -341,22 +868,34 @@ class MainWindow(QMainWindow):
         self.keywords_input.setFixedHeight(30)
         self.add_keyword_button = QPushButton("+")
         self.add_keyword_button.setFixedSize(35, 35)
+        self.import_keywords_button = QPushButton("📋 Import")
+        self.import_keywords_button.setFixedHeight(35)
+        self.import_keywords_button.setToolTip("Import banyak keyword dari teks atau file")
 
         add_keyword_layout.addWidget(self.keywords_input)
         add_keyword_layout.addWidget(self.add_keyword_button)
+        add_keyword_layout.addWidget(self.import_keywords_button)
 
         # Layout untuk menampung tag
         self.tags_layout = FlowLayout(spacing=5)
         tags_container = QWidget()
         tags_container.setLayout(self.tags_layout)
         tags_container.setMinimumHeight(40)
+        # Import bisa menambah ratusan tag sekaligus; area tag di-scroll agar form tidak ikut memanjang
+        tags_scroll = QScrollArea()
+        tags_scroll.setWidget(tags_container)
+        tags_scroll.setWidgetResizable(True)
+        tags_scroll.setFrameShape(QFrame.Shape.NoFrame)
+        tags_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        tags_scroll.setMaximumHeight(160)
 
         input_groupbox_layout.addLayout(add_keyword_layout)
-        input_groupbox_layout.addWidget(tags_container)
+        input_groupbox_layout.addWidget(tags_scroll)
 
         # Hubungkan sinyal
         self.add_keyword_button.clicked.connect(self.add_keyword)
         self.keywords_input.returnPressed.connect(self.add_keyword)
+        self.import_keywords_button.clicked.connect(self.import_keywords)
         
         # upload PDF
         pdf_layout = QHBoxLayout()
@@ -383,13 +922,17 @@ class MainWindow(QMainWindow):
         # algoritma
         algo_layout = QVBoxLayout()
         algo_layout.addWidget(QLabel("<b>Algoritma Pencocokan String:</b>"))
-        self.ac_radio = QRadioButton("Aho-Corasick") # New radio button
-        self.kmp_radio = QRadioButton("KMP")
-        self.bm_radio = QRadioButton("Boyer-Moore")
-        self.ac_radio.setChecked(True) # Set Aho-Corasick as default
-        algo_layout.addWidget(self.ac_radio)
-        algo_layout.addWidget(self.kmp_radio)
-        algo_layout.addWidget(self.bm_radio)
+        # Satu radio button per engine yang terdaftar di search_engine, lalu mode khusus
+        algorithm_labels = {name: name for name in EXACT_ALGORITHMS}
+        algorithm_labels["Regex"] = "Regex (setiap keyword adalah pattern)"
+        algorithm_labels["Suffix Array"] = "Suffix Array (index)"
+        algorithm_labels["Auto"] = "Auto (pilih algoritma tercepat)"
+        self.algorithm_radios = {}
+        for name, label in algorithm_labels.items():
+            radio = QRadioButton(label)
+            self.algorithm_radios[name] = radio
+            algo_layout.addWidget(radio)
+        self.algorithm_radios["Aho-Corasick"].setChecked(True) # Set Aho-Corasick as default
 
         # Pengaturan
         top_matches_layout = QVBoxLayout()
@@ -406,10 +949,67 @@ class MainWindow(QMainWindow):
         top_matches_layout.addLayout(input_line_layout)
         self.fuzzy_match_checkbox = QCheckBox("Gunakan Fuzzy Matching (Perbolehkan Typo)")
         self.fuzzy_match_checkbox.setChecked(True)
+        self.fuzzy_match_checkbox.setToolTip(
+            "Keyword yang tidak ditemukan persis dicari sebagai potongan teks dengan toleransi typo "
+            "(1-3 edit sesuai panjang keyword), tanpa batas kata: kecocokan boleh berada di dalam kata lain "
+            "atau melintasi spasi, mis. 'pyhton' cocok dengan 'python3' dan 'machine lerning' dengan 'machinelearning'")
         top_matches_layout.addWidget(self.fuzzy_match_checkbox)
         
+        ranking_layout = QHBoxLayout()
+        self.ranking_selector = QComboBox()
+        self.ranking_selector.addItems([RANKING_COUNT, RANKING_BM25])
+        self.ranking_selector.setToolTip("BM25: skor relevansi (frekuensi keyword relatif terhadap panjang CV dan kelangkaan keyword)")
+        self.fuzzy_penalty_input = QDoubleSpinBox()
+        self.fuzzy_penalty_input.setRange(0.0, 1.0)
+        self.fuzzy_penalty_input.setSingleStep(0.1)
+        self.fuzzy_penalty_input.setValue(0.5)
+        self.fuzzy_penalty_input.setToolTip("Bobot skor kata yang cocok secara fuzzy (0 = abaikan, 1 = sama dengan exact)")
+        ranking_layout.addWidget(QLabel("Ranking"))
+        ranking_layout.addWidget(self.ranking_selector)
+        ranking_layout.addWidget(QLabel("Penalti Fuzzy"))
+        ranking_layout.addWidget(self.fuzzy_penalty_input)
+        top_matches_layout.addLayout(ranking_layout)
+        self.ranking_selector.currentTextChanged.connect(self.update_ranking_options)
+        self.fuzzy_match_checkbox.toggled.connect(self.update_ranking_options)
+        self.update_ranking_options()
+        
+        # Filter kandidat, dijalankan langsung di query SQL katalog
+        filter_layout = QVBoxLayout()
+        filter_layout.addWidget(QLabel("<b>Filter Kandidat:</b>"))
+        role_layout = QHBoxLayout()
+        self.role_filter = QComboBox()
+        self.role_filter.addItem(ALL_ROLES)
+        role_layout.addWidget(QLabel("Role"))
+        role_layout.addWidget(self.role_filter, 1)
+        filter_layout.addLayout(role_layout)
+        age_layout = QHBoxLayout()
+        self.min_age_filter = QSpinBox()
+        self.max_age_filter = QSpinBox()
+        for age_input in (self.min_age_filter, self.max_age_filter):
+            age_input.setRange(0, 100)
+            age_input.setSpecialValueText("-")  # 0 = tanpa batas
+        age_layout.addWidget(QLabel("Umur"))
+        age_layout.addWidget(self.min_age_filter)
+        age_layout.addWidget(QLabel("s.d."))
+        age_layout.addWidget(self.max_age_filter)
+        filter_layout.addLayout(age_layout)
+        upload_date_layout = QHBoxLayout()
+        self.upload_date_checkbox = QCheckBox("Upload sejak")
+        self.upload_date_filter = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.upload_date_filter.setCalendarPopup(True)
+        self.upload_date_filter.setEnabled(False)
+        self.upload_date_checkbox.toggled.connect(self.upload_date_filter.setEnabled)
+        upload_date_layout.addWidget(self.upload_date_checkbox)
+        upload_date_layout.addWidget(self.upload_date_filter)
+        filter_layout.addLayout(upload_date_layout)
+        filter_hint = QLabel("Jika filter aktif, hanya CV database yang dicari")
+        filter_hint.setStyleSheet("color: #9aa0a6;")
+        filter_layout.addWidget(filter_hint)
+        filter_layout.addStretch()
+
         options_layout.addLayout(algo_layout)
         options_layout.addLayout(top_matches_layout)
+        options_layout.addLayout(filter_layout)
 
         # search
         search_layout = QHBoxLayout()
@@ -417,12 +1017,18 @@ class MainWindow(QMainWindow):
         self.search_button.setMinimumHeight(40)
         self.search_button.clicked.connect(self.execute_search)
         
+        self.batch_button = QPushButton("📋 Batch Screening")
+        self.batch_button.setMinimumHeight(40)
+        self.batch_button.setToolTip("Muat file lowongan (satu per baris, 'Nama Lowongan: keyword1, keyword2')")
+        self.batch_button.clicked.connect(self.execute_batch_search)
+        
         self.cancel_button = QPushButton("❌ Cancel")
         self.cancel_button.setMinimumHeight(40)
         self.cancel_button.clicked.connect(self.cancel_search)
         self.cancel_button.setEnabled(False)
         
         search_layout.addWidget(self.search_button)
+        search_layout.addWidget(self.batch_button)
         search_layout.addWidget(self.cancel_button)
         
         # Progress bar
@@ -436,13 +1042,16 @@ class MainWindow(QMainWindow):
 
         # hasil
         self.summary_label = QLabel("Hasil Pencarian Akan Ditampilkan di Sini")
-        self.results_area = QWidget()
-        self.results_layout = QVBoxLayout(self.results_area)
-        self.results_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setWidget(self.results_area)
+        # Pilihan lowongan, hanya tampil untuk hasil batch screening
+        self.batch_selector = QComboBox()
+        self.batch_selector.setVisible(False)
+        self.batch_selector.currentTextChanged.connect(self.show_batch_ranking)
+        
+        # Hasil ditampilkan lewat model/view: hanya baris yang terlihat yang digambar
+        self.results_view = ResultsView()
+        self.results_view.delegate.summary_clicked.connect(self.show_summary)
+        self.results_view.delegate.view_clicked.connect(self.view_cv)
 
         self.main_layout.addWidget(input_groupbox)
         self.main_layout.addLayout(pdf_layout)
@@ -453,32 +1062,56 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(self.progress_label)
         self.main_layout.addWidget(self.create_separator())
         self.main_layout.addWidget(self.summary_label)
-        self.main_layout.addWidget(scroll)
+        self.main_layout.addWidget(self.batch_selector)
+        self.main_layout.addWidget(self.results_view)
 
     def add_keyword(self):
-        keyword = self.keywords_input.text().strip()
-        if keyword and keyword.lower() not in [kw.lower() for kw in self.current_keywords]:
-            self.current_keywords.append(keyword)
+        if self.add_keywords([self.keywords_input.text().strip()]):
+            self.keywords_input.clear()
+
+    def add_keywords(self, keywords):
+        """Tambah keyword (duplikat case-insensitive dilewati), mengembalikan jumlah yang ditambahkan"""
+        tags_container = self.tags_layout.parentWidget()
+        # Container disembunyikan selama tag ditambahkan: tag baru tidak di-polish/di-show satu per satu
+        # (masing-masing memicu relayout seluruh FlowLayout), layout cukup dihitung sekali saat ditampilkan lagi
+        was_hidden = tags_container.isHidden()
+        tags_container.setUpdatesEnabled(False)
+        tags_container.hide()
+        added = 0
+        try:
+            for keyword in keywords:
+                key = keyword.lower()
+                if not keyword or key in self.keyword_tags:
+                    continue
+                self.current_keywords.append(keyword)
 
-            tag_widget = KeywordTag(keyword)
-            tag_widget.removed.connect(self.remove_keyword) # Hubungkan sinyal remove
-            self.tags_layout.addWidget(tag_widget)
+                tag_widget = KeywordTag(keyword)
+                tag_widget.removed.connect(self.remove_keyword) # Hubungkan sinyal remove
+                self.tags_layout.addWidget(tag_widget)
+                self.keyword_tags[key] = tag_widget
+                added += 1
+        finally:
+            tags_container.setHidden(was_hidden)
+            tags_container.setUpdatesEnabled(True)
+        return added
 
-            self.keywords_input.clear()
+    def import_keywords(self):
+        dialog = KeywordImportDialog(self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        keywords = dialog.keywords()
+        added = self.add_keywords(keywords)
+        self.statusBar().showMessage(f"{added} keyword ditambahkan ({len(keywords) - added} sudah ada)")
 
     def remove_keyword(self, keyword_to_remove):
-        self.current_keywords = [kw for kw in self.current_keywords if kw.lower() != keyword_to_remove.lower()]
-        
-        for i in range(self.tags_layout.count() - 1, -1, -1):
-            widget = self.tags_layout.itemAt(i).widget()
-            
-            if isinstance(widget, KeywordTag) and widget.keyword_text.lower() == keyword_to_remove.lower():
-                layout_item = self.tags_layout.takeAt(i)
-                if layout_item and layout_item.widget():
-                    layout_item.widget().deleteLater()
-                break
+        key = keyword_to_remove.lower()
+        self.current_keywords = [kw for kw in self.current_keywords if kw.lower() != key]
 
-        self.tags_layout.update()
+        tag_widget = self.keyword_tags.pop(key, None)
+        if tag_widget is not None:
+            self.tags_layout.takeWidget(tag_widget)
+            tag_widget.hide()
+            tag_widget.deleteLater()
 
     def create_separator(self):
         separator = QFrame()
@@ -486,51 +1119,137 @@ class MainWindow(QMainWindow):
         separator.setFrameShadow(QFrame.Shadow.Sunken)
         return separator
 
+    def set_search_enabled(self, enabled):
+        self.search_button.setEnabled(enabled)
+        self.batch_button.setEnabled(enabled)
+
+    def update_ranking_options(self):
+        # Penalti fuzzy hanya berlaku untuk ranking BM25 dengan fuzzy matching aktif
+        self.fuzzy_penalty_input.setEnabled(
+            self.ranking_selector.currentText() == RANKING_BM25 and self.fuzzy_match_checkbox.isChecked())
+
+    def current_filters(self):
+        """Filter kandidat yang aktif, dalam format utils.database.catalog_filter_clauses"""
+        filters = {}
+        if self.role_filter.currentText() != ALL_ROLES:
+            filters["role"] = self.role_filter.currentText()
+        if self.min_age_filter.value() > 0:
+            filters["min_age"] = self.min_age_filter.value()
+        if self.max_age_filter.value() > 0:
+            filters["max_age"] = self.max_age_filter.value()
+        if self.upload_date_checkbox.isChecked():
+            filters["uploaded_from"] = self.upload_date_filter.date().toPyDate()
+        return filters
+
+    def update_role_filter(self, catalog):
+        # Daftar role diambil dari katalog yang sudah dimuat, tanpa query tambahan
+        selected = self.role_filter.currentText()
+        roles = sorted({row["application_role"] for row in catalog if row.get("application_role")})
+        self.role_filter.clear()
+        self.role_filter.addItem(ALL_ROLES)
+        self.role_filter.addItems(roles)
+        self.role_filter.setCurrentText(selected if selected in roles else ALL_ROLES)
+
+    def selected_algorithm_name(self):
+        for name, radio in self.algorithm_radios.items():
+            if radio.isChecked():
+                return name
+        return "Aho-Corasick"
+
+    def start_background_warmup(self):
+        """Dipanggil setelah jendela tampil: DB, katalog dan cache dimuat di background"""
+        self.window_shown_time = time.perf_counter() - STARTUP_T0
+        self.set_search_enabled(False)
+        self.statusBar().showMessage(f"Jendela tampil dalam {self.window_shown_time * 1000:.0f} ms, memuat data...")
+
+        self.startup_worker = StartupWorker(self.text_cache, self.trigram_index, self.inverted_index)
+        self.startup_worker.status.connect(self.statusBar().showMessage)
+        self.startup_worker.db_ready.connect(self.on_db_ready)
+        self.startup_worker.db_failed.connect(self.on_db_failed)
+        self.startup_worker.finished.connect(self.on_warmup_finished)
+        self.startup_worker.start()
+
+    def on_db_ready(self, connection, catalog):
+        self.db_connection = connection
+        self.cv_catalog = catalog
+        self.filtered_catalog = None
+        self.update_role_filter(catalog)
+        self.set_search_enabled(True)
+        print(f"✅ Berhasil tersambung ke database ({len(catalog)} CV di katalog).")
+
+    def on_db_failed(self, error_message):
+        self.set_search_enabled(True)
+        QMessageBox.critical(self, "Kesalahan Koneksi DB", f"Gagal tersambung: {error_message}")
+
+    def on_warmup_finished(self, timings):
+        if SEARCH_PROCESSES > 1:
+            self.corpus_store = open_corpus_store(CORPUS_STORE_PATH)
+            if self.corpus_store:
+                self.parallel_searcher = ParallelSearcher(CORPUS_STORE_PATH, SEARCH_PROCESSES)
+        if SUFFIX_INDEX_MAX_CHARS > 0:
+            self.suffix_index = timed_import("algorithms.suffix_array").open_suffix_index(SUFFIX_INDEX_PATH)
+        total_startup = time.perf_counter() - STARTUP_T0
+        self.statusBar().showMessage(
+            f"Siap. Jendela tampil {self.window_shown_time * 1000:.0f} ms, "
+            f"data siap {total_startup * 1000:.0f} ms setelah start"
+        )
+        print(f"⏱️ Startup: jendela tampil {self.window_shown_time * 1000:.1f} ms, warm-up selesai {total_startup * 1000:.1f} ms")
+        print(format_timings(timings))
+        print("⏱️ Waktu import modul:")
+        print(format_timings(import_timings))
+
     def connect_to_database(self):
         try:
-            self.db_connection = mysql.connector.connect(
-                host=os.getenv("DB_HOST"),
-                port=int(os.getenv("DB_PORT")),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                database=os.getenv("DB_NAME"),
-            )
+            self.db_connection = open_db_connection()
             if self.db_connection.is_connected():
                 print("✅ Berhasil tersambung ke database.")
-        except (mysql.connector.Error, ValueError) as err:
+        except Exception as err:
             QMessageBox.critical(self, "Kesalahan Koneksi DB", f"Gagal tersambung: {err}")
             self.db_connection = None
     
     def fetch_cvs_from_db(self):
+        filters = self.current_filters()
+        if filters:
+            return self.fetch_filtered_cvs_from_db(filters)
+        if self.cv_catalog is not None:
+            return self.cv_catalog
+
         if not self.db_connection or not self.db_connection.is_connected():
             self.connect_to_database()
             if not self.db_connection:
                 return []
 
-        cursor = self.db_connection.cursor(dictionary=True)
-        query = """
-            SELECT 
-                ap.applicant_id,
-                ap.first_name,
-                ap.last_name,
-                ap.date_of_birth,
-                ap.address,
-                ap.phone_number,
-                ad.detail_id,
-                ad.application_role,
-                ad.cv_path
-            FROM ApplicantProfile ap
-            JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
-            ORDER BY ad.detail_id DESC
-        """
+        import mysql.connector
         try:
-            cursor.execute(query)
-            return cursor.fetchall()
+            self.cv_catalog = query_cv_catalog(self.db_connection)
+            self.update_role_filter(self.cv_catalog)
+            return self.cv_catalog
         except mysql.connector.Error as err:
             QMessageBox.warning(self, "Query Error", f"Gagal mengambil data CV: {err}")
             return []
-        finally:
-            cursor.close()
+
+    def fetch_filtered_cvs_from_db(self, filters):
+        # Filter dijalankan di SQL memakai index sekunder; hanya subset ini yang diekstrak dan dicocokkan.
+        # Key cache memakai batas tanggal hasil perhitungan (bukan umur), jadi filter umur yang sama
+        # dihitung ulang begitu tanggal berganti
+        clauses, params = catalog_filter_clauses(filters)
+        filter_key = (tuple(clauses), tuple(params))
+        if self.filtered_catalog is not None and self.filtered_catalog[0] == filter_key:
+            return self.filtered_catalog[1]
+
+        if not self.db_connection or not self.db_connection.is_connected():
+            self.connect_to_database()
+            if not self.db_connection:
+                return []
+
+        import mysql.connector
+        try:
+            catalog = query_cv_catalog(self.db_connection, filters=filters)
+        except mysql.connector.Error as err:
+            QMessageBox.warning(self, "Query Error", f"Gagal mengambil data CV terfilter: {err}")
+            return []
+        self.filtered_catalog = (filter_key, catalog)
+        return catalog
 
     def save_uploaded_cv_to_db(self, file_path):
         if not self.db_connection or not self.db_connection.is_connected():
@@ -538,6 +1257,7 @@ class MainWindow(QMainWindow):
             if not self.db_connection:
                 return None
 
+        import mysql.connector
         cursor = self.db_connection.cursor()
         filename = os.path.basename(file_path)
         
@@ -563,6 +1283,8 @@ class MainWindow(QMainWindow):
             detail_id = cursor.lastrowid
             
             self.db_connection.commit()
+            self.cv_catalog = None  # katalog dimuat ulang pada pencarian berikutnya
+            self.filtered_catalog = None
             return detail_id
             
         except mysql.connector.Error as err:
@@ -572,9 +1294,16 @@ class MainWindow(QMainWindow):
         finally:
             cursor.close()
 
-    def save_search_results(self, detail_id, search_query, algorithm_used, matches_found):
-        # Log search results instead of saving to database since search_results table doesn't exist
-        print(f"Search performed - Detail ID: {detail_id}, Query: '{search_query}', Algorithm: {algorithm_used}, Matches: {matches_found}")
+    def save_search_results(self, top_results, duration_exact, duration_fuzzy, total_scanned):
+        # Hanya dimasukkan ke antrean; SearchHistory menulis ke SearchLog/SearchResult secara batch di background
+        search = self.pending_search
+        self.pending_search = None
+        if search is None:
+            return
+        self.search_history.record(
+            search["query"], search["query_key"], search["fingerprint"], search["algorithm"], search["ranking"],
+            search["top_n"], top_results, duration_exact, duration_fuzzy, total_scanned, search["cacheable"]
+        )
 
     def upload_pdf_files(self):
         file_dialog = QFileDialog()
@@ -587,10 +1316,19 @@ class MainWindow(QMainWindow):
         
         if file_paths:
             successfully_added = 0
+            known_hashes = {self.text_cache.content_hash(path): path for path in self.uploaded_pdf_files}
             for file_path in file_paths:
                 if file_path not in self.uploaded_pdf_files:
                     self.uploaded_pdf_files.append(file_path)
                     
+                    # Ekstraksi teks dilakukan sekali per isi file; file identik berbagi hasilnya
+                    content_hash = self.text_cache.content_hash(file_path)
+                    if content_hash in known_hashes:
+                        print(f"ℹ️ {os.path.basename(file_path)} identik dengan {os.path.basename(known_hashes[content_hash])}, teks hasil ekstraksi dipakai bersama")
+                    elif content_hash:
+                        known_hashes[content_hash] = file_path
+                        self.text_cache.get_summary(file_path)
+                    
                     try:
                         detail_id = self.save_uploaded_cv_to_db(file_path)
                         if detail_id:
@@ -640,25 +1378,13 @@ class MainWindow(QMainWindow):
         
         db_cvs = self.fetch_cvs_from_db()
         for cv_data in db_cvs:
-            cv_path = cv_data.get("cv_path")
-            if cv_path and os.path.exists(cv_path):
-                filename = os.path.basename(cv_path)
-                applicant_data = {
-                    "applicant_id": cv_data["applicant_id"],
-                    "detail_id": cv_data["detail_id"],
-                    "first_name": cv_data["first_name"] or filename.replace(".pdf", ""),
-                    "last_name": cv_data["last_name"] or "",
-                    "date_of_birth": cv_data["date_of_birth"].strftime("%Y-%m-%d") if cv_data["date_of_birth"] else "N/A",
-                    "address": cv_data["address"] or "Database Entry",
-                    "phone_number": cv_data["phone_number"] or "N/A",
-                    "application_role": cv_data["application_role"] or "CV dari Database",
-                    "cv_path": cv_path
-                }
-                all_cvs.append({
-                    "source": "database",
-                    "applicant": applicant_data,
-                    "cv_path": cv_path
-                })
+            cv_source = cv_source_from_row(cv_data)
+            if cv_source:
+                all_cvs.append(cv_source)
+        
+        # Role, umur dan tanggal upload hanya diketahui untuk CV di database
+        if self.current_filters():
+            return all_cvs
         
         for i, file_path in enumerate(self.uploaded_pdf_files):
             if os.path.exists(file_path):
@@ -693,37 +1419,96 @@ class MainWindow(QMainWindow):
         if self.search_worker and self.search_worker.isRunning():
             self.search_worker.cancel()
             self.search_worker.wait()
+        self.stop_summary_prefetch()
 
         keywords = self.current_keywords
         keyword_map = {kw.lower(): kw for kw in keywords}
         
         top_n = self.top_matches_input.value()
         
-        is_ac_selected = self.ac_radio.isChecked()
-        is_kmp_selected = self.kmp_radio.isChecked()
+        algorithm = self.selected_algorithm_name()
         use_fuzzy = self.fuzzy_match_checkbox.isChecked()
+        ranking = self.ranking_selector.currentText()
+        
+        filters = self.current_filters()
+        if "min_age" in filters and "max_age" in filters and filters["min_age"] > filters["max_age"]:
+            QMessageBox.warning(self, "Filter Tidak Valid", "Umur minimum lebih besar dari umur maksimum.")
+            return
+        
+        if ranking == RANKING_BM25 and algorithm == "Regex":
+            QMessageBox.warning(self, "Ranking Tidak Didukung", "Ranking BM25 hanya untuk keyword, bukan pattern Regex.")
+            return
+        
+        if algorithm != "Regex":
+            for keyword in keywords:
+                try:
+                    parse_query(keyword)
+                except ValueError as e:
+                    QMessageBox.warning(self, "Keyword Tidak Valid", str(e))
+                    return
+        
+        if algorithm == "Regex":
+            from algorithms.regex_search import analyze_pattern_complexity
+            for pattern in keywords:
+                problems = analyze_pattern_complexity(pattern)
+                if problems:
+                    QMessageBox.warning(self, "Pattern Regex Ditolak", f"Pattern '{pattern}':\n- " + "\n- ".join(problems))
+                    return
         
+        # Shard memuat katalog tanpa filter, jadi pencarian terfilter dijalankan lokal
+        use_shards = (self.shard_coordinator is not None and ranking == RANKING_COUNT
+                      and algorithm in SHARD_ALGORITHMS and not any(is_proximity_query(kw) for kw in keywords)
+                      and not filters)
         all_cv_sources = self.get_all_cv_sources()
-        if not all_cv_sources:
+        if not all_cv_sources and not use_shards:
             QMessageBox.information(self, "Info", "Tidak ada CV yang tersedia untuk dicari (baik dari database maupun file yang diupload).")
             return
 
-        self.search_button.setEnabled(False)
+        # Query identik atas korpus yang sama (fingerprint sama) dijawab dari riwayat pencarian;
+        # fingerprint dan lookup dikerjakan SearchWorker agar GUI tidak menunggu hash file/database.
+        # Korpus di shard tidak terlihat dari sini dan hasil Regex bisa terpotong batas waktu,
+        # jadi keduanya hanya dicatat, tidak pernah dijawab dari cache.
+        query_key = query_cache_key(keywords, algorithm, use_fuzzy, ranking, self.fuzzy_penalty_input.value(), top_n)
+        cacheable = not use_shards and algorithm != "Regex"
+        self.pending_search = {
+            "query": ", ".join(keywords),
+            "query_key": query_key,
+            "fingerprint": "",  # diisi SearchWorker lewat fingerprint_ready
+            "algorithm": algorithm,
+            "ranking": ranking,
+            "top_n": top_n,
+            "cacheable": cacheable,
+        }
+
+        self.set_search_enabled(False)
         self.cancel_button.setEnabled(True)
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         self.progress_label.setVisible(True)
         self.progress_label.setText("Mempersiapkan pencarian...")
         
-        for i in reversed(range(self.results_layout.count())):
-            self.results_layout.itemAt(i).widget().setParent(None)
+        self.clear_results()
         
         self.summary_label.setText("Pencarian sedang berjalan...")
 
-        self.search_worker = SearchWorker(
-            keywords, all_cv_sources, top_n, is_ac_selected, 
-            is_kmp_selected, use_fuzzy, keyword_map
-        )
+        if use_shards:
+            # CV database ada di shard; hanya CV upload yang dicari di sini
+            uploaded_sources = [cv for cv in all_cv_sources if cv["source"] == "uploaded"]
+            self.search_worker = ShardSearchWorker(
+                keywords, algorithm, top_n, self.shard_coordinator, uploaded_sources, self.text_cache
+            )
+            self.search_worker.shard_reports.connect(self.on_shard_reports)
+        else:
+            self.search_worker = SearchWorker(
+                keywords, all_cv_sources, top_n, algorithm,
+                use_fuzzy, keyword_map, self.text_cache,
+                self.parallel_searcher, self.corpus_store, self.trigram_index, self.suffix_index,
+                ranking, self.inverted_index, self.fuzzy_penalty_input.value(),
+                self.search_history, query_key, cacheable, self.db_connection is not None
+            )
+            self.search_worker.partial_results.connect(self.on_partial_results)
+            self.search_worker.fingerprint_ready.connect(self.on_fingerprint_ready)
+            self.search_worker.cached_results.connect(self.on_cached_results)
         
         self.search_worker.progress.connect(self.on_search_progress)
         self.search_worker.finished.connect(self.on_search_finished)
@@ -731,6 +1516,69 @@ class MainWindow(QMainWindow):
         
         self.search_worker.start()
     
+    def execute_batch_search(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Pilih File Lowongan", "", "Text Files (*.txt);;All Files (*)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                queries = parse_batch_queries(f.read())
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            QMessageBox.warning(self, "File Lowongan Tidak Valid", str(e))
+            return
+        if not queries:
+            QMessageBox.warning(self, "Input Kosong", "File lowongan tidak berisi query apa pun.")
+            return
+
+        if self.search_worker and self.search_worker.isRunning():
+            self.search_worker.cancel()
+            self.search_worker.wait()
+        self.stop_summary_prefetch()
+
+        all_cv_sources = self.get_all_cv_sources()
+        if not all_cv_sources:
+            QMessageBox.information(self, "Info", "Tidak ada CV yang tersedia untuk dicari (baik dari database maupun file yang diupload).")
+            return
+
+        self.set_search_enabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.progress_label.setVisible(True)
+        self.progress_label.setText("Mempersiapkan batch screening...")
+
+        self.clear_results()
+
+        self.summary_label.setText(f"Batch screening {len(queries)} lowongan sedang berjalan...")
+
+        self.search_worker = BatchSearchWorker(
+            queries, all_cv_sources, self.top_matches_input.value(), self.text_cache, self.trigram_index
+        )
+        self.search_worker.progress.connect(self.on_search_progress)
+        self.search_worker.finished.connect(self.on_batch_search_finished)
+        self.search_worker.error.connect(self.on_search_error)
+        self.search_worker.start()
+
+    def on_batch_search_finished(self, rankings, duration, total_scanned):
+        self.set_search_enabled(True)
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        self.progress_label.setVisible(False)
+
+        self.summary_label.setText(
+            f"<b>Batch Screening ({len(rankings)} lowongan, {total_scanned} CV):</b><br>"
+            f"• Waktu Eksekusi (satu kali scan untuk semua lowongan): {duration:.4f} detik"
+        )
+        self.batch_rankings = rankings
+        self.batch_selector.blockSignals(True)
+        self.batch_selector.clear()
+        self.batch_selector.addItems(list(rankings))
+        self.batch_selector.blockSignals(False)
+        self.batch_selector.setVisible(True)
+        self.show_batch_ranking(self.batch_selector.currentText())
+
+        self.prefetch_summaries([res for top_results in rankings.values() for res in top_results])
+
     def cancel_search(self):
         if self.search_worker and self.search_worker.isRunning():
             self.search_worker.cancel()
@@ -743,23 +1591,61 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(percentage)
         self.progress_label.setText(message)
     
+    def on_partial_results(self, top_results):
+        """Ranking sementara selama pencarian berjalan"""
+        self.summary_label.setText(f"Pencarian sedang berjalan... ({len(top_results)} CV teratas sementara)")
+        self.show_result_cards(top_results)
+    
+    def on_shard_reports(self, reports):
+        missing = [f"shard {report['shard']} ({report['status']})" for report in reports if report["status"] != "ok"]
+        if missing:
+            self.statusBar().showMessage("Hasil parsial, tidak ada jawaban dari: " + ", ".join(missing))
+        else:
+            self.statusBar().showMessage(f"Semua {len(reports)} shard menjawab (fuzzy matching tidak dijalankan di shard)")
+
     def on_search_finished(self, top_results, duration_exact, duration_fuzzy, total_scanned):
-        self.search_button.setEnabled(True)
+        self.set_search_enabled(True)
         self.cancel_button.setEnabled(False)
         self.progress_bar.setVisible(False)
         self.progress_label.setVisible(False)
         
         self.display_results(top_results, duration_exact, duration_fuzzy, total_scanned)
+        self.prefetch_summaries(top_results)
+        self.save_search_results(top_results, duration_exact, duration_fuzzy, total_scanned)
+    
+    def on_fingerprint_ready(self, fingerprint):
+        if self.pending_search is not None:
+            self.pending_search["fingerprint"] = fingerprint
+    
+    def on_cached_results(self, cached_results, total_scanned):
+        self.pending_search = None
+        self.set_search_enabled(True)
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        self.progress_label.setVisible(False)
         
-        for result in top_results:
-            applicant = result["applicant"]
-            if applicant.get("detail_id") and str(applicant["detail_id"]).isdigit():
-                algorithm_name = "Aho-Corasick" if self.ac_radio.isChecked() else ("KMP" if self.kmp_radio.isChecked() else "Boyer-Moore")
-                search_query = ", ".join(self.current_keywords)
-                self.save_search_results(applicant["detail_id"], search_query, algorithm_name, result["score"])
+        self.display_results(cached_results, 0.0, 0.0, total_scanned)
+        self.prefetch_summaries(cached_results)
+        self.statusBar().showMessage("Hasil diambil dari riwayat pencarian (query dan korpus tidak berubah)")
     
+    def prefetch_summaries(self, top_results):
+        self.stop_summary_prefetch()
+        cv_paths = []
+        for result in top_results:
+            cv_path = result["applicant"].get("cv_path")
+            if cv_path and cv_path not in cv_paths and not self.text_cache.has_summary(cv_path):
+                cv_paths.append(cv_path)
+        if cv_paths:
+            self.summary_worker = SummaryPrefetchWorker(self.text_cache, cv_paths)
+            self.summary_worker.start()
+
+    def stop_summary_prefetch(self):
+        if self.summary_worker and self.summary_worker.isRunning():
+            self.summary_worker.cancel()
+            self.summary_worker.wait()
+
     def on_search_error(self, error_message):
-        self.search_button.setEnabled(True)
+        self.set_search_enabled(True)
         self.cancel_button.setEnabled(False)
         self.progress_bar.setVisible(False)
         self.progress_label.setVisible(False)
@@ -768,20 +1654,16 @@ class MainWindow(QMainWindow):
         self.summary_label.setText("Pencarian gagal.")
     
     def on_search_cancelled(self):
-        self.search_button.setEnabled(True)
+        self.set_search_enabled(True)
         self.cancel_button.setEnabled(False)
         self.progress_bar.setVisible(False)
         self.progress_label.setVisible(False)
         
         self.summary_label.setText("Pencarian dibatalkan.")
         
-        for i in reversed(range(self.results_layout.count())):
-            self.results_layout.itemAt(i).widget().setParent(None)
+        self.clear_results()
         
     def display_results(self, top_results, duration_exact, duration_fuzzy, total_scanned):
-        for i in reversed(range(self.results_layout.count())):
-            self.results_layout.itemAt(i).widget().setParent(None)
-            
         db_count = len(self.fetch_cvs_from_db())
         uploaded_count = len(self.uploaded_pdf_files)
         
@@ -796,17 +1678,60 @@ class MainWindow(QMainWindow):
         
         self.summary_label.setText(summary_text)
 
-        if not top_results:
-            self.results_layout.addWidget(QLabel("Tidak ada CV yang cocok dengan kata kunci yang diberikan."))
+        self.results_view.set_results(top_results, "Tidak ada CV yang cocok dengan kata kunci yang diberikan.")
+
+    def clear_results(self):
+        self.batch_rankings = {}
+        self.batch_selector.setVisible(False)
+        self.results_view.set_results([])
+
+    def show_result_cards(self, top_results):
+        self.results_view.set_results(top_results)
+
+    def show_batch_ranking(self, name):
+        if name in self.batch_rankings:
+            self.results_view.set_results(self.batch_rankings[name], "Tidak ada CV yang cocok.")
+
+    def show_summary(self, applicant_data):
+        cv_path = applicant_data.get("cv_path")
+        if not cv_path or not os.path.exists(cv_path):
+            QMessageBox.warning(self, "Error", f"File CV tidak ditemukan di path: {cv_path}")
+            return
+            
+        fields = self.text_cache.get_summary(cv_path)
+        if not fields:
+            QMessageBox.warning(self, "Error", f"Gagal mengekstrak teks dari {os.path.basename(cv_path)}.")
+            return
+
+        dialog = SummaryDialog(applicant_data, fields, self)
+        dialog.exec()
+
+    def view_cv(self, applicant_data):
+        cv_path = applicant_data.get("cv_path")
+        if cv_path and os.path.exists(cv_path):
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(cv_path)))
         else:
-            for res in top_results:
-                card = CVCard(res['applicant'], res['matches'])
-                self.results_layout.addWidget(card)
+            QMessageBox.warning(self, "Error", f"File CV tidak ditemukan di path: {cv_path}")
 
     def closeEvent(self, event):
+        if self.startup_worker and self.startup_worker.isRunning():
+            self.startup_worker.cancel()
+            self.startup_worker.wait()
         if self.search_worker and self.search_worker.isRunning():
             self.search_worker.cancel()
             self.search_worker.wait()
+        self.stop_summary_prefetch()
+        self.text_cache.save_snapshot(SNAPSHOT_PATH, indexes={"trigram_index": self.trigram_index,
+                                                              "inverted_index": self.inverted_index})
+        if self.parallel_searcher:
+            self.parallel_searcher.close()
+        if self.corpus_store:
+            self.corpus_store.close()
+        if self.suffix_index:
+            self.suffix_index.close()
+        if self.shard_coordinator:
+            self.shard_coordinator.close()
+        self.search_history.close()
         event.accept()
 
 if __name__ == "__main__":
@@ -842,4 +1767,5 @@ if __name__ == "__main__":
     app.setStyleSheet(stylesheet)
     window = MainWindow()
     window.show()
+    window.start_background_warmup()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,204 @@
+import json
+import math
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_COSTS_PATH = os.getenv("ALGORITHM_COSTS_PATH", os.path.join("data", "algorithm_costs.json"))
+DEFAULT_LOG_PATH = os.getenv("ALGORITHM_LOG_PATH", os.path.join("logs", "algorithm_selection.jsonl"))
+COST_MODEL_VERSION = 2
+
+
+# Every engine's running time is modelled as a linear combination of a few
+# query features: docs is the number of CVs scanned, chars the total processed
+# text length, lengths the keyword lengths. The coefficients come from
+# calibrate(), so the model reflects the speed of this machine and interpreter.
+def _aho_corasick_features(lengths: List[int], docs: int, chars: int) -> List[float]:
+    # One pass per CV regardless of keyword count, plus building the trie per CV
+    return [docs, chars, docs * sum(lengths)]
+
+
+def _kmp_features(lengths: List[int], docs: int, chars: int) -> List[float]:
+    # One full pass per keyword, independent of keyword length
+    return [docs * len(lengths), len(lengths) * chars, docs * sum(lengths)]
+
+
+def _boyer_moore_features(lengths: List[int], docs: int, chars: int) -> List[float]:
+    # Lowercasing the text per keyword, then roughly chars / m alignments per keyword
+    return [docs * len(lengths), len(lengths) * chars, sum(chars / max(1, m) for m in lengths)]
+
+
+def _bit_parallel_features(lengths: List[int], docs: int, chars: int) -> List[float]:
+    # One pass per keyword; the state integer grows with the keyword length
+    return [docs * len(lengths), len(lengths) * chars, sum(chars * m for m in lengths)]
+
+
+ENGINE_FEATURES: Dict[str, Callable[[List[int], int, int], List[float]]] = {
+    "Aho-Corasick": _aho_corasick_features,
+    "KMP": _kmp_features,
+    "Boyer-Moore": _boyer_moore_features,
+    # Horspool and Sunday skip like Boyer-Moore, Two-Way scans like KMP
+    "Horspool": _boyer_moore_features,
+    "Sunday": _boyer_moore_features,
+    "Two-Way": _kmp_features,
+    "Shift-Or": _bit_parallel_features,
+}
+
+
+def _benchmark_corpus(size: int, rng: random.Random) -> str:
+    from algorithms.regex_search import DEFAULT_SKILLS
+
+    vocabulary = [skill.lower() for skill in DEFAULT_SKILLS] + [
+        "experience", "project", "team", "developed", "managed", "university",
+        "responsible", "analysis", "design", "system", "data", "application",
+    ]
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _random_keyword(length: int, rng: random.Random) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length))
+
+
+def calibrate(repeats: int = 3, seed: int = 0) -> Dict[str, List[float]]:
+    """
+    Run a short micro-benchmark of every engine over synthetic CV-like text
+    with varying text size, keyword count and keyword length, and fit the
+    per-engine cost coefficients by least squares.
+    """
+    import numpy as np
+    from utils.search_engine import exact_match_counts
+
+    rng = random.Random(seed)
+    samples = []
+    for size in (2000, 8000, 24000):
+        text = _benchmark_corpus(size, rng)
+        text_words = text.split()
+        for count in (1, 4, 12):
+            for length in (3, 6, 12):
+                # Half of the keywords occur in the text, half are random strings
+                keywords = [rng.choice(text_words) if i % 2 == 0 else _random_keyword(length, rng) for i in range(count)]
+                samples.append((text, list(dict.fromkeys(keywords))))
+
+    coefficients = {}
+    for engine, features in ENGINE_FEATURES.items():
+        rows, timings = [], []
+        for text, keywords in samples:
+            keyword_map = {kw: kw for kw in keywords}
+            best = math.inf
+            for _ in range(repeats):
+                start = time.perf_counter()
+                exact_match_counts(text, keywords, engine, keyword_map)
+                best = min(best, time.perf_counter() - start)
+            rows.append(features([len(kw) for kw in keywords], 1, len(text)))
+            timings.append(best)
+        solution, *_ = np.linalg.lstsq(np.array(rows, dtype=float), np.array(timings), rcond=None)
+        coefficients[engine] = [max(0.0, float(c)) for c in solution]
+    return coefficients
+
+
+class CostModel:
+    """Predicts the exact-matching time of each engine and picks the cheapest one"""
+
+    def __init__(self, coefficients: Dict[str, List[float]]):
+        self.coefficients = coefficients
+        self._log_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_COSTS_PATH) -> Optional["CostModel"]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        coefficients = data.get("engines", {}) if data.get("version") == COST_MODEL_VERSION else {}
+        if set(coefficients) != set(ENGINE_FEATURES):
+            return None
+        return cls(coefficients)
+
+    def save(self, path: str = DEFAULT_COSTS_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": COST_MODEL_VERSION,
+                "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "engines": self.coefficients,
+            }, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def predict(self, engine: str, keywords: List[str], docs: int, chars: int) -> float:
+        """Predicted seconds for matching keywords over docs CVs totalling chars characters"""
+        features = ENGINE_FEATURES[engine]([len(kw) for kw in keywords], docs, chars)
+        return sum(c * x for c, x in zip(self.coefficients[engine], features))
+
+    def choose(self, keywords: List[str], docs: int, chars: int) -> Dict:
+        """Returns {'engine': cheapest engine, 'predictions': {engine: seconds}}"""
+        predictions = {engine: self.predict(engine, keywords, docs, chars) for engine in ENGINE_FEATURES}
+        return {"engine": min(predictions, key=predictions.get), "predictions": predictions}
+
+    def log_choice(self, choice: Dict, keywords: List[str], docs: int, chars: int, actual: float,
+                   path: str = DEFAULT_LOG_PATH):
+        """Append one JSON line so predicted vs actual times can be checked later"""
+        record = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "keywords": len(keywords),
+            "keyword_lengths": [len(kw) for kw in keywords],
+            "docs": docs,
+            "chars": chars,
+            "engine": choice["engine"],
+            "predicted": choice["predictions"][choice["engine"]],
+            "actual": actual,
+            "predictions": choice["predictions"],
+        }
+        try:
+            with self._log_lock:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Could not write algorithm selection log: {e}")
+
+
+_default_model: Optional[CostModel] = None
+_model_lock = threading.Lock()
+
+
+def get_cost_model(path: str = DEFAULT_COSTS_PATH) -> CostModel:
+    """
+    Shared cost model. Loaded from path if it was calibrated before; on the
+    first run the micro-benchmark is executed once and its result saved.
+    """
+    global _default_model
+    with _model_lock:
+        if _default_model is None:
+            model = CostModel.load(path)
+            if model is None:
+                print("Calibrating search algorithm cost model...")
+                model = CostModel(calibrate())
+                try:
+                    model.save(path)
+                except OSError as e:
+                    print(f"Could not save cost model to {path}: {e}")
+            _default_model = model
+        return _default_model
+
+
+if __name__ == "__main__":
+    # Re-calibrate explicitly, e.g. after installing on a new machine:
+    #   python -m utils.algorithm_selector   (from src/)
+    model = CostModel(calibrate())
+    model.save()
+    print(f"Saved cost model to {DEFAULT_COSTS_PATH}")
+    for engine, coefficients in model.coefficients.items():
+        print(f"  {engine:<13} {coefficients}")
+    for keywords in (["java"], ["python", "sql", "java", "react", "docker", "aws"], ["machine learning"]):
+        choice = model.choose(keywords, docs=100, chars=300000)
+        print(f"  {keywords} -> {choice['engine']}")
@@ -1,5 +1,7 @@
 import os
 import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,26 +10,78 @@ PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 if not PRIVATE_KEY:
     raise ValueError("PRIVATE_KEY not set in .env")
 
+class KeyStream:
+    """
+    SHA-256 key stream for one key, derived once and extended on demand.
+    Block 0 is sha256(key) and every next block is the SHA-256 of all bytes
+    produced so far; a running hash object makes each extension cost one block
+    instead of rehashing the whole stream.
+    """
+
+    def __init__(self, key: str):
+        first_block = hashlib.sha256(key.encode()).digest()
+        self._stream = bytearray(first_block)
+        self._running_hash = hashlib.sha256(first_block)
+        self._lock = threading.Lock()
+
+    def get(self, length: int) -> bytes:
+        if length > len(self._stream):
+            with self._lock:
+                while len(self._stream) < length:
+                    block = self._running_hash.copy().digest()
+                    self._stream += block
+                    self._running_hash.update(block)
+        return bytes(self._stream[:length])
+
+_key_streams: Dict[str, KeyStream] = {}
+
+def _key_stream(key: str) -> KeyStream:
+    stream = _key_streams.get(key)
+    if stream is None:
+        stream = _key_streams.setdefault(key, KeyStream(key))
+    return stream
+
 def _stretch_key(key: str, length: int) -> bytes:
-  
-    hash_obj = hashlib.sha256(key.encode())
-    stretched = hash_obj.digest()
-    while len(stretched) < length:
-        hash_obj = hashlib.sha256(stretched)
-        stretched += hash_obj.digest()
-    return stretched[:length]
+    return _key_stream(key).get(length)
+
+def _xor(data: bytes, key_bytes: bytes) -> bytes:
+    # Whole-buffer XOR on arbitrary-precision integers instead of a per-byte loop
+    length = len(data)
+    return (int.from_bytes(data, "little") ^ int.from_bytes(key_bytes[:length], "little")).to_bytes(length, "little")
 
 def encrypt(text: str) -> str:
     text_bytes = text.encode('utf-8')
-    key_bytes = _stretch_key(PRIVATE_KEY, len(text_bytes))
-    encrypted_bytes = bytes([b ^ k for b, k in zip(text_bytes, key_bytes)])
-    return encrypted_bytes.hex()
+    return _xor(text_bytes, _stretch_key(PRIVATE_KEY, len(text_bytes))).hex()
 
 def decrypt(hash_str: str) -> str:
     encrypted_bytes = bytes.fromhex(hash_str)
-    key_bytes = _stretch_key(PRIVATE_KEY, len(encrypted_bytes))
-    decrypted_bytes = bytes([b ^ k for b, k in zip(encrypted_bytes, key_bytes)])
-    return decrypted_bytes.decode('utf-8')
+    return _xor(encrypted_bytes, _stretch_key(PRIVATE_KEY, len(encrypted_bytes))).decode('utf-8')
+
+def encrypt_many(texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """Encrypt a batch of values; the key stream is extended once for the longest one. None stays None."""
+    encoded = [text.encode('utf-8') if text is not None else None for text in texts]
+    key_bytes = _stretch_key(PRIVATE_KEY, max((len(b) for b in encoded if b is not None), default=0))
+    return [_xor(b, key_bytes).hex() if b is not None else None for b in encoded]
+
+def decrypt_many(hash_strs: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """Decrypt a batch of values produced by encrypt/encrypt_many. None stays None."""
+    encrypted = [bytes.fromhex(h) if h is not None else None for h in hash_strs]
+    key_bytes = _stretch_key(PRIVATE_KEY, max((len(b) for b in encrypted if b is not None), default=0))
+    return [_xor(b, key_bytes).decode('utf-8') if b is not None else None for b in encrypted]
+
+def encrypt_rows(rows: List[Dict], fields: Iterable[str]) -> List[Dict]:
+    """Encrypt the given columns of dictionary rows (e.g. before executemany), in place"""
+    for field in fields:
+        for row, value in zip(rows, encrypt_many([row.get(field) for row in rows])):
+            row[field] = value
+    return rows
+
+def decrypt_rows(rows: List[Dict], fields: Iterable[str]) -> List[Dict]:
+    """Decrypt the given columns of a whole result set (cursor(dictionary=True).fetchall()), in place"""
+    for field in fields:
+        for row, value in zip(rows, decrypt_many([row.get(field) for row in rows])):
+            row[field] = value
+    return rows
 
 if __name__ == "__main__":
     secret = "Hello, this is a test message!"
@@ -0,0 +1,163 @@
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional, Tuple
+
+# File layout (all little endian):
+#   header      : magic (8 bytes) | version (u32) | count (u32)
+#   detail_ids  : int64  x count, sorted ascending
+#   offsets     : uint64 x count, start of each document in the text region
+#   lengths     : uint64 x count, byte length of each document
+#   hashes      : 32 bytes x count, raw SHA-256 of the source PDF
+#   texts       : UTF-8 processed text, identical contents stored once
+# Worker processes map the file read-only, so every process shares the same
+# page-cache pages and document bodies never travel over a pipe.
+CORPUS_MAGIC = b"ATSCORP\0"
+CORPUS_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_HASH_SIZE = 32
+
+
+def write_corpus_store(path: str, documents: Iterable[Tuple[int, str, str]]) -> int:
+    """
+    Pack processed CV texts into a corpus store file and publish it atomically.
+    `documents` yields (detail_id, content_hash, processed_text); rows that share
+    a content hash point at a single copy of the text.
+    Returns the number of detail_ids written.
+    """
+    rows = {}
+    texts: Dict[str, str] = {}
+    for detail_id, content_hash, text in documents:
+        rows[int(detail_id)] = content_hash
+        texts.setdefault(content_hash, text)
+
+    encoded = {content_hash: text.encode("utf-8") for content_hash, text in texts.items()}
+    text_offsets = {}
+    position = 0
+    for content_hash, data in encoded.items():
+        text_offsets[content_hash] = position
+        position += len(data)
+
+    detail_ids = sorted(rows)
+    count = len(detail_ids)
+    text_base = _HEADER.size + count * (8 + 8 + 8 + _HASH_SIZE)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".corpus-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, count))
+            f.write(struct.pack(f"<{count}q", *detail_ids))
+            f.write(struct.pack(f"<{count}Q", *(text_base + text_offsets[rows[d]] for d in detail_ids)))
+            f.write(struct.pack(f"<{count}Q", *(len(encoded[rows[d]]) for d in detail_ids)))
+            f.write(b"".join(bytes.fromhex(rows[d]) for d in detail_ids))
+            for data in encoded.values():
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+class CorpusStore:
+    """Read-only, memory-mapped view of a corpus store keyed by detail_id"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count = _HEADER.unpack_from(self._mmap, 0)
+        except (ValueError, struct.error):
+            self._file.close()
+            raise ValueError(f"{path} is not a corpus store")
+        if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+            self._mmap.close()
+            self._file.close()
+            raise ValueError(f"{path} is not a version {CORPUS_VERSION} corpus store")
+
+        self._count = count
+        view = memoryview(self._mmap)
+        position = _HEADER.size
+        # Typed views straight over the mapping, no copy
+        self._detail_ids = view[position:position + 8 * count].cast("q")
+        position += 8 * count
+        self._offsets = view[position:position + 8 * count].cast("Q")
+        position += 8 * count
+        self._lengths = view[position:position + 8 * count].cast("Q")
+        position += 8 * count
+        self._hashes = view[position:position + _HASH_SIZE * count]
+        self._view = view
+
+    def _index(self, detail_id: int) -> Optional[int]:
+        i = bisect_left(self._detail_ids, detail_id)
+        if i < self._count and self._detail_ids[i] == detail_id:
+            return i
+        return None
+
+    def __contains__(self, detail_id) -> bool:
+        return isinstance(detail_id, int) and self._index(detail_id) is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def detail_ids(self):
+        return self._detail_ids.tolist()
+
+    def content_hash(self, detail_id: int) -> Optional[str]:
+        i = self._index(detail_id)
+        if i is None:
+            return None
+        return self._hashes[i * _HASH_SIZE:(i + 1) * _HASH_SIZE].hex()
+
+    def get_bytes(self, detail_id: int) -> Optional[memoryview]:
+        """Zero-copy view of a document's UTF-8 bytes"""
+        i = self._index(detail_id)
+        if i is None:
+            return None
+        start = self._offsets[i]
+        return self._view[start:start + self._lengths[i]]
+
+    def get_text(self, detail_id: int) -> Optional[str]:
+        data = self.get_bytes(detail_id)
+        if data is None:
+            return None
+        try:
+            return str(data, "utf-8")
+        finally:
+            data.release()
+
+    def close(self):
+        if self._mmap is None:
+            return
+        for view in (self._detail_ids, self._offsets, self._lengths, self._hashes, self._view):
+            view.release()
+        self._mmap.close()
+        self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_corpus_store(path: str) -> Optional[CorpusStore]:
+    """Open a corpus store, returning None if it is missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return CorpusStore(path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring corpus store {path}: {e}")
+        return None
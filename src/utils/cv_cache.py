@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from utils.index_snapshot import SnapshotWriter, open_snapshot
+from utils.pdf_processor import PDFProcessor
+
+HASH_CHUNK_SIZE = 1 << 20
+# Bump when extraction/normalization changes so old snapshots are rebuilt
+SNAPSHOT_SCHEMA = "cv_text_cache/1"
+
+
+class CVTextCache:
+    """
+    Content-addressed cache for extracted CV text.
+
+    Every PDF is identified by the SHA-256 of its bytes, so identical files
+    (the same CV uploaded twice, or several applicant rows pointing at copies
+    of one document) share a single extraction and a single cache entry.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # path -> (mtime_ns, size, content_hash)
+        self._path_hashes: Dict[str, tuple] = {}
+        # content_hash -> {'normal': ..., 'processed': ...}
+        self._texts: Dict[str, Dict[str, str]] = {}
+        # content_hash -> structured summary fields (see FieldExtractor)
+        self._summaries: Dict[str, Dict[str, List[str]]] = {}
+        self._snapshot = None
+        self._dirty = False
+
+    @staticmethod
+    def hash_file(file_path: str) -> Optional[str]:
+        """Return the SHA-256 hex digest of a file, or None if it cannot be read"""
+        try:
+            digest = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except OSError as e:
+            print(f"Error hashing file {file_path}: {e}")
+            return None
+
+    def content_hash(self, file_path: str) -> Optional[str]:
+        """
+        Return the content hash of a file.
+        The hash is memoized per path and only recomputed when mtime/size change.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._path_hashes.get(file_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        file_hash = self.hash_file(file_path)
+        if file_hash:
+            with self._lock:
+                self._path_hashes[file_path] = (stat.st_mtime_ns, stat.st_size, file_hash)
+                self._dirty = True
+        return file_hash
+
+    def get_text(self, file_path: str) -> Dict[str, str]:
+        """Return the dual-format text of a PDF, extracting it once per unique content"""
+        file_hash = self.content_hash(file_path)
+        if not file_hash:
+            return {'normal': '', 'processed': ''}
+
+        text_data = self.get_text_by_hash(file_hash)
+        if text_data is not None:
+            return text_data
+
+        text_data = PDFProcessor.extract_text_dual_format(file_path)
+        with self._lock:
+            # Another thread may have extracted the same content meanwhile
+            text_data = self._texts.setdefault(file_hash, text_data)
+            self._dirty = True
+        return text_data
+
+    def get_text_by_hash(self, file_hash: str) -> Optional[Dict[str, str]]:
+        """Return cached text for a content hash, paging it in from the snapshot if needed"""
+        with self._lock:
+            text_data = self._texts.get(file_hash)
+            if text_data is None and self._snapshot is not None and file_hash in self._snapshot:
+                text_data = {
+                    'normal': self._snapshot.read_text(file_hash, 'normal'),
+                    'processed': self._snapshot.read_text(file_hash, 'processed'),
+                }
+                self._texts[file_hash] = text_data
+            return text_data
+
+    def get_summary(self, file_path: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Return the structured summary (emails, phones, skills, education) of a CV.
+        Summaries are computed once per unique content and kept with the text,
+        so they can be precomputed at ingest/warm-up and served instantly later.
+        """
+        from algorithms.regex_search import FieldExtractor, get_field_extractor
+
+        file_hash = self.content_hash(file_path)
+        if not file_hash:
+            return None
+
+        with self._lock:
+            summary = self._summaries.get(file_hash)
+            if summary is None and self._snapshot is not None and file_hash in self._snapshot:
+                if self._snapshot.meta(file_hash).get('summary_version') == FieldExtractor.VERSION:
+                    summary = json.loads(self._snapshot.read_section(file_hash, 'summary'))
+                    self._summaries[file_hash] = summary
+        if summary is not None:
+            return summary
+
+        text = self.get_text(file_path)['normal']
+        if not text:
+            return None
+        summary = get_field_extractor().extract(text)
+        with self._lock:
+            summary = self._summaries.setdefault(file_hash, summary)
+            self._dirty = True
+        return summary
+
+    def has_summary(self, file_path: str) -> bool:
+        """True if get_summary() can answer without running the extractor (memory or snapshot)"""
+        from algorithms.regex_search import FieldExtractor
+
+        file_hash = self.content_hash(file_path)
+        with self._lock:
+            if file_hash in self._summaries:
+                return True
+            return (self._snapshot is not None and file_hash in self._snapshot
+                    and self._snapshot.meta(file_hash).get('summary_version') == FieldExtractor.VERSION)
+
+    def load_snapshot(self, snapshot_path: str) -> int:
+        """
+        Attach a snapshot written by save_snapshot().
+        Only the manifest is read here: the path -> hash table lets unchanged
+        files skip re-hashing, and texts are paged in from the mmap on first use.
+        Returns the number of documents available in the snapshot.
+        """
+        reader = open_snapshot(snapshot_path, SNAPSHOT_SCHEMA)
+        if reader is None:
+            return 0
+
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.close()
+            self._snapshot = reader
+            for path, (mtime_ns, size, file_hash) in reader.extra.get("paths", {}).items():
+                self._path_hashes.setdefault(path, (mtime_ns, size, file_hash))
+        return len(reader.entries)
+
+    def snapshot_global(self, name: str) -> Optional[bytes]:
+        """A corpus-wide section (e.g. index postings) of the attached snapshot, or None"""
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            return self._snapshot.read_global(name)
+
+    def save_snapshot(self, snapshot_path: str, force: bool = False, indexes: Optional[Dict] = None) -> bool:
+        """
+        Persist every document still referenced by an existing file.
+        `indexes` maps a section name to an index with to_bytes(); they are
+        stored as global sections. Sections not given (or given an empty
+        index) are carried over from the current snapshot unchanged.
+        Does nothing unless something changed since the last load/save.
+        """
+        with self._lock:
+            if not self._dirty and not force:
+                return False
+
+            live_paths = {
+                path: list(entry) for path, entry in self._path_hashes.items()
+                if os.path.exists(path)
+            }
+            live_hashes = {entry[2] for entry in live_paths.values()}
+
+            from algorithms.regex_search import FieldExtractor
+
+            writer = SnapshotWriter(snapshot_path, SNAPSHOT_SCHEMA)
+            try:
+                for file_hash in live_hashes:
+                    text_data = self._texts.get(file_hash)
+                    if text_data is not None:
+                        sections = {
+                            'normal': text_data['normal'],
+                            'processed': text_data['processed'],
+                        }
+                    elif self._snapshot is not None and file_hash in self._snapshot:
+                        sections = {
+                            'normal': self._snapshot.read_section(file_hash, 'normal'),
+                            'processed': self._snapshot.read_section(file_hash, 'processed'),
+                        }
+                    else:
+                        continue
+
+                    meta = {}
+                    summary = self._summaries.get(file_hash)
+                    if summary is not None:
+                        sections['summary'] = json.dumps(summary)
+                        meta['summary_version'] = FieldExtractor.VERSION
+                    elif (self._snapshot is not None and file_hash in self._snapshot
+                          and self._snapshot.meta(file_hash).get('summary_version') == FieldExtractor.VERSION):
+                        sections['summary'] = self._snapshot.read_section(file_hash, 'summary')
+                        meta['summary_version'] = FieldExtractor.VERSION
+                    writer.add_entry(file_hash, sections, meta)
+
+                fresh = {name: index for name, index in (indexes or {}).items() if len(index)}
+                for name, index in fresh.items():
+                    writer.add_global(name, index.to_bytes())
+                if self._snapshot is not None:
+                    for name in self._snapshot.globals:
+                        if name not in fresh:
+                            writer.add_global(name, self._snapshot.read_global(name))
+
+                # The old mapping must be released before the file is replaced
+                if self._snapshot is not None:
+                    self._snapshot.close()
+                    self._snapshot = None
+                writer.commit(extra={"paths": live_paths})
+            except OSError as e:
+                writer.abort()
+                print(f"Error saving snapshot {snapshot_path}: {e}")
+                return False
+
+            self._dirty = False
+
+        self.load_snapshot(snapshot_path)
+        return True
+
+    def group_by_content(self, cv_sources: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Group CV sources by content hash.
+        Sources whose file is missing or unreadable are skipped.
+        """
+        groups: Dict[str, List[Dict]] = {}
+        for cv_source in cv_sources:
+            cv_path = cv_source.get("cv_path")
+            if not cv_path or not os.path.exists(cv_path):
+                continue
+            file_hash = self.content_hash(cv_path)
+            if file_hash:
+                groups.setdefault(file_hash, []).append(cv_source)
+        return groups
+
+    def __len__(self):
+        with self._lock:
+            if self._snapshot is None:
+                return len(self._texts)
+            return len(self._texts.keys() | self._snapshot.keys())
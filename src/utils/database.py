@@ -0,0 +1,113 @@
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from utils.startup import timed_import
+
+load_dotenv()
+
+CV_CATALOG_SELECT = """
+    SELECT
+        ap.applicant_id,
+        ap.first_name,
+        ap.last_name,
+        ap.date_of_birth,
+        ap.address,
+        ap.phone_number,
+        ad.detail_id,
+        ad.application_role,
+        ad.cv_path
+    FROM ApplicantProfile ap
+    JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
+"""
+CV_CATALOG_ORDER = "ORDER BY ad.detail_id DESC"
+
+def open_db_connection():
+    """Membuka koneksi MySQL berdasarkan konfigurasi .env"""
+    mysql_connector = timed_import("mysql.connector")
+    return mysql_connector.connect(
+        host=os.getenv("DB_HOST"),
+        port=int(os.getenv("DB_PORT")),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=os.getenv("DB_NAME"),
+    )
+
+def subtract_years(day: date, years: int) -> date:
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:  # 29 Februari pada tahun bukan kabisat
+        return day.replace(year=day.year - years, day=28)
+
+def catalog_filter_clauses(filters: Dict, today: Optional[date] = None) -> Tuple[List[str], List]:
+    """
+    Kondisi WHERE untuk filter pencarian: role (sama persis), min_age/max_age
+    (tahun) dan uploaded_from/uploaded_to (tanggal, inklusif).
+    Setiap kondisi membandingkan kolom ber-index apa adanya dengan konstanta
+    (umur diubah menjadi batas tanggal lahir), sehingga MySQL bisa memakai
+    range scan pada index sekunder, bukan menghitung umur per baris.
+    """
+    today = today or date.today()
+    clauses, params = [], []
+    if filters.get("role"):
+        clauses.append("ad.application_role = %s")
+        params.append(filters["role"])
+    if filters.get("min_age") is not None:
+        clauses.append("ap.date_of_birth <= %s")
+        params.append(subtract_years(today, filters["min_age"]))
+    if filters.get("max_age") is not None:
+        clauses.append("ap.date_of_birth > %s")
+        params.append(subtract_years(today, filters["max_age"] + 1))
+    if filters.get("uploaded_from") is not None:
+        clauses.append("ad.upload_date >= %s")
+        params.append(filters["uploaded_from"])
+    if filters.get("uploaded_to") is not None:
+        clauses.append("ad.upload_date < %s")
+        params.append(filters["uploaded_to"] + timedelta(days=1))
+    return clauses, params
+
+def query_cv_catalog(connection, detail_id_range: Optional[Tuple[int, int]] = None,
+                     filters: Optional[Dict] = None) -> List[Dict]:
+    """
+    Mengambil katalog CV (ApplicantProfile JOIN ApplicationDetail).
+    detail_id_range (awal, akhir, inklusif) membatasi ke satu shard,
+    filters (lihat catalog_filter_clauses) ke kandidat yang relevan.
+    """
+    clauses, params = catalog_filter_clauses(filters) if filters else ([], [])
+    if detail_id_range is not None:
+        clauses.append("ad.detail_id BETWEEN %s AND %s")
+        params.extend(detail_id_range)
+    query = CV_CATALOG_SELECT
+    if clauses:
+        query += "    WHERE " + "\n      AND ".join(clauses) + "\n"
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(query + CV_CATALOG_ORDER, tuple(params))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+def cv_source_from_row(cv_data: Dict) -> Optional[Dict]:
+    """Baris katalog -> sumber CV untuk pencarian, atau None jika file CV tidak ada"""
+    cv_path = cv_data.get("cv_path")
+    if not cv_path or not os.path.exists(cv_path):
+        return None
+    filename = os.path.basename(cv_path)
+    applicant_data = {
+        "applicant_id": cv_data["applicant_id"],
+        "detail_id": cv_data["detail_id"],
+        "first_name": cv_data["first_name"] or filename.replace(".pdf", ""),
+        "last_name": cv_data["last_name"] or "",
+        "date_of_birth": cv_data["date_of_birth"].strftime("%Y-%m-%d") if cv_data["date_of_birth"] else "N/A",
+        "address": cv_data["address"] or "Database Entry",
+        "phone_number": cv_data["phone_number"] or "N/A",
+        "application_role": cv_data["application_role"] or "CV dari Database",
+        "cv_path": cv_path
+    }
+    return {
+        "source": "database",
+        "applicant": applicant_data,
+        "cv_path": cv_path
+    }
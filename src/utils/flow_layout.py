@@ -2,12 +2,22 @@ from PyQt6.QtWidgets import QLayout, QStyle, QSizePolicy
 from PyQt6.QtCore import QPoint, QRect, QSize, Qt
 
 class FlowLayout(QLayout):
+    """
+    Wraps items left to right like text.
+    Item size hints, the style spacing and the height for each width are cached
+    until Qt invalidates the layout, so the repeated heightForWidth/setGeometry
+    passes of one layout activation cost a single sizeHint call per item.
+    """
+
     def __init__(self, parent=None, margin=0, spacing=-1):
         super().__init__(parent)
+        self.itemList = []
+        self._sizeCache = []       # sizeHint per item, parallel to itemList (None = not computed)
+        self._spacingCache = None  # (spaceX, spaceY)
+        self._heightCache = {}     # width -> height
         if parent is not None:
             self.setContentsMargins(margin, margin, margin, margin)
         self.setSpacing(spacing)
-        self.itemList = []
 
     def __del__(self):
         item = self.takeAt(0)
@@ -16,6 +26,8 @@ class FlowLayout(QLayout):
 
     def addItem(self, item):
         self.itemList.append(item)
+        self._sizeCache.append(None)
+        self._heightCache.clear()
 
     def count(self):
         return len(self.itemList)
@@ -27,9 +39,33 @@ class FlowLayout(QLayout):
 
     def takeAt(self, index):
         if 0 <= index < len(self.itemList):
+            self._sizeCache.pop(index)
+            self._heightCache.clear()
             return self.itemList.pop(index)
         return None
 
+    def indexOf(self, widget):
+        for index, item in enumerate(self.itemList):
+            if item.widget() is widget:
+                return index
+        return -1
+
+    def takeWidget(self, widget):
+        """Remove the item holding widget (the widget itself is left alone); returns True if found"""
+        index = self.indexOf(widget)
+        if index < 0:
+            return False
+        self.takeAt(index)
+        self.invalidate()
+        return True
+
+    def invalidate(self):
+        # Called by Qt whenever a child's size hint or the style may have changed
+        self._sizeCache = [None] * len(self.itemList)
+        self._spacingCache = None
+        self._heightCache.clear()
+        super().invalidate()
+
     def expandingDirections(self):
         return Qt.Orientation(0)
 
@@ -37,7 +73,10 @@ class FlowLayout(QLayout):
         return True
 
     def heightForWidth(self, width):
-        height = self._doLayout(QRect(0, 0, width, 0), True)
+        height = self._heightCache.get(width)
+        if height is None:
+            height = self._doLayout(QRect(0, 0, width, 0), True)
+            self._heightCache[width] = height
         return height
 
     def setGeometry(self, rect):
@@ -55,34 +94,53 @@ class FlowLayout(QLayout):
         size += QSize(2 * margin, 2 * margin)
         return size
 
-    def _doLayout(self, rect, testOnly):
-        x = rect.x()
-        y = rect.y()
-        lineHeight = 0
-        spacing = self.spacing()
+    def _itemSize(self, index):
+        size = self._sizeCache[index]
+        if size is None:
+            size = self.itemList[index].sizeHint()
+            self._sizeCache[index] = size
+        return size
 
-        for item in self.itemList:
-            wid = item.widget()
-            spaceX = spacing + wid.style().layoutSpacing(
+    def _spacing(self):
+        if self._spacingCache is None:
+            spacing = self.spacing()
+            widget = self.itemList[0].widget() if self.itemList else None
+            if widget is None:
+                widget = self.parentWidget()
+            if widget is None:
+                return spacing, spacing
+            style = widget.style()
+            spaceX = spacing + style.layoutSpacing(
                 QSizePolicy.ControlType.PushButton,
                 QSizePolicy.ControlType.PushButton,
                 Qt.Orientation.Horizontal)
-            spaceY = spacing + wid.style().layoutSpacing(
+            spaceY = spacing + style.layoutSpacing(
                 QSizePolicy.ControlType.PushButton,
                 QSizePolicy.ControlType.PushButton,
                 Qt.Orientation.Vertical)
-            
-            nextX = x + item.sizeHint().width() + spaceX
+            self._spacingCache = (spaceX, spaceY)
+        return self._spacingCache
+
+    def _doLayout(self, rect, testOnly):
+        x = rect.x()
+        y = rect.y()
+        lineHeight = 0
+        spaceX, spaceY = self._spacing()
+
+        for index, item in enumerate(self.itemList):
+            size = self._itemSize(index)
+
+            nextX = x + size.width() + spaceX
             if nextX - spaceX > rect.right() and lineHeight > 0:
                 x = rect.x()
                 y = y + lineHeight + spaceY
-                nextX = x + item.sizeHint().width() + spaceX
+                nextX = x + size.width() + spaceX
                 lineHeight = 0
 
             if not testOnly:
-                item.setGeometry(QRect(QPoint(x, y), item.sizeHint()))
+                item.setGeometry(QRect(QPoint(x, y), size))
 
             x = nextX
-            lineHeight = max(lineHeight, item.sizeHint().height())
+            lineHeight = max(lineHeight, size.height())
 
-        return y + lineHeight - rect.y()
\ No newline at end of file
+        return y + lineHeight - rect.y()
@@ -0,0 +1,248 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# File layout:
+#   header   : magic (8 bytes) | version (u32) | reserved (u32) | manifest offset (u64) | manifest length (u64)
+#   blobs    : raw section bytes, back to back
+#   manifest : UTF-8 JSON describing where every section lives
+# The manifest is written last so sections can be streamed to disk, and it is
+# the only part parsed on open; section bytes are sliced from the mmap on demand.
+SNAPSHOT_MAGIC = b"ATSSNAP\0"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+# Packed tables (see pack_table) store their values as native uint32: snapshots are a local cache
+_UINT32 = "I" if array("I").itemsize == 4 else "L"
+_TABLE_HEADER = struct.Struct("<Q")
+
+
+class SnapshotWriter:
+    """
+    Build a snapshot file and publish it atomically.
+    Data is written to a temporary file in the target directory and moved
+    over the target with os.replace() only after it has been fsync'ed, so a
+    crash never leaves a half-written snapshot behind.
+    """
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.schema = schema
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(b"\0" * _HEADER.size)
+        self._offset = _HEADER.size
+        self._entries: Dict[str, Dict] = {}
+        self._globals: Dict[str, list] = {}
+
+    def _write_blob(self, data: Union[bytes, str]) -> list:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._file.write(data)
+        location = [self._offset, len(data)]
+        self._offset += len(data)
+        return location
+
+    def add_entry(self, key: str, sections: Dict[str, Union[bytes, str]], meta: Optional[Dict] = None):
+        """Add an entry (e.g. one CV keyed by content hash) with named sections"""
+        self._entries[key] = {
+            "sections": {name: self._write_blob(data) for name, data in sections.items()},
+            "meta": meta or {},
+        }
+
+    def add_global(self, name: str, data: Union[bytes, str]):
+        """Add a corpus-wide section such as a vocabulary or postings table"""
+        self._globals[name] = self._write_blob(data)
+
+    def commit(self, extra: Optional[Dict] = None):
+        manifest = {
+            "schema": self.schema,
+            "created": time.time(),
+            "entries": self._entries,
+            "globals": self._globals,
+            "extra": extra or {},
+        }
+        manifest_bytes = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+        self._file.write(manifest_bytes)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, self._offset, len(manifest_bytes)))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+
+class SnapshotReader:
+    """
+    Read-only view of a snapshot file through mmap.
+    Only the manifest is decoded on open; section bytes are copied out of the
+    mapping when a caller asks for them.
+    """
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Snapshot {path} is empty")
+
+        try:
+            magic, version, _, manifest_offset, manifest_length = _HEADER.unpack_from(self._mmap, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a snapshot file")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})")
+            manifest = json.loads(self._mmap[manifest_offset:manifest_offset + manifest_length])
+            if manifest.get("schema") != schema:
+                raise ValueError(f"Snapshot schema {manifest.get('schema')!r} does not match {schema!r}")
+        except (struct.error, json.JSONDecodeError) as e:
+            self.close()
+            raise ValueError(f"Corrupt snapshot {path}: {e}")
+        except ValueError:
+            self.close()
+            raise
+
+        self.entries: Dict[str, Dict] = manifest["entries"]
+        self.globals: Dict[str, list] = manifest.get("globals", {})
+        self.extra: Dict = manifest["extra"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def keys(self) -> Iterable[str]:
+        return self.entries.keys()
+
+    def meta(self, key: str) -> Dict:
+        return self.entries[key]["meta"]
+
+    def read_section(self, key: str, name: str) -> bytes:
+        offset, length = self.entries[key]["sections"][name]
+        return self._mmap[offset:offset + length]
+
+    def read_text(self, key: str, name: str) -> str:
+        return self.read_section(key, name).decode("utf-8")
+
+    def read_global(self, name: str) -> Optional[bytes]:
+        location = self.globals.get(name)
+        if location is None:
+            return None
+        offset, length = location
+        return self._mmap[offset:offset + length]
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_snapshot(path: str, schema: str) -> Optional[SnapshotReader]:
+    """Open a snapshot, returning None if it is missing, corrupt or from another version"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return SnapshotReader(path, schema)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring snapshot {path}: {e}")
+        return None
+
+
+# ---- Packed tables for global sections ----
+
+def pack_table(header: Dict, rows: Iterable[Tuple[str, Sequence[int]]]) -> bytes:
+    """
+    Serialize named rows of unsigned 32-bit ints plus a JSON header:
+    header length (u64) | JSON header with the row directory | values.
+    The directory maps each row name to [offset, length] in the values.
+    """
+    values = array(_UINT32)
+    directory = {}
+    for name, row in rows:
+        directory[name] = [len(values), len(row)]
+        values.extend(row)
+    header_bytes = json.dumps({**header, "rows": directory}, separators=(",", ":")).encode("utf-8")
+    return _TABLE_HEADER.pack(len(header_bytes)) + header_bytes + values.tobytes()
+
+
+def unpack_table(data: bytes) -> Tuple[Dict, Dict[str, list], memoryview]:
+    """(header, row directory, values) of a pack_table() blob; values are not copied"""
+    try:
+        (header_length,) = _TABLE_HEADER.unpack_from(data, 0)
+        start = _TABLE_HEADER.size + header_length
+        header = json.loads(data[_TABLE_HEADER.size:start])
+        return header, header.pop("rows"), memoryview(data)[start:].cast(_UINT32)
+    except (struct.error, UnicodeDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Corrupt packed table: {e}") from None
+
+
+class LazyTable(dict):
+    """
+    Dict over the rows of a packed table: a row is decoded by `decode` the
+    first time it is looked up, so loading a table costs only its directory.
+    Iteration and membership cover decoded and still-packed rows alike.
+    """
+
+    def __init__(self, directory: Dict[str, list], values: memoryview, decode: Callable[[memoryview], object]):
+        super().__init__()
+        self._directory = directory
+        self._values = values
+        self._decode = decode
+
+    def __missing__(self, name: str):
+        location = self._directory.pop(name, None)
+        if location is None:
+            raise KeyError(name)
+        offset, length = location
+        row = self[name] = self._decode(self._values[offset:offset + length])
+        return row
+
+    def get(self, name: str, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def setdefault(self, name: str, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            self[name] = default
+            return default
+
+    def __contains__(self, name) -> bool:
+        return dict.__contains__(self, name) or name in self._directory
+
+    def __iter__(self) -> Iterator[str]:
+        # Copies: decoding a row while iterating adds it to the dict
+        yield from list(dict.__iter__(self))
+        yield from list(self._directory)
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self._directory)
+
+    def materialize(self) -> List[str]:
+        """Decode every remaining row; returns all row names"""
+        for name in list(self._directory):
+            self[name]
+        return list(dict.__iter__(self))
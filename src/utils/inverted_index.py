@@ -0,0 +1,432 @@
+import math
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.index_snapshot import LazyTable, pack_table, unpack_table
+from utils.streaming import TopN
+
+TOKEN_PATTERN = re.compile(r"\w[\w+#]*")
+# "a NEAR/k b": b within k words of a, either side; "a ONEAR/k b": b after a, at most k words in between
+PROXIMITY_PATTERN = re.compile(r"\s+(o?near)/(\d+)\s+", re.IGNORECASE)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; '+' and '#' stay attached so c++ and c# survive"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def is_proximity_query(keyword: str) -> bool:
+    return PROXIMITY_PATTERN.search(keyword) is not None
+
+
+def parse_query(keyword: str) -> tuple:
+    """
+    Parse a keyword into ('phrase', tokens) or
+    ('near', left_tokens, right_tokens, max_gap, ordered).
+    A single-word keyword is a one-token phrase. Each side of NEAR/ONEAR may
+    itself be a phrase; only one operator per keyword is supported.
+    """
+    parts = PROXIMITY_PATTERN.split(keyword)
+    if len(parts) == 1:
+        return ('phrase', tuple(tokenize(keyword)))
+    if len(parts) != 4:
+        raise ValueError(f"Keyword '{keyword}' hanya boleh berisi satu operator NEAR/k atau ONEAR/k")
+    left, operator, max_gap, right = parts
+    left_tokens, right_tokens = tuple(tokenize(left)), tuple(tokenize(right))
+    if not left_tokens or not right_tokens:
+        raise ValueError(f"Operand {operator.upper()} pada keyword '{keyword}' kosong")
+    return ('near', left_tokens, right_tokens, int(max_gap), operator.lower() == 'onear')
+
+
+def query_key(parsed: tuple) -> str:
+    """Canonical text of a parsed query, used as its term name"""
+    if parsed[0] == 'phrase':
+        return " ".join(parsed[1])
+    _, left, right, max_gap, ordered = parsed
+    return f"{' '.join(left)} {'ONEAR' if ordered else 'NEAR'}/{max_gap} {' '.join(right)}"
+
+
+class _QueryTerm:
+    """
+    One query term during a top-k evaluation: a sorted list of document
+    numbers, the BM25 contribution at each position and the largest such
+    contribution (the MaxScore upper bound).
+    """
+
+    def __init__(self, keyword: str, doc_numbers: List[int], scores: List[float]):
+        self.keyword = keyword
+        self.doc_numbers = doc_numbers
+        self.scores = scores
+        self.upper_bound = max(scores, default=0.0)
+        self.position = 0
+
+
+class InvertedIndex:
+    """
+    Positional word-level inverted index with the corpus statistics BM25
+    needs: token positions per document (whose count is the term frequency),
+    document frequency and document length. Keyed by content hash and
+    thread-safe like TrigramIndex, so warm-up can add documents while a search
+    is running.
+
+    Postings are appended in document-number order, which keeps every list
+    sorted for document-at-a-time evaluation with MaxScore pruning and for
+    intersecting postings. Phrase and NEAR/ONEAR queries are answered from
+    the positions alone and then behave like any other term.
+    to_bytes()/load_bytes() persist the index like TrigramIndex does.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._doc_numbers: Dict[str, int] = {}
+        self._doc_keys: List[str] = []
+        self._doc_lengths: List[int] = []
+        self._total_length = 0
+        self._postings: Dict[str, Tuple[List[int], List[List[int]]]] = {}  # term -> (doc numbers, positions per doc)
+        # Postings of phrase/proximity queries, BM25 contribution per posting and
+        # its maximum: computed on first use and valid until a document is added
+        self._derived_postings: Dict[str, Tuple[List[int], List[List[int]]]] = {}
+        self._impacts: Dict[str, List[float]] = {}
+        self._upper_bounds: Dict[str, float] = {}
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._doc_numbers
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._doc_numbers)
+
+    def add_document(self, key: str, text: str):
+        token_positions: Dict[str, List[int]] = {}
+        tokens = tokenize(text)
+        for position, token in enumerate(tokens):
+            token_positions.setdefault(token, []).append(position)
+        with self._lock:
+            if key in self._doc_numbers:
+                return
+            doc_number = len(self._doc_keys)
+            self._doc_numbers[key] = doc_number
+            self._doc_keys.append(key)
+            self._doc_lengths.append(len(tokens))
+            self._total_length += len(tokens)
+            for term, positions in token_positions.items():
+                doc_numbers, doc_positions = self._postings.setdefault(term, ([], []))
+                doc_numbers.append(doc_number)
+                doc_positions.append(positions)
+            # N and the average length changed, so every cached contribution is stale
+            self._derived_postings.clear()
+            self._impacts.clear()
+            self._upper_bounds.clear()
+
+    def to_bytes(self) -> bytes:
+        """
+        Postings, document keys and lengths as a packed table; each term row
+        is [document count, doc numbers..., position counts..., positions...]
+        """
+        def rows():
+            for term in self._postings:
+                doc_numbers, doc_positions = self._postings[term]
+                row = [len(doc_numbers), *doc_numbers, *(len(positions) for positions in doc_positions)]
+                for positions in doc_positions:
+                    row.extend(positions)
+                yield term, row
+
+        with self._lock:
+            live = set(self._doc_numbers.values())
+            keys = [key if doc_number in live else None for doc_number, key in enumerate(self._doc_keys)]
+            return pack_table({"keys": keys, "lengths": self._doc_lengths}, rows())
+
+    def load_bytes(self, data: bytes, live_keys: Iterable[str]) -> bool:
+        """
+        Load an index written by to_bytes() into an empty index. Documents
+        outside `live_keys` are dropped from the corpus statistics and from
+        the postings as they are decoded. Returns False if the index is not empty.
+        """
+        live_keys = set(live_keys)
+        header, directory, values = unpack_table(data)
+        with self._lock:
+            if self._doc_keys:
+                return False
+            self._doc_keys = header["keys"]
+            self._doc_lengths = header["lengths"]
+            self._doc_numbers = {key: doc_number for doc_number, key in enumerate(self._doc_keys)
+                                 if key is not None and key in live_keys}
+            self._total_length = sum(self._doc_lengths[doc_number] for doc_number in self._doc_numbers.values())
+            live_numbers = set(self._doc_numbers.values())
+
+            def decode(row):
+                count = row[0]
+                doc_numbers = []
+                doc_positions = []
+                start = 1 + 2 * count
+                for doc_number, length in zip(row[1:1 + count], row[1 + count:start]):
+                    if doc_number in live_numbers:
+                        doc_numbers.append(doc_number)
+                        doc_positions.append(row[start:start + length].tolist())
+                    start += length
+                return doc_numbers, doc_positions
+
+            self._postings = LazyTable(directory, values, decode)
+            self._derived_postings.clear()
+            self._impacts.clear()
+            self._upper_bounds.clear()
+        return True
+
+    # ---- Phrase and proximity queries ----
+
+    def _positions_in(self, term: str, doc_number: int) -> List[int]:
+        doc_numbers, doc_positions = self._postings.get(term, ([], []))
+        index = bisect_left(doc_numbers, doc_number)
+        if index < len(doc_numbers) and doc_numbers[index] == doc_number:
+            return doc_positions[index]
+        return []
+
+    def _phrase_postings(self, tokens: Tuple[str, ...]) -> Tuple[List[int], List[List[int]]]:
+        """Documents containing the tokens consecutively, with the phrase start positions"""
+        if len(tokens) == 1:
+            return self._postings.get(tokens[0], ([], []))
+        if any(token not in self._postings for token in tokens):
+            return [], []
+        # Intersect the document lists, rarest token first
+        by_rarity = sorted(set(tokens), key=lambda token: len(self._postings[token][0]))
+        documents = set(self._postings[by_rarity[0]][0])
+        for token in by_rarity[1:]:
+            documents.intersection_update(self._postings[token][0])
+            if not documents:
+                return [], []
+
+        doc_numbers, doc_positions = [], []
+        for doc in sorted(documents):
+            following = [(offset, set(self._positions_in(token, doc))) for offset, token in enumerate(tokens) if offset]
+            starts = [start for start in self._positions_in(tokens[0], doc)
+                      if all(start + offset in positions for offset, positions in following)]
+            if starts:
+                doc_numbers.append(doc)
+                doc_positions.append(starts)
+        return doc_numbers, doc_positions
+
+    def _near_postings(self, left: Tuple[str, ...], right: Tuple[str, ...], max_gap: int,
+                       ordered: bool) -> Tuple[List[int], List[List[int]]]:
+        """
+        Documents where an occurrence of `right` lies within max_gap words of an
+        occurrence of `left` (after it when ordered), with the matching positions
+        of `left`
+        """
+        left_docs, left_positions = self._phrase_postings(left)
+        right_docs, right_positions = self._phrase_postings(right)
+        right_by_doc = dict(zip(right_docs, right_positions))
+
+        doc_numbers, doc_positions = [], []
+        for doc, starts in zip(left_docs, left_positions):
+            right_starts = right_by_doc.get(doc)
+            if not right_starts:
+                continue
+            matched = []
+            for start in starts:
+                end = start + len(left)
+                after = bisect_left(right_starts, end)
+                found = after < len(right_starts) and right_starts[after] - end <= max_gap
+                if not found and not ordered:
+                    before = bisect_right(right_starts, start - len(right)) - 1
+                    found = before >= 0 and start - (right_starts[before] + len(right)) <= max_gap
+                if found:
+                    matched.append(start)
+            if matched:
+                doc_numbers.append(doc)
+                doc_positions.append(matched)
+        return doc_numbers, doc_positions
+
+    def _query_postings(self, parsed: tuple) -> Tuple[str, List[int], List[List[int]]]:
+        """(term name, doc numbers, positions) of a parsed query"""
+        key = query_key(parsed)
+        if parsed[0] == 'phrase' and len(parsed[1]) == 1:
+            return (key, *self._postings.get(key, ([], [])))
+        postings = self._derived_postings.get(key)
+        if postings is None:
+            if parsed[0] == 'phrase':
+                postings = self._phrase_postings(parsed[1])
+            else:
+                postings = self._near_postings(*parsed[1:])
+            self._derived_postings[key] = postings
+        return (key, *postings)
+
+    def match_counts(self, keyword: str, keys: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Occurrences of a word, phrase or NEAR/ONEAR query per document
+        (content hash -> count), for documents with at least one occurrence.
+        Only documents in `keys` are reported when given.
+        """
+        parsed = parse_query(keyword)
+        with self._lock:
+            _, doc_numbers, doc_positions = self._query_postings(parsed)
+            counts = {self._doc_keys[doc]: len(positions) for doc, positions in zip(doc_numbers, doc_positions)}
+        if keys is not None:
+            counts = {key: counts[key] for key in keys if key in counts}
+        return counts
+
+    # ---- BM25 ----
+
+    def _idf(self, document_frequency: int) -> float:
+        n_docs = len(self._doc_numbers)
+        return math.log(1 + (n_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _term_scores(self, parsed: tuple) -> Tuple[str, List[int], List[float]]:
+        key, doc_numbers, doc_positions = self._query_postings(parsed)
+        if not doc_numbers:
+            return key, [], []
+        scores = self._impacts.get(key)
+        if scores is not None:
+            return key, doc_numbers, scores
+        idf = self._idf(len(doc_numbers))
+        k1, b = self.k1, self.b
+        average_length = self._total_length / len(self._doc_numbers) or 1.0
+        lengths = self._doc_lengths
+        scores = []
+        for doc, positions in zip(doc_numbers, doc_positions):
+            tf = len(positions)
+            scores.append(idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[doc] / average_length)))
+        self._impacts[key] = scores
+        self._upper_bounds[key] = max(scores)
+        return key, doc_numbers, scores
+
+    def upper_bound(self, keyword: str) -> float:
+        """Highest BM25 contribution a word, phrase or proximity query can make to any document"""
+        parsed = parse_query(keyword)
+        with self._lock:
+            key = query_key(parsed)
+            if key not in self._upper_bounds:
+                self._term_scores(parsed)
+            return self._upper_bounds.get(key, 0.0)
+
+    def _fuzzy_variants(self, term: str) -> List[str]:
+        from algorithms.levenshtein import levenshtein_batch, calculate_dynamic_threshold
+
+        threshold = calculate_dynamic_threshold(term)
+        if threshold == 0:
+            return []
+        # Words whose length differs by more than the threshold cannot be within it
+        vocabulary = [word for word in self._postings if word != term and abs(len(word) - len(term)) <= threshold]
+        distances = levenshtein_batch(term, vocabulary)
+        return [word for word, distance in zip(vocabulary, distances) if distance <= threshold]
+
+    def _query_terms(self, keywords: Iterable[str], fuzzy_penalty: float) -> Tuple[List[_QueryTerm], Dict]:
+        """
+        One _QueryTerm per distinct keyword: a word, a phrase (multi-word
+        keyword) or a NEAR/ONEAR query. With a fuzzy penalty, vocabulary words
+        within the Levenshtein threshold join a single-word term's posting list
+        and a document scores max(exact contribution, penalty * best variant).
+        """
+        terms = []
+        variants = {}
+        seen = set()
+        for keyword in keywords:
+            parsed = parse_query(keyword)
+            if parsed[0] == 'phrase' and not parsed[1]:
+                continue
+            key, doc_numbers, scores = self._term_scores(parsed)
+            if key in seen:
+                continue
+            seen.add(key)
+            is_word = parsed[0] == 'phrase' and len(parsed[1]) == 1
+            term_variants = self._fuzzy_variants(key) if fuzzy_penalty > 0 and is_word else []
+            if term_variants:
+                merged = dict(zip(doc_numbers, scores))
+                for variant in term_variants:
+                    _, variant_docs, variant_scores = self._term_scores(('phrase', (variant,)))
+                    for doc, score in zip(variant_docs, variant_scores):
+                        merged[doc] = max(merged.get(doc, 0.0), fuzzy_penalty * score)
+                doc_numbers = sorted(merged)
+                scores = [merged[doc] for doc in doc_numbers]
+                variants[key] = term_variants
+            if doc_numbers:
+                terms.append(_QueryTerm(key, doc_numbers, scores))
+        return terms, variants
+
+    def _term_frequency(self, key: str, doc_number: int) -> int:
+        doc_numbers, doc_positions = self._postings.get(key) or self._derived_postings.get(key, ([], []))
+        index = bisect_left(doc_numbers, doc_number)
+        if index < len(doc_numbers) and doc_numbers[index] == doc_number:
+            return len(doc_positions[index])
+        return 0
+
+    def top_k(self, keywords: Iterable[str], k: int, keys: Optional[Iterable[str]] = None,
+              fuzzy_penalty: float = 0.0) -> List[Tuple[str, float, Dict[str, int]]]:
+        """
+        The k documents with the highest BM25 score for the keywords, as
+        (key, score, matches) in descending score order. `matches` maps each
+        matching query term (see query_key) to its frequency in the document,
+        fuzzy hits as "word (fuzzy)". Only documents in `keys` are ranked when
+        given.
+
+        Evaluation is document-at-a-time with MaxScore pruning: query terms are
+        ordered by upper bound, and once the top k is full the terms whose
+        bounds together cannot beat the current k-th score become
+        non-essential. Only documents from the essential terms' postings are
+        visited, and non-essential terms are probed (binary search) only while
+        the document can still enter the top k.
+        """
+        with self._lock:
+            terms, variants = self._query_terms(keywords, fuzzy_penalty)
+            allowed = None
+            if keys is not None:
+                allowed = {self._doc_numbers[key] for key in keys if key in self._doc_numbers}
+
+            terms.sort(key=lambda term: term.upper_bound)
+            prefix_bounds = []  # prefix_bounds[i] = sum of the bounds of terms[0..i]
+            running = 0.0
+            for term in terms:
+                running += term.upper_bound
+                prefix_bounds.append(running)
+
+            top = TopN(k)
+            threshold = 0.0
+            first_essential = 0
+            while first_essential < len(terms):
+                current = [term.doc_numbers[term.position] for term in terms[first_essential:]
+                           if term.position < len(term.doc_numbers)]
+                if not current:
+                    break
+                doc = min(current)
+
+                score = 0.0
+                for term in terms[first_essential:]:
+                    if term.position < len(term.doc_numbers) and term.doc_numbers[term.position] == doc:
+                        score += term.scores[term.position]
+                        term.position += 1
+                if allowed is not None and doc not in allowed:
+                    continue
+
+                for i in range(first_essential - 1, -1, -1):
+                    if score + prefix_bounds[i] <= threshold:
+                        break
+                    term = terms[i]
+                    term.position = bisect_left(term.doc_numbers, doc, term.position)
+                    if term.position < len(term.doc_numbers) and term.doc_numbers[term.position] == doc:
+                        score += term.scores[term.position]
+
+                if top.push(score, doc) and len(top) == k:
+                    threshold = top.min_score()
+                    while first_essential < len(terms) and prefix_bounds[first_essential] <= threshold:
+                        first_essential += 1
+
+            results = []
+            for score, doc in top.ranked_with_scores():
+                matches = {}
+                for term in terms:
+                    frequency = self._term_frequency(term.keyword, doc)
+                    if frequency:
+                        matches[term.keyword] = frequency
+                        continue
+                    fuzzy_frequency = sum(self._term_frequency(variant, doc) for variant in variants.get(term.keyword, ()))
+                    if fuzzy_frequency:
+                        matches[f"{term.keyword} (fuzzy)"] = fuzzy_frequency
+                results.append((self._doc_keys[doc], score, matches))
+            return results
@@ -1,4 +1,3 @@
-import fitz  # PyMuPDF
 import re
 from typing import Optional, Dict
 
@@ -11,6 +10,8 @@ class PDFProcessor:
         Extract text from PDF file
         Returns extracted text or None if extraction fails
         """
+        import fitz  # PyMuPDF, imported on first use to keep startup fast
+
         try:
             doc = fitz.open(pdf_path)
             all_text = ""
@@ -34,6 +35,8 @@ class PDFProcessor:
         1. Normal format with line breaks
         2. Single string format (lowercase, no line breaks)
         """
+        import fitz  # PyMuPDF, imported on first use to keep startup fast
+
         try:
             doc = fitz.open(pdf_path)
             all_text = ""
@@ -0,0 +1,169 @@
+from PyQt6.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QPainter, QPalette
+from PyQt6.QtWidgets import QApplication, QListView, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+RESULT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class ResultsModel(QAbstractListModel):
+    """
+    Ranked search results as a flat list model.
+    Each row is one result dict {'applicant', 'matches', 'score'}; no widgets
+    are created per row, the delegate paints whatever rows are visible.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._results = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._results)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._results):
+            return None
+        result = self._results[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            applicant = result["applicant"]
+            return f"{applicant['first_name']} {applicant['last_name']}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return result["applicant"].get("cv_path")
+        if role == RESULT_ROLE:
+            return result
+        return None
+
+    def set_results(self, results):
+        self.beginResetModel()
+        self._results = list(results)
+        self.endResetModel()
+
+    def results(self):
+        return list(self._results)
+
+
+class ResultCardDelegate(QStyledItemDelegate):
+    """
+    Paints a result row as a card (name, match count, keyword frequencies and
+    Summary / View CV buttons) and turns clicks on the painted buttons into
+    signals carrying the applicant dict.
+    """
+    summary_clicked = pyqtSignal(object)
+    view_clicked = pyqtSignal(object)
+
+    MAX_KEYWORD_LINES = 4
+    MARGIN = 4
+    PADDING = 8
+    BUTTON_WIDTH = 90
+    BUTTON_HEIGHT = 26
+
+    def sizeHint(self, option, index):
+        line_height = option.fontMetrics.height()
+        height = (2 * self.MARGIN + 3 * self.PADDING
+                  + (2 + self.MAX_KEYWORD_LINES) * line_height + self.BUTTON_HEIGHT)
+        # Width follows the viewport; only the height matters to the list
+        return QSize(0, height)
+
+    def _card_rect(self, rect):
+        return rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+    def _button_rects(self, rect):
+        card = self._card_rect(rect)
+        top = card.bottom() - self.PADDING - self.BUTTON_HEIGHT
+        view_rect = QRect(card.right() - self.PADDING - self.BUTTON_WIDTH, top, self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+        summary_rect = view_rect.translated(-(self.BUTTON_WIDTH + self.PADDING), 0)
+        return summary_rect, view_rect
+
+    def paint(self, painter, option, index):
+        result = index.data(RESULT_ROLE)
+        if result is None:
+            return
+        palette = option.palette
+        line_height = option.fontMetrics.height()
+
+        painter.save()
+        card = self._card_rect(option.rect)
+        painter.setPen(palette.color(QPalette.ColorRole.Mid))
+        painter.setBrush(palette.base())
+        painter.drawRoundedRect(card, 4, 4)
+
+        text_rect = card.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        line = QRect(text_rect.left(), text_rect.top(), text_rect.width(), line_height)
+        painter.setPen(palette.color(QPalette.ColorRole.Text))
+
+        bold_font = painter.font()
+        bold_font.setBold(True)
+        painter.setFont(bold_font)
+        painter.drawText(line, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, index.data())
+        painter.setFont(option.font)
+
+        matches = result["matches"]
+        line.translate(0, line_height)
+        match_line = f"{len(matches)} keyword cocok"
+        if isinstance(result["score"], float):
+            match_line += f" · skor {result['score']:.2f}"  # relevance (BM25) scores are floats
+        painter.drawText(line, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, match_line)
+
+        keyword_lines = [f"- {kw}: {freq} kemunculan" for kw, freq in matches.items()]
+        if len(keyword_lines) > self.MAX_KEYWORD_LINES:
+            hidden = len(keyword_lines) - self.MAX_KEYWORD_LINES + 1
+            keyword_lines = keyword_lines[:self.MAX_KEYWORD_LINES - 1] + [f"... dan {hidden} keyword lain"]
+        for keyword_line in keyword_lines:
+            line.translate(0, line_height)
+            elided = option.fontMetrics.elidedText(keyword_line, Qt.TextElideMode.ElideRight, line.width())
+            painter.drawText(line, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, elided)
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        for button_rect, label in zip(self._button_rects(option.rect), ("Summary", "View CV")):
+            button = QStyleOptionButton()
+            button.rect = button_rect
+            button.text = label
+            button.palette = palette
+            button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            result = index.data(RESULT_ROLE)
+            summary_rect, view_rect = self._button_rects(option.rect)
+            position = event.position().toPoint()
+            if result is not None and summary_rect.contains(position):
+                self.summary_clicked.emit(result["applicant"])
+                return True
+            if result is not None and view_rect.contains(position):
+                self.view_clicked.emit(result["applicant"])
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class ResultsView(QListView):
+    """List view of result cards; only the rows in the viewport are ever painted"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results_model = ResultsModel(self)
+        self.delegate = ResultCardDelegate(self)
+        self.setModel(self.results_model)
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.placeholder_text = ""
+
+    def set_results(self, results, placeholder_text=""):
+        self.placeholder_text = placeholder_text
+        self.results_model.set_results(results)
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.results_model.rowCount() == 0 and self.placeholder_text:
+            painter = QPainter(self.viewport())
+            painter.setPen(self.palette().color(QPalette.ColorRole.PlaceholderText))
+            painter.drawText(self.viewport().rect().adjusted(8, 8, -8, -8),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+                             self.placeholder_text)
+            painter.end()
@@ -0,0 +1,245 @@
+import importlib
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.corpus_store import CorpusStore
+
+# Engine single-pattern dengan antarmuka yang sama dengan kmp_search(text, pattern) -> [posisi]
+SINGLE_PATTERN_ENGINES = {
+    "KMP": ("algorithms.kmp", "kmp_search"),
+    "Boyer-Moore": ("algorithms.boyer_moore", "boyer_moore_search"),
+    "Horspool": ("algorithms.horspool", "horspool_search"),
+    "Sunday": ("algorithms.sunday", "sunday_search"),
+    "Two-Way": ("algorithms.two_way", "two_way_search"),
+    "Shift-Or": ("algorithms.shift_or", "shift_or_search"),
+}
+EXACT_ALGORITHMS = ("Aho-Corasick", *SINGLE_PATTERN_ENGINES)
+# Waktu maksimum (detik) untuk semua pattern regex pada satu dokumen
+REGEX_TIME_BUDGET = float(os.getenv("REGEX_TIME_BUDGET_MS", "200")) / 1000
+
+
+def regex_match_counts(cv_text: str, patterns: List[str],
+                       time_budget: float = REGEX_TIME_BUDGET) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Count regex matches of every pattern in one processed CV text.
+    All patterns share one per-document time budget. Patterns flagged by
+    pattern_needs_sandbox() run in a RegexSandbox process that is killed when
+    the budget is spent; the others run in-process, where the budget is
+    checked between matches.
+    Returns ({pattern: frequency} for the patterns found, patterns cut short by the budget).
+    """
+    from algorithms.regex_search import pattern_needs_sandbox, regex_find_spans, regex_sandbox
+
+    deadline = time.perf_counter() + time_budget
+    counts = {}
+    timed_out = []
+    sandboxed = [pattern for pattern in patterns if pattern_needs_sandbox(pattern)]
+    for pattern in patterns:
+        if pattern in sandboxed:
+            continue
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            timed_out.append(pattern)
+            continue
+        spans, truncated = regex_find_spans(cv_text, pattern, time_budget=remaining)
+        counts[pattern] = len(spans)
+        if truncated:
+            timed_out.append(pattern)
+    if sandboxed:
+        with regex_sandbox() as sandbox:
+            sandbox_counts, sandbox_timed_out = sandbox.count_matches(
+                cv_text, sandboxed, max(0.0, deadline - time.perf_counter()))
+        counts.update(sandbox_counts)
+        timed_out.extend(sandbox_timed_out)
+    return {pattern: count for pattern, count in counts.items() if count}, timed_out
+
+
+def get_single_pattern_search(algorithm: str):
+    """Search function of a registered single-pattern engine"""
+    try:
+        module_name, function_name = SINGLE_PATTERN_ENGINES[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown search algorithm: {algorithm}") from None
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def exact_match_counts(cv_text: str, keywords: List[str], algorithm: str, keyword_map: Dict[str, str],
+                       timed_out: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Count exact occurrences of every keyword in one processed CV text
+    (or regex matches when algorithm is "Regex").
+    Returns {original keyword: frequency} for the keywords that were found;
+    regex patterns cut short by the time budget are appended to `timed_out`.
+    """
+    from algorithms.aho_corasick import aho_corasick_search
+
+    if algorithm == "Regex":
+        counts, cut_short = regex_match_counts(cv_text, keywords)
+        if timed_out is not None:
+            timed_out.extend(cut_short)
+        return counts
+
+    matched_kw_freq = {}
+    if algorithm == "Aho-Corasick":
+        for match in aho_corasick_search(cv_text, keywords):
+            original_pattern = keyword_map.get(match['pattern'])
+            if original_pattern:
+                matched_kw_freq[original_pattern] = matched_kw_freq.get(original_pattern, 0) + 1
+    else:
+        search_algo = get_single_pattern_search(algorithm)
+        for kw in keywords:
+            matches = search_algo(cv_text, kw)
+            if matches:
+                matched_kw_freq[kw] = len(matches)
+    return matched_kw_freq
+
+
+def split_keywords(text: str) -> List[str]:
+    """
+    Split pasted text (a keyword list or job description) into keywords on
+    commas, semicolons, tabs and line breaks. List bullets are stripped and
+    case-insensitive duplicates dropped, keeping the first spelling.
+    """
+    keywords = []
+    seen = set()
+    for part in re.split(r"[,;\t\r\n]+", text):
+        keyword = part.strip().lstrip("-•*·").strip()
+        if keyword and keyword.lower() not in seen:
+            seen.add(keyword.lower())
+            keywords.append(keyword)
+    return keywords
+
+
+def parse_batch_queries(text: str) -> Dict[str, List[str]]:
+    """
+    Parse batch screening queries, one job opening per line:
+        Job Name: keyword, keyword, ...
+    Blank lines and lines starting with '#' are ignored; a job listed twice
+    gets the union of its keywords.
+    Raises ValueError on a malformed line.
+    """
+    queries: Dict[str, List[str]] = {}
+    for line_number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, separator, keywords = line.partition(":")
+        name = name.strip()
+        keywords = [kw.strip() for kw in keywords.split(",") if kw.strip()]
+        if not separator or not name or not keywords:
+            raise ValueError(f"Baris {line_number} harus berformat 'Nama Lowongan: keyword1, keyword2'")
+        existing = queries.setdefault(name, [])
+        known = {kw.lower() for kw in existing}
+        for kw in keywords:
+            if kw.lower() not in known:
+                existing.append(kw)
+                known.add(kw.lower())
+    return queries
+
+
+class MultiQueryMatcher:
+    """
+    Match many named keyword sets against a CV in one pass.
+    A single Aho-Corasick automaton is built over the union of all keywords and
+    every pattern remembers which queries own it, so scanning a CV costs the
+    same no matter how many queries share the pass.
+    """
+
+    def __init__(self, queries: Dict[str, List[str]]):
+        from algorithms.aho_corasick import AhoCorasickAutomaton
+
+        self.queries = queries
+        self._owners: Dict[str, List[Tuple[str, str]]] = {}  # pattern -> [(query name, original keyword)]
+        for name, keywords in queries.items():
+            for kw in keywords:
+                owners = self._owners.setdefault(kw.lower(), [])
+                if all(owner != name for owner, _ in owners):
+                    owners.append((name, kw))
+        self._automaton = AhoCorasickAutomaton(self._owners)
+
+    @property
+    def patterns(self) -> List[str]:
+        return list(self._owners)
+
+    def match(self, cv_text: str) -> Dict[str, Dict[str, int]]:
+        """Returns {query name: {original keyword: frequency}} for queries with at least one hit"""
+        pattern_counts: Dict[str, int] = {}
+        for _, pattern in self._automaton.iter_matches(cv_text):
+            pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
+
+        results: Dict[str, Dict[str, int]] = {}
+        for pattern, frequency in pattern_counts.items():
+            for name, kw in self._owners[pattern]:
+                results.setdefault(name, {})[kw] = frequency
+        return results
+
+
+# ---- Process pool over a shared, memory-mapped corpus store ----
+
+_worker_store = None
+
+
+def _init_worker(store_path: str):
+    global _worker_store
+    _worker_store = CorpusStore(store_path)
+
+
+def _search_chunk(detail_ids: List[int], keywords: List[str], algorithm: str,
+                  keyword_map: Dict[str, str]) -> List[Tuple[int, Dict[str, int], List[str]]]:
+    """Runs inside a worker: only detail_ids travel over the pipe, texts come from the mmap"""
+    results = []
+    for detail_id in detail_ids:
+        cv_text = _worker_store.get_text(detail_id)
+        if cv_text:
+            timed_out = []
+            matched_kw_freq = exact_match_counts(cv_text, keywords, algorithm, keyword_map, timed_out)
+            results.append((detail_id, matched_kw_freq, timed_out))
+    return results
+
+
+class ParallelSearcher:
+    """
+    Exact matching spread over worker processes.
+    Every worker maps the same corpus store read-only, so the processed texts
+    are shared through the page cache instead of being pickled per task.
+    """
+
+    def __init__(self, store_path: str, processes: int):
+        self.store_path = store_path
+        self.processes = processes
+        self._executor = None
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            # spawn: forking a process that runs Qt threads is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.store_path,),
+            )
+        return self._executor
+
+    def search(self, detail_ids: List[int], keywords: List[str], algorithm: str,
+               keyword_map: Dict[str, str], chunk_size: int = 32) -> Iterator[Tuple[int, Dict[str, int], List[str]]]:
+        """Yield (detail_id, {keyword: frequency}, regex patterns cut short) as worker chunks complete"""
+        executor = self._ensure_executor()
+        futures = [
+            executor.submit(_search_chunk, detail_ids[i:i + chunk_size], keywords, algorithm, keyword_map)
+            for i in range(0, len(detail_ids), chunk_size)
+        ]
+        try:
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
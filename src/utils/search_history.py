@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from utils.cv_cache import SNAPSHOT_SCHEMA
+from utils.database import open_db_connection
+
+# Riwayat ditulis per batch: flush setiap HISTORY_BATCH_SIZE pencarian atau
+# paling lambat HISTORY_FLUSH_INTERVAL detik setelah pencarian pertama yang tertunda
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "20"))
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "2"))
+# Hasil pencarian terakhir yang disimpan di memori untuk cache tingkat query
+HISTORY_CACHE_SIZE = 64
+# Naikkan setiap kali perubahan engine pencarian (scoring, tokenisasi, fuzzy) atau format
+# baris SearchResult mengubah hasil, agar ranking dari versi lama tidak pernah dipakai lagi
+SEARCH_RESULTS_VERSION = 2
+
+INSERT_SEARCH_LOG = """
+    INSERT INTO SearchLog
+        (search_id, search_query, query_key, corpus_fingerprint, algorithm_used,
+         ranking, top_n, duration_exact, duration_fuzzy, total_scanned, cacheable, searched_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+INSERT_SEARCH_RESULT = """
+    INSERT INTO SearchResult
+        (search_id, result_rank, detail_id, cv_path, score, matches_found, matched_keywords)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+SELECT_CACHED_SEARCH = """
+    SELECT search_id FROM SearchLog
+    WHERE query_key = %s AND corpus_fingerprint = %s AND cacheable = 1
+    ORDER BY searched_at DESC
+    LIMIT 1
+"""
+SELECT_SEARCH_RESULTS = """
+    SELECT detail_id, cv_path, score, matched_keywords FROM SearchResult
+    WHERE search_id = %s
+    ORDER BY result_rank
+"""
+
+_STOP = object()
+
+
+def query_cache_key(keywords: List[str], algorithm: str, use_fuzzy: bool, ranking: str,
+                    fuzzy_penalty: float, top_n: int) -> str:
+    """
+    SHA-256 of every parameter that influences the ranking, plus the engine's
+    SEARCH_RESULTS_VERSION; keyword order does not matter.
+    """
+    params = [SEARCH_RESULTS_VERSION, sorted(set(keywords)), algorithm, bool(use_fuzzy), ranking, round(fuzzy_penalty, 4), top_n]
+    return hashlib.sha256(json.dumps(params).encode("utf-8")).hexdigest()
+
+
+def corpus_fingerprint(cv_sources: List[Dict], text_cache) -> str:
+    """
+    SHA-256 over (detail_id, content hash) of every searchable CV and the
+    extraction schema: it changes whenever a CV is added, removed or edited.
+    """
+    digest = hashlib.sha256(SNAPSHOT_SCHEMA.encode("utf-8"))
+    entries = sorted(f"{cv_source['applicant'].get('detail_id')}\t{text_cache.content_hash(cv_source['cv_path'])}"
+                     for cv_source in cv_sources)
+    for entry in entries:
+        digest.update(entry.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def stored_results(top_results: List[Dict]) -> List[Dict]:
+    """Ranking -> rows that identify each CV by detail_id (database) or cv_path (upload)"""
+    rows = []
+    for result in top_results:
+        applicant = result["applicant"]
+        detail_id = applicant.get("detail_id")
+        rows.append({
+            "detail_id": int(detail_id) if str(detail_id).isdigit() else None,
+            "cv_path": applicant.get("cv_path"),
+            "score": result["score"],
+            "matches": result["matches"],
+        })
+    return rows
+
+
+def restore_results(rows: List[Dict], cv_sources: List[Dict], integer_scores: bool = True) -> Optional[List[Dict]]:
+    """
+    Stored rows -> ranking with the current applicant data, or None if a CV is gone.
+    Scores come back from the DOUBLE column; occurrence counts are turned back into ints.
+    """
+    by_detail_id = {}
+    by_path = {}
+    for cv_source in cv_sources:
+        detail_id = cv_source["applicant"].get("detail_id")
+        if str(detail_id).isdigit():
+            by_detail_id[int(detail_id)] = cv_source
+        else:
+            by_path[cv_source["cv_path"]] = cv_source
+
+    top_results = []
+    for row in rows:
+        if row["detail_id"] is not None:
+            cv_source = by_detail_id.get(row["detail_id"])
+        else:
+            cv_source = by_path.get(row["cv_path"])
+        if cv_source is None:
+            return None
+        score = int(row["score"]) if integer_scores else row["score"]
+        top_results.append({"applicant": cv_source["applicant"], "matches": dict(row["matches"]), "score": score})
+    return top_results
+
+
+class SearchHistory:
+    """
+    Search history in SearchLog/SearchResult, doubling as a query-level cache.
+
+    record() only enqueues: a background thread buffers finished searches and
+    writes each batch with two executemany calls in one transaction, on its
+    own connection, so the GUI thread never waits for the database.
+    lookup() returns the stored ranking of an identical query over an
+    identical corpus (same fingerprint), from memory or from SearchLog.
+    """
+
+    def __init__(self, batch_size: int = HISTORY_BATCH_SIZE, flush_interval: float = HISTORY_FLUSH_INTERVAL):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._recent = OrderedDict()  # (query_key, fingerprint) -> rows
+        self._recent_lock = threading.Lock()
+        self._connection = None
+        self._read_connection = None  # lookup() runs on search threads, never on the writer's connection
+        self._read_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="search-history", daemon=True)
+        self._thread.start()
+
+    def record(self, search_query: str, query_key: str, fingerprint: str, algorithm: str, ranking: str,
+               top_n: int, top_results: List[Dict], duration_exact: float, duration_fuzzy: float,
+               total_scanned: int, cacheable: bool = True):
+        rows = stored_results(top_results)
+        if cacheable:
+            self._remember((query_key, fingerprint), rows)
+        search_id = uuid.uuid4().hex
+        log_row = (search_id, search_query, query_key, fingerprint, algorithm, ranking, top_n,
+                   duration_exact, duration_fuzzy, total_scanned, cacheable, time.strftime("%Y-%m-%d %H:%M:%S"))
+        result_rows = [
+            (search_id, rank, row["detail_id"], row["cv_path"], row["score"],
+             sum(row["matches"].values()), json.dumps(row["matches"]))
+            for rank, row in enumerate(rows, 1)
+        ]
+        self._queue.put((log_row, result_rows))
+
+    def lookup(self, query_key: str, fingerprint: str, use_database: bool = False) -> Optional[List[Dict]]:
+        """
+        Stored rows of the latest identical search, or None. With `use_database`
+        a miss in memory falls back to SearchLog over a connection of its own,
+        so it may be called from any thread.
+        """
+        with self._recent_lock:
+            rows = self._recent.get((query_key, fingerprint))
+            if rows is not None:
+                self._recent.move_to_end((query_key, fingerprint))
+                return rows
+        if not use_database:
+            return None
+
+        with self._read_lock:
+            try:
+                if self._read_connection is None or not self._read_connection.is_connected():
+                    self._read_connection = open_db_connection()
+                cursor = self._read_connection.cursor()
+                try:
+                    cursor.execute(SELECT_CACHED_SEARCH, (query_key, fingerprint))
+                    found = cursor.fetchone()
+                    if not found:
+                        return None
+                    cursor.execute(SELECT_SEARCH_RESULTS, (found[0],))
+                    rows = [{"detail_id": detail_id, "cv_path": cv_path, "score": score, "matches": json.loads(matches)}
+                            for detail_id, cv_path, score, matches in cursor.fetchall()]
+                finally:
+                    cursor.close()
+            except Exception as e:
+                print(f"❌ Gagal membaca riwayat pencarian: {e}")
+                return None
+        self._remember((query_key, fingerprint), rows)
+        return rows
+
+    def _remember(self, key, rows: List[Dict]):
+        with self._recent_lock:
+            self._recent[key] = rows
+            self._recent.move_to_end(key)
+            while len(self._recent) > HISTORY_CACHE_SIZE:
+                self._recent.popitem(last=False)
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if not pending else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._flush(pending)
+                return
+            if item is not None:
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+            if pending and (len(pending) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(pending)
+                pending = []
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        try:
+            if self._connection is None or not self._connection.is_connected():
+                self._connection = open_db_connection()
+            cursor = self._connection.cursor()
+            try:
+                cursor.executemany(INSERT_SEARCH_LOG, [log_row for log_row, _ in batch])
+                result_rows = [row for _, rows in batch for row in rows]
+                if result_rows:
+                    cursor.executemany(INSERT_SEARCH_RESULT, result_rows)
+                self._connection.commit()
+            finally:
+                cursor.close()
+            print(f"💾 Riwayat {len(batch)} pencarian disimpan ({sum(len(rows) for _, rows in batch)} hasil)")
+        except Exception as e:
+            print(f"❌ Gagal menyimpan riwayat {len(batch)} pencarian: {e}")
+            try:
+                if self._connection is not None:
+                    self._connection.rollback()
+            except Exception:
+                self._connection = None
+
+    def close(self, timeout: float = 5.0):
+        """Flush what is still buffered and stop the writer"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        for name in ("_connection", "_read_connection"):
+            connection = getattr(self, name)
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+                setattr(self, name, None)
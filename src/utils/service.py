@@ -0,0 +1,707 @@
+"""
+Long-running HTTP/JSON search service over a warm in-memory engine.
+
+The service loads the CV catalog once, extracts every CV through the shared
+CVTextCache (warm-started from the snapshot) and keeps the trigram and
+positional indexes in memory, so a request never touches a PDF it has seen
+before. Exact and Regex matching is CPU-bound and runs in a process pool:
+the processed texts are packed into a corpus store that every worker maps
+read-only, and only detail_ids travel over the pipe. An upload writes a
+small delta store next to the current ones instead of repacking the corpus. The event loop itself
+only parses requests, consults the indexes and merges results, so many
+recruiters can search concurrently.
+
+Endpoints (JSON in, JSON out):
+    POST /search                 {"keywords": [...], "algorithm": "Aho-Corasick",
+                                  "top_n": 10, "ranking": "count" | "bm25"}
+    POST /upload?filename=x.pdf  raw PDF bytes as the request body
+    GET  /summary/<detail_id>    extracted fields of one CV
+    GET  /metrics                request counts and latency percentiles per route
+    GET  /health
+
+Run from src/:
+    python -m utils.service serve --port 8090
+    python -m utils.service serve --cv-dir ../data --processes 4
+    python -m utils.service loadtest --port 8090 --concurrency 32 --requests 2000 --keywords python java sql
+"""
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from dotenv import load_dotenv
+
+from utils.corpus_store import CorpusStore, write_corpus_store
+from utils.cv_cache import CVTextCache
+from utils.inverted_index import InvertedIndex, is_proximity_query, parse_query
+from utils.search_engine import exact_match_counts, split_keywords
+from utils.sharding import SHARD_ALGORITHMS, rank_key, sources_from_directory
+from utils.trigram_index import TrigramIndex, keywords_query
+
+load_dotenv()
+
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8090"))
+SERVICE_PROCESSES = int(os.getenv("SERVICE_PROCESSES", "0")) or os.cpu_count() or 1
+SERVICE_DATA_DIR = os.getenv("SERVICE_DATA_DIR", "data")
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join("data", "uploads"))
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join("data", "cv_cache.snap"))
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))
+DEFAULT_ALGORITHM = "Aho-Corasick"
+RANKINGS = ("count", "bm25")
+MAX_TOP_N = 200
+# Delta stores stacked on the base store before an upload repacks them into one
+MAX_DELTA_STORES = int(os.getenv("MAX_DELTA_STORES", "8"))
+# detail_ids per process-pool task: small enough to spread one query over all workers
+SEARCH_CHUNK_SIZE = 32
+# Latencies kept per route for the percentiles in /metrics
+METRICS_WINDOW = 2048
+MAX_HEADER_BYTES = 64 * 1024
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (0 for an empty list)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+# ---- Process pool side ----
+
+_worker_stores: Dict[str, CorpusStore] = {}
+
+
+def _open_stores(store_paths: Tuple[str, ...]) -> List[CorpusStore]:
+    """The worker's stores for one generation, newest first; stores no longer in it are closed"""
+    for path in [path for path in _worker_stores if path not in store_paths]:
+        _worker_stores.pop(path).close()
+    for path in store_paths:
+        if path not in _worker_stores:
+            _worker_stores[path] = CorpusStore(path)
+    return [_worker_stores[path] for path in reversed(store_paths)]
+
+
+def _match_chunk(store_paths: Tuple[str, ...], detail_ids: List[int], keywords: List[str], algorithm: str,
+                 keyword_map: Dict[str, str]) -> Tuple[List[Tuple[int, Dict[str, int]]], int]:
+    """
+    Runs inside a worker. A generation is a base store plus the delta stores
+    of later uploads; each store is opened once and the worker switches to a
+    new generation on its next task.
+    Returns the matches and the number of documents whose regex budget ran out.
+    """
+    stores = _open_stores(store_paths)
+    results = []
+    regex_timeouts = 0
+    for detail_id in detail_ids:
+        cv_text = next((text for text in (store.get_text(detail_id) for store in stores) if text is not None), None)
+        if cv_text:
+            timed_out = []
+            matched_kw_freq = exact_match_counts(cv_text, keywords, algorithm, keyword_map, timed_out)
+            regex_timeouts += bool(timed_out)
+            if matched_kw_freq:
+                results.append((detail_id, matched_kw_freq))
+    return results, regex_timeouts
+
+
+# ---- Warm engine ----
+
+class SearchService:
+    """
+    The warm state behind the HTTP endpoints.
+    `_groups` (content hash -> CV sources) and `_store_paths` are replaced as a
+    whole on upload, never mutated, so a running search keeps a consistent view.
+    Every store file is reference counted by the generation that publishes it
+    and by the searches reading it, and removed once nothing holds it.
+    """
+
+    def __init__(self, cv_sources: List[Dict], processes: int = SERVICE_PROCESSES,
+                 data_dir: str = SERVICE_DATA_DIR, upload_dir: str = UPLOAD_DIR,
+                 snapshot_path: str = SNAPSHOT_PATH):
+        self.cv_sources = {source["applicant"]["detail_id"]: source for source in cv_sources}
+        self.processes = max(1, processes)
+        self.data_dir = data_dir
+        self.upload_dir = upload_dir
+        self.snapshot_path = snapshot_path
+        self.text_cache = CVTextCache()
+        self.trigram_index = TrigramIndex()
+        self.inverted_index = InvertedIndex()
+        self._groups: Dict[str, List[Dict]] = {}
+        self._store_paths: Tuple[str, ...] = ()
+        self._store_refs: Dict[str, int] = {}
+        self._store_lock = threading.Lock()
+        self._generation = 0
+        self._next_upload_id = -1  # uploads get negative ids so they never collide with the database
+        self._upload_lock = asyncio.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def warm_up(self) -> Dict[str, float]:
+        """Extract, summarize and index every CV, publish the corpus store and start the workers"""
+        timings = {}
+        step_start = time.perf_counter()
+        snapshot_docs = self.text_cache.load_snapshot(self.snapshot_path)
+        timings[f"snapshot ({snapshot_docs} documents)"] = time.perf_counter() - step_start
+
+        step_start = time.perf_counter()
+        groups = self.text_cache.group_by_content(list(self.cv_sources.values()))
+        for name, index in self._indexes().items():
+            data = self.text_cache.snapshot_global(name)
+            if data is not None:
+                try:
+                    index.load_bytes(data, groups)
+                except (ValueError, KeyError) as e:
+                    print(f"Rebuilding {name}: unreadable postings in the snapshot ({e})")
+        timings[f"index snapshot ({len(self.inverted_index)} documents)"] = time.perf_counter() - step_start
+
+        step_start = time.perf_counter()
+        indexed = 0
+        for content_hash, cv_group in groups.items():
+            if content_hash in self.trigram_index and content_hash in self.inverted_index:
+                self.text_cache.get_summary(cv_group[0]["cv_path"])
+            elif self._index_document(content_hash, cv_group[0]["cv_path"]):
+                indexed += 1
+        timings[f"extract + index ({len(groups)} unique CVs, {indexed} indexed)"] = time.perf_counter() - step_start
+
+        step_start = time.perf_counter()
+        for stale_store in glob.glob(os.path.join(self.data_dir, "service-corpus.*.store")):
+            try:
+                os.remove(stale_store)
+            except OSError:
+                pass
+        self._publish(groups)
+        self.text_cache.save_snapshot(self.snapshot_path, force=indexed > 0, indexes=self._indexes())
+        timings["corpus store + snapshot"] = time.perf_counter() - step_start
+
+        step_start = time.perf_counter()
+        # spawn, like ParallelSearcher: workers start clean instead of inheriting the event loop
+        self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        # Start every worker now so the first requests do not pay for interpreter start-up
+        list(self._executor.map(_match_chunk, [self._store_paths] * self.processes,
+                                [[]] * self.processes, [[]] * self.processes,
+                                [DEFAULT_ALGORITHM] * self.processes, [{}] * self.processes))
+        timings[f"process pool ({self.processes} workers)"] = time.perf_counter() - step_start
+        return timings
+
+    def _indexes(self) -> Dict:
+        """Indexes persisted as global sections of the snapshot, by section name"""
+        return {"trigram_index": self.trigram_index, "inverted_index": self.inverted_index}
+
+    def _index_document(self, content_hash: str, cv_path: str) -> bool:
+        processed_text = self.text_cache.get_text(cv_path)['processed']
+        if not processed_text:
+            return False
+        self.text_cache.get_summary(cv_path)
+        self.trigram_index.add_document(content_hash, processed_text)
+        self.inverted_index.add_document(content_hash, processed_text)
+        return True
+
+    def _publish(self, groups: Dict[str, List[Dict]], new_sources: Optional[List[Tuple[str, Dict]]] = None):
+        """
+        Write a new corpus store generation, then swap it in together with the groups.
+        With `new_sources` ((content_hash, cv_source) pairs) only those CVs go into a delta store on top of the
+        current stores; otherwise, or once MAX_DELTA_STORES deltas have piled
+        up, every CV in `groups` is packed into a single new base store.
+        """
+        self._generation += 1
+        store_path = os.path.join(self.data_dir, f"service-corpus.{self._generation}.store")
+        if new_sources is not None and self._store_paths and len(self._store_paths) <= MAX_DELTA_STORES:
+            sources = new_sources
+            store_paths = self._store_paths + (store_path,)
+        else:
+            sources = [(content_hash, cv_source) for content_hash, cv_group in groups.items() for cv_source in cv_group]
+            store_paths = (store_path,)
+        documents = [(cv_source["applicant"]["detail_id"], content_hash,
+                      self.text_cache.get_text_by_hash(content_hash)['processed'])
+                     for content_hash, cv_source in sources]
+        write_corpus_store(store_path, documents)
+
+        with self._store_lock:
+            old_paths = self._store_paths
+            for path in store_paths:
+                self._store_refs[path] = self._store_refs.get(path, 0) + 1
+            self._store_paths = store_paths
+            self._groups = groups
+        self._release_stores(old_paths)
+
+    def _acquire_stores(self) -> Tuple[Dict[str, List[Dict]], Tuple[str, ...]]:
+        """The current groups and store paths, held until `_release_stores`"""
+        with self._store_lock:
+            for path in self._store_paths:
+                self._store_refs[path] += 1
+            return self._groups, self._store_paths
+
+    def _release_stores(self, store_paths: Tuple[str, ...]):
+        unused = []
+        with self._store_lock:
+            for path in store_paths:
+                self._store_refs[path] -= 1
+                if not self._store_refs[path]:
+                    del self._store_refs[path]
+                    unused.append(path)
+        for path in unused:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _parse_search(request: Dict) -> Tuple[List[str], str, int, str, float]:
+        keywords = request.get("keywords")
+        if isinstance(keywords, str):
+            keywords = split_keywords(keywords)
+        if not keywords or not isinstance(keywords, list) or not all(isinstance(kw, str) and kw.strip() for kw in keywords):
+            raise ValueError("keywords must be a non-empty list of strings")
+        keywords = list(dict.fromkeys(kw.strip() for kw in keywords))
+
+        algorithm = request.get("algorithm", DEFAULT_ALGORITHM)
+        if algorithm not in SHARD_ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {', '.join(SHARD_ALGORITHMS)}")
+        ranking = request.get("ranking", "count")
+        if ranking not in RANKINGS:
+            raise ValueError(f"ranking must be one of {', '.join(RANKINGS)}")
+        if ranking == "bm25" and algorithm == "Regex":
+            raise ValueError("bm25 ranking works on keywords, not regex patterns")
+        try:
+            top_n = int(request.get("top_n", 10))
+            fuzzy_penalty = float(request.get("fuzzy_penalty", 0.0))
+        except (TypeError, ValueError):
+            raise ValueError("top_n and fuzzy_penalty must be numbers") from None
+        if not 1 <= top_n <= MAX_TOP_N:
+            raise ValueError(f"top_n must be between 1 and {MAX_TOP_N}")
+        # Same range as the GUI spin box; the chained comparison also rejects NaN
+        if not 0.0 <= fuzzy_penalty <= 1.0:
+            raise ValueError("fuzzy_penalty must be between 0 and 1")
+
+        if algorithm == "Regex":
+            from algorithms.regex_search import analyze_pattern_complexity
+            for pattern in keywords:
+                problems = analyze_pattern_complexity(pattern)
+                if problems:
+                    raise ValueError(f"pattern {pattern!r} rejected: " + "; ".join(problems))
+        else:
+            for keyword in keywords:
+                parse_query(keyword)
+        return keywords, algorithm, top_n, ranking, fuzzy_penalty
+
+    async def search(self, request: Dict) -> Dict:
+        keywords, algorithm, top_n, ranking, fuzzy_penalty = self._parse_search(request)
+        groups, store_paths = self._acquire_stores()
+        try:
+            return await self._search(keywords, algorithm, top_n, ranking, fuzzy_penalty, groups, store_paths)
+        finally:
+            self._release_stores(store_paths)
+
+    async def _search(self, keywords: List[str], algorithm: str, top_n: int, ranking: str, fuzzy_penalty: float,
+                      groups: Dict[str, List[Dict]], store_paths: Tuple[str, ...]) -> Dict:
+        start = time.perf_counter()
+
+        if ranking == "bm25":
+            ranked = await asyncio.to_thread(self.inverted_index.top_k, keywords, top_n, groups, fuzzy_penalty)
+            results = [{"applicant": cv_source["applicant"], "matches": matches, "score": round(score, 4)}
+                       for content_hash, score, matches in ranked for cv_source in groups[content_hash]]
+            candidates = len(ranked)
+            regex_timeouts = 0
+        else:
+            proximity = [kw for kw in keywords if algorithm != "Regex" and is_proximity_query(kw)]
+            scan_keywords = [kw for kw in keywords if kw not in proximity]
+            doc_matches: Dict[str, Dict[str, int]] = {}
+            candidates = 0
+            regex_timeouts = 0
+            if scan_keywords:
+                keyword_map = {kw.lower(): kw for kw in scan_keywords}
+                candidate_hashes = await asyncio.to_thread(self.trigram_index.candidates,
+                                                           keywords_query(scan_keywords, algorithm), groups)
+                candidates = len(candidate_hashes)
+                # Identical contents are matched once, through their first CV
+                representatives = {groups[content_hash][0]["applicant"]["detail_id"]: content_hash
+                                   for content_hash in candidate_hashes}
+                detail_ids = list(representatives)
+                loop = asyncio.get_running_loop()
+                chunk_results = await asyncio.gather(*(
+                    loop.run_in_executor(self._executor, _match_chunk, store_paths,
+                                         detail_ids[i:i + SEARCH_CHUNK_SIZE], scan_keywords, algorithm, keyword_map)
+                    for i in range(0, len(detail_ids), SEARCH_CHUNK_SIZE)
+                ))
+                for chunk, chunk_timeouts in chunk_results:
+                    regex_timeouts += chunk_timeouts
+                    for detail_id, matched_kw_freq in chunk:
+                        doc_matches[representatives[detail_id]] = matched_kw_freq
+            for keyword in proximity:
+                # NEAR/ONEAR come straight from the positional index, no scan needed
+                counts = await asyncio.to_thread(self.inverted_index.match_counts, keyword, groups)
+                for content_hash, count in counts.items():
+                    doc_matches.setdefault(content_hash, {})[keyword] = count
+            results = [{"applicant": cv_source["applicant"], "matches": matched_kw_freq,
+                        "score": sum(matched_kw_freq.values())}
+                       for content_hash, matched_kw_freq in doc_matches.items()
+                       for cv_source in groups[content_hash]]
+
+        results.sort(key=rank_key)
+        return {
+            "results": results[:top_n],
+            "scanned": sum(len(cv_group) for cv_group in groups.values()),
+            "candidates": candidates,
+            "regex_timeouts": regex_timeouts,
+            "search_time": time.perf_counter() - start,
+        }
+
+    async def upload(self, filename: str, data: bytes) -> Dict:
+        filename = os.path.basename(filename or "")
+        if not filename.lower().endswith(".pdf"):
+            raise ValueError("filename must end with .pdf")
+        if not data.startswith(b"%PDF"):
+            raise ValueError("request body is not a PDF file")
+        # One upload at a time: each one publishes a new corpus store generation
+        async with self._upload_lock:
+            detail_id = self._next_upload_id
+            self._next_upload_id -= 1
+            cv_source = await asyncio.to_thread(self._ingest_upload, detail_id, filename, data)
+        return {"applicant": cv_source["applicant"], "documents": len(self.cv_sources)}
+
+    def _ingest_upload(self, detail_id: int, filename: str, data: bytes) -> Dict:
+        os.makedirs(self.upload_dir, exist_ok=True)
+        cv_path = os.path.join(self.upload_dir, f"{hashlib.sha256(data).hexdigest()[:16]}_{filename}")
+        if not os.path.exists(cv_path):
+            tmp_path = cv_path + ".part"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cv_path)
+
+        content_hash = self.text_cache.content_hash(cv_path)
+        if not content_hash or not self._index_document(content_hash, cv_path):
+            raise ValueError("no text could be extracted from the PDF")
+        applicant = {
+            "applicant_id": f"upload_{-detail_id}",
+            "detail_id": detail_id,
+            "first_name": filename[:-4],
+            "last_name": "",
+            "date_of_birth": "N/A",
+            "address": "N/A",
+            "phone_number": "N/A",
+            "application_role": "Uploaded CV",
+            "cv_path": cv_path,
+        }
+        cv_source = {"source": "uploaded", "applicant": applicant, "cv_path": cv_path}
+        groups = {key: list(cv_group) for key, cv_group in self._groups.items()}
+        groups.setdefault(content_hash, []).append(cv_source)
+        self._publish(groups, [(content_hash, cv_source)])
+        self.cv_sources[detail_id] = cv_source
+        return cv_source
+
+    async def summary(self, detail_id: int) -> Dict:
+        cv_source = self.cv_sources.get(detail_id)
+        if cv_source is None:
+            raise KeyError(f"unknown detail_id {detail_id}")
+        summary = await asyncio.to_thread(self.text_cache.get_summary, cv_source["cv_path"])
+        return {"applicant": cv_source["applicant"], "summary": summary}
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.text_cache.save_snapshot(self.snapshot_path, indexes=self._indexes())
+
+
+# ---- HTTP front end ----
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class RequestMetrics:
+    """Request counts, status codes and latency percentiles per route"""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self.started = time.time()
+        self.in_flight = 0
+        self._routes: Dict[str, Dict] = {}
+
+    def record(self, route: str, status: int, seconds: float):
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = {"count": 0, "errors": 0, "total_time": 0.0, "statuses": {},
+                                           "latencies": deque(maxlen=self.window)}
+        stats["count"] += 1
+        stats["errors"] += status >= 500
+        stats["total_time"] += seconds
+        stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+        stats["latencies"].append(seconds)
+
+    def snapshot(self) -> Dict:
+        routes = {}
+        for route, stats in self._routes.items():
+            latencies = sorted(stats["latencies"])
+            routes[route] = {
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "statuses": stats["statuses"],
+                "mean_ms": stats["total_time"] / stats["count"] * 1000,
+                # Percentiles cover the last `window` requests of the route
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+                "max_ms": latencies[-1] * 1000,
+            }
+        return {"uptime": time.time() - self.started, "in_flight": self.in_flight, "routes": routes}
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Dict]:
+    """One HTTP/1.1 request, or None when the client closed the connection"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "request headers too large") from None
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(400, "malformed request") from None
+    if length > MAX_FILE_SIZE:
+        raise HTTPError(413, f"request body larger than {MAX_FILE_SIZE} bytes")
+    body = await reader.readexactly(length) if length else b""
+    connection = headers.get("connection", "").lower()
+    url = urlsplit(target)
+    return {
+        "method": method,
+        "path": url.path,
+        "query": {name: values[-1] for name, values in parse_qs(url.query).items()},
+        "body": body,
+        "keep_alive": connection != "close" if version == "HTTP/1.1" else connection == "keep-alive",
+    }
+
+
+def encode_response(status: int, payload: Dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, default=str).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+class SearchHTTPServer:
+    """Routes HTTP requests to a SearchService and records the latency of each one"""
+
+    def __init__(self, service: SearchService):
+        self.service = service
+        self.metrics = RequestMetrics()
+
+    @staticmethod
+    def route_of(path: str) -> str:
+        """Route label for the metrics; ids are folded so every CV shares one entry"""
+        if path.startswith("/summary/"):
+            return "/summary/{detail_id}"
+        if path in ("/search", "/upload", "/metrics", "/health"):
+            return path
+        return "unmatched"
+
+    async def _dispatch(self, request: Dict, route: str) -> Dict:
+        method = request["method"]
+        if route == "/search":
+            self._require(method, "POST")
+            try:
+                body = json.loads(request["body"] or b"{}")
+            except ValueError:
+                raise HTTPError(400, "request body is not valid JSON") from None
+            if not isinstance(body, dict):
+                raise HTTPError(400, "request body must be a JSON object")
+            return await self.service.search(body)
+        if route == "/upload":
+            self._require(method, "POST")
+            return await self.service.upload(request["query"].get("filename", ""), request["body"])
+        if route == "/summary/{detail_id}":
+            self._require(method, "GET")
+            try:
+                detail_id = int(request["path"][len("/summary/"):])
+            except ValueError:
+                raise HTTPError(404, "detail_id must be an integer") from None
+            return await self.service.summary(detail_id)
+        if route == "/metrics":
+            self._require(method, "GET")
+            return self.metrics.snapshot()
+        if route == "/health":
+            self._require(method, "GET")
+            return {"status": "ok", "documents": len(self.service.cv_sources)}
+        raise HTTPError(404, f"no route for {request['path']}")
+
+    @staticmethod
+    def _require(method: str, expected: str):
+        if method != expected:
+            raise HTTPError(405, f"use {expected}")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    # The rest of the stream cannot be trusted, answer and hang up
+                    writer.write(encode_response(e.status, {"error": str(e)}, False))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+
+                start = time.perf_counter()
+                route = self.route_of(request["path"])
+                self.metrics.in_flight += 1
+                try:
+                    payload = await self._dispatch(request, route)
+                    status = 200
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except ValueError as e:
+                    status, payload = 400, {"error": str(e)}
+                except KeyError as e:
+                    status, payload = 404, {"error": e.args[0] if e.args else "not found"}
+                except Exception as e:
+                    print(f"❌ {route}: {e}")
+                    status, payload = 500, {"error": str(e)}
+                finally:
+                    self.metrics.in_flight -= 1
+                writer.write(encode_response(status, payload, request["keep_alive"]))
+                await writer.drain()
+                self.metrics.record(route, status, time.perf_counter() - start)
+                if not request["keep_alive"]:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+# ---- Command line ----
+
+def _load_sources(args) -> List[Dict]:
+    if args.cv_dir:
+        return sources_from_directory(args.cv_dir)
+    from utils.database import open_db_connection, query_cv_catalog, cv_source_from_row
+    connection = open_db_connection()
+    try:
+        catalog = query_cv_catalog(connection)
+    finally:
+        connection.close()
+    return [source for source in map(cv_source_from_row, catalog) if source]
+
+
+async def _serve(args):
+    service = SearchService(_load_sources(args), args.processes)
+    timings = await asyncio.to_thread(service.warm_up)
+    for step, seconds in timings.items():
+        print(f"  {step}: {seconds * 1000:.0f} ms")
+    http_server = SearchHTTPServer(service)
+    server = await asyncio.start_server(http_server.handle_connection, args.host, args.port,
+                                        limit=MAX_HEADER_BYTES, backlog=1024)
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f"READY http://{host}:{port} documents={len(service.cv_sources)}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+async def _http_request(reader, writer, host: str, method: str, path: str, payload: Optional[Dict] = None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    length = next(int(line.split(":", 1)[1]) for line in lines if line.lower().startswith("content-length:"))
+    return int(lines[0].split(" ", 2)[1]), json.loads(await reader.readexactly(length))
+
+
+async def _loadtest(args):
+    """Fire --requests searches from --concurrency keep-alive clients and report client-side latency"""
+    latencies = []
+    statuses = {}
+    remaining = iter(range(args.requests))
+    rng = random.Random(args.seed)
+
+    async def client():
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+        try:
+            for _ in remaining:
+                keywords = rng.sample(args.keywords, rng.randint(1, len(args.keywords)))
+                request = {"keywords": keywords, "algorithm": args.algorithm, "top_n": args.top, "ranking": args.ranking}
+                start = time.perf_counter()
+                status, _ = await _http_request(reader, writer, args.host, "POST", "/search", request)
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests, concurrency {args.concurrency}: {elapsed:.2f} s, "
+          f"{len(latencies) / elapsed:.1f} req/s, statuses {statuses}")
+    for q in (50, 90, 95, 99):
+        print(f"  p{q}: {percentile(latencies, q) * 1000:.1f} ms")
+    print(f"  max: {latencies[-1] * 1000:.1f} ms")
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, metrics = await _http_request(reader, writer, args.host, "GET", "/metrics")
+    writer.close()
+    print("Server side:")
+    for route, stats in metrics["routes"].items():
+        print(f"  {route}: {stats['count']} requests, mean {stats['mean_ms']:.1f} ms, "
+              f"p95 {stats['p95_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON CV search service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the search service")
+    serve.add_argument("--host", default=SERVICE_HOST)
+    serve.add_argument("--port", type=int, default=SERVICE_PORT, help="0 picks a free port")
+    serve.add_argument("--cv-dir", help="serve the PDFs of a directory instead of the database catalog")
+    serve.add_argument("--processes", type=int, default=SERVICE_PROCESSES, help="matching worker processes")
+
+    loadtest = commands.add_parser("loadtest", help="load-test a running service with concurrent searches")
+    loadtest.add_argument("--host", default=SERVICE_HOST)
+    loadtest.add_argument("--port", type=int, default=SERVICE_PORT)
+    loadtest.add_argument("--concurrency", type=int, default=16)
+    loadtest.add_argument("--requests", type=int, default=500)
+    loadtest.add_argument("--keywords", nargs="+", required=True, help="each request searches a random subset")
+    loadtest.add_argument("--algorithm", default=DEFAULT_ALGORITHM, choices=SHARD_ALGORITHMS)
+    loadtest.add_argument("--ranking", default="count", choices=RANKINGS)
+    loadtest.add_argument("--top", type=int, default=10)
+    loadtest.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args) if args.command == "serve" else _loadtest(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Scatter-gather search over CV shards.
+
+The catalog is split into contiguous detail_id ranges. Every shard server
+owns the CVs of one range together with its own extraction cache and trigram
+index, and answers searches over a local socket. The coordinator fans a query
+out to all shards, waits until a deadline and merges the per-shard top-N lists.
+
+Every shard ranks its CVs by the same total order (score, then detail_id,
+both descending), so the global top-N is exactly the first N of the merged
+shard lists. A shard that times out or is unreachable is reported and left
+out; its CVs are simply missing from the (partial) result.
+
+Run from src/:
+    python -m utils.sharding serve --shard 0 --shards 3 --port 9101
+    python -m utils.sharding local --shards 3 --cv-dir ../data --keywords python sql
+"""
+import argparse
+import heapq
+import json
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.cv_cache import CVTextCache
+from utils.search_engine import EXACT_ALGORITHMS, exact_match_counts
+from utils.trigram_index import TrigramIndex, keywords_query
+
+SHARD_ALGORITHMS = (*EXACT_ALGORITHMS, "Regex")
+DEFAULT_SHARD_TIMEOUT = float(os.getenv("SHARD_TIMEOUT", "5"))
+_HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+# ---- Wire format: 4-byte big-endian length + UTF-8 JSON ----
+
+def send_message(sock: socket.socket, payload: Dict):
+    data = json.dumps(payload, default=str).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed mid-message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Dict:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    if size > MAX_MESSAGE_BYTES:
+        raise ConnectionError(f"message of {size} bytes exceeds the limit")
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+# ---- Partitioning and ranking ----
+
+def shard_ranges(detail_ids: Sequence[int], shards: int) -> List[Tuple[int, int]]:
+    """Split detail_ids into `shards` contiguous, inclusive ranges holding about as many CVs each"""
+    ordered = sorted(set(detail_ids))
+    if not ordered:
+        return []
+    shards = max(1, min(shards, len(ordered)))
+    ranges = []
+    for shard in range(shards):
+        first = ordered[shard * len(ordered) // shards]
+        last = ordered[(shard + 1) * len(ordered) // shards - 1]
+        ranges.append((first, last))
+    return ranges
+
+
+def detail_id_key(result: Dict) -> Tuple:
+    """Tie-break between equal scores: higher detail_id first (also usable as TopN tie_break)"""
+    detail_id = result["applicant"].get("detail_id")
+    return (-detail_id if isinstance(detail_id, int) else 0, str(detail_id))
+
+
+def rank_key(result: Dict) -> Tuple:
+    """Total order used by every shard and by the merge: score, then detail_id, both descending"""
+    return (-result["score"],) + detail_id_key(result)
+
+
+def merge_ranked(ranked_lists: Sequence[List[Dict]], top_n: int) -> List[Dict]:
+    """Global top-N from lists that are each sorted by rank_key"""
+    merged = heapq.merge(*ranked_lists, key=rank_key)
+    return [result for result, _ in zip(merged, range(top_n))]
+
+
+# ---- Shard side ----
+
+class ShardEngine:
+    """
+    The CVs of one shard with their own text cache and trigram index.
+    Also usable in-process, e.g. for CVs that live on no shard.
+    """
+
+    def __init__(self, shard_id: int, cv_sources: List[Dict], text_cache: Optional[CVTextCache] = None):
+        self.shard_id = shard_id
+        self.cv_sources = cv_sources
+        self.text_cache = text_cache or CVTextCache()
+        self.trigram_index = TrigramIndex()
+
+    def warm_up(self):
+        """Extract every CV once and index it, so searches never touch a PDF"""
+        for cv_source in self.cv_sources:
+            processed_text = self.text_cache.get_text(cv_source["cv_path"])['processed']
+            if processed_text:
+                self.trigram_index.add_document(self.text_cache.content_hash(cv_source["cv_path"]), processed_text)
+
+    def search(self, keywords: List[str], algorithm: str, top_n: int) -> Dict:
+        if algorithm not in SHARD_ALGORITHMS:
+            raise ValueError(f"Algorithm {algorithm} is not supported on shards")
+        start = time.perf_counter()
+        keyword_map = {kw.lower(): kw for kw in keywords}
+        unique_docs = self.text_cache.group_by_content(self.cv_sources)
+        candidates = self.trigram_index.candidates(keywords_query(keywords, algorithm), unique_docs)
+
+        results = []
+        regex_timeouts = 0
+        for content_hash in candidates:
+            cv_group = unique_docs[content_hash]
+            cv_text = self.text_cache.get_text(cv_group[0]["cv_path"])['processed']
+            if not cv_text:
+                continue
+            timed_out = []
+            matched_kw_freq = exact_match_counts(cv_text, keywords, algorithm, keyword_map, timed_out)
+            regex_timeouts += bool(timed_out)
+            if not matched_kw_freq:
+                continue
+            score = sum(matched_kw_freq.values())
+            for cv_source in cv_group:
+                results.append({"applicant": cv_source["applicant"], "matches": dict(matched_kw_freq), "score": score})
+        results.sort(key=rank_key)
+        return {
+            "shard": self.shard_id,
+            "results": results[:top_n],
+            "scanned": len(self.cv_sources),
+            "candidates": len(candidates),
+            "regex_timeouts": regex_timeouts,
+            "search_time": time.perf_counter() - start,
+        }
+
+
+class _ShardRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        try:
+            request = recv_message(self.request)
+        except (ConnectionError, ValueError, OSError):
+            return
+        try:
+            if server.delay:
+                time.sleep(server.delay)
+            if request.get("op") == "ping":
+                response = {"shard": server.engine.shard_id, "documents": len(server.engine.cv_sources)}
+            elif request.get("op") == "search":
+                response = server.engine.search(request["keywords"], request["algorithm"], int(request["top_n"]))
+            else:
+                response = {"error": f"unknown op {request.get('op')!r}"}
+        except Exception as e:
+            response = {"shard": server.engine.shard_id, "error": str(e)}
+        try:
+            send_message(self.request, response)
+        except OSError:
+            pass  # the coordinator gave up on this shard
+
+
+class ShardServer(socketserver.ThreadingTCPServer):
+    """Serves one ShardEngine; every connection carries one request and one response"""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], engine: ShardEngine, delay: float = 0.0):
+        super().__init__(address, _ShardRequestHandler)
+        self.engine = engine
+        self.delay = delay  # artificial latency, to exercise partial results
+
+
+# ---- Coordinator side ----
+
+def parse_addresses(text: str) -> List[Tuple[str, int]]:
+    """'host:port,host:port' -> [(host, port), ...]"""
+    addresses = []
+    for item in text.split(","):
+        item = item.strip()
+        if item:
+            host, _, port = item.rpartition(":")
+            addresses.append((host or "127.0.0.1", int(port)))
+    return addresses
+
+
+class ShardCoordinator:
+    """Fans a search out to every shard and merges what arrives before the deadline"""
+
+    def __init__(self, addresses: List[Tuple[str, int]], timeout: float = DEFAULT_SHARD_TIMEOUT):
+        self.addresses = addresses
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(addresses)), thread_name_prefix="shard")
+
+    def _request(self, address: Tuple[str, int], payload: Dict, deadline: float) -> Tuple[Dict, float]:
+        """One request/response exchange, bounded by the deadline; returns (response, round trip seconds)"""
+        start = time.perf_counter()
+        with socket.create_connection(address, timeout=max(0.001, deadline - start)) as sock:
+            sock.settimeout(max(0.001, deadline - time.perf_counter()))
+            send_message(sock, payload)
+            return recv_message(sock), time.perf_counter() - start
+
+    def search(self, keywords: List[str], algorithm: str, top_n: int) -> Dict:
+        """
+        Returns {"results": merged top-N, "shards": one report per shard,
+        "partial": True if any shard is missing from the results}
+        """
+        payload = {"op": "search", "keywords": keywords, "algorithm": algorithm, "top_n": top_n}
+        deadline = time.perf_counter() + self.timeout
+        futures = {self._executor.submit(self._request, address, payload, deadline): shard
+                   for shard, address in enumerate(self.addresses)}
+        done, _ = wait(futures, timeout=self.timeout)
+
+        reports = []
+        ranked_lists = []
+        for future, shard in sorted(futures.items(), key=lambda item: item[1]):
+            host, port = self.addresses[shard]
+            report = {"shard": shard, "address": f"{host}:{port}"}
+            if future not in done:
+                report.update(status="timeout", duration=self.timeout)
+            elif future.exception() is not None:
+                error = future.exception()
+                report.update(status="timeout" if isinstance(error, socket.timeout) else "unavailable", error=str(error))
+            else:
+                response, round_trip = future.result()
+                if "error" in response:
+                    report.update(status="error", duration=round_trip, error=response["error"])
+                else:
+                    report.update(status="ok", duration=round_trip, search_time=response["search_time"],
+                                  scanned=response["scanned"], candidates=response["candidates"],
+                                  regex_timeouts=response.get("regex_timeouts", 0))
+                    ranked_lists.append(response["results"])
+            reports.append(report)
+
+        return {
+            "results": merge_ranked(ranked_lists, top_n),
+            "shards": reports,
+            "partial": any(report["status"] != "ok" for report in reports),
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ---- Command line ----
+
+def sources_from_directory(cv_dir: str) -> List[Dict]:
+    """Every PDF in a directory as a CV source; detail_id follows the sorted file names"""
+    sources = []
+    for detail_id, filename in enumerate(sorted(f for f in os.listdir(cv_dir) if f.lower().endswith(".pdf")), 1):
+        cv_path = os.path.join(cv_dir, filename)
+        applicant = {"applicant_id": detail_id, "detail_id": detail_id, "first_name": filename[:-4],
+                     "last_name": "", "cv_path": cv_path}
+        sources.append({"source": "directory", "applicant": applicant, "cv_path": cv_path})
+    return sources
+
+
+def _shard_sources(args) -> List[Dict]:
+    if args.cv_dir:
+        sources = sources_from_directory(args.cv_dir)
+        ranges = shard_ranges([s["applicant"]["detail_id"] for s in sources], args.shards)
+        if args.shard >= len(ranges):
+            return []
+        first, last = ranges[args.shard]
+        return [s for s in sources if first <= s["applicant"]["detail_id"] <= last]
+
+    from utils.database import open_db_connection, query_cv_catalog, cv_source_from_row
+    connection = open_db_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT detail_id FROM ApplicationDetail")
+        detail_ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        ranges = shard_ranges(detail_ids, args.shards)
+        if args.shard >= len(ranges):
+            return []
+        catalog = query_cv_catalog(connection, ranges[args.shard])
+    finally:
+        connection.close()
+    return [source for source in map(cv_source_from_row, catalog) if source]
+
+
+def _serve(args):
+    engine = ShardEngine(args.shard, _shard_sources(args))
+    engine.warm_up()
+    with ShardServer((args.host, args.port), engine, args.delay) as server:
+        host, port = server.server_address[:2]
+        # The first line tells a parent process (see `local`) where the shard listens
+        print(f"READY {host}:{port} shard={args.shard} documents={len(engine.cv_sources)}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def _local(args):
+    """Start every shard on localhost, run one search through the coordinator and print the reports"""
+    processes = []
+    addresses = []
+    # Shards run from src/, so a path relative to the caller's directory would point elsewhere
+    cv_dir = os.path.abspath(args.cv_dir)
+    try:
+        for shard in range(args.shards):
+            command = [sys.executable, "-m", "utils.sharding", "serve", "--shard", str(shard),
+                       "--shards", str(args.shards), "--port", "0", "--cv-dir", cv_dir]
+            if shard in args.slow_shards:
+                command += ["--delay", str(args.timeout * 2)]
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True,
+                                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            processes.append(process)
+        for process in processes:
+            ready_line = process.stdout.readline().split()
+            if not ready_line or ready_line[0] != "READY":
+                raise RuntimeError("a shard failed to start")
+            addresses.append(parse_addresses(ready_line[1])[0])
+            print(" ".join(ready_line))
+
+        coordinator = ShardCoordinator(addresses, args.timeout)
+        start = time.perf_counter()
+        response = coordinator.search(args.keywords, args.algorithm, args.top)
+        print(f"\nSearch took {(time.perf_counter() - start) * 1000:.1f} ms"
+              f"{' (partial results)' if response['partial'] else ''}")
+        for report in response["shards"]:
+            details = ", ".join(f"{key}={value:.4f}" if isinstance(value, float) else f"{key}={value}"
+                                for key, value in report.items() if key not in ("shard", "address"))
+            print(f"  shard {report['shard']} @ {report['address']}: {details}")
+        for rank, result in enumerate(response["results"], 1):
+            applicant = result["applicant"]
+            print(f"{rank:3}. [{applicant['detail_id']}] {applicant['first_name']} score={result['score']} {result['matches']}")
+        coordinator.close()
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded CV search")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run one shard server")
+    serve.add_argument("--shard", type=int, required=True, help="index of this shard (0-based)")
+    serve.add_argument("--shards", type=int, required=True, help="total number of shards")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    serve.add_argument("--cv-dir", help="serve the PDFs of a directory instead of the database catalog")
+    serve.add_argument("--delay", type=float, default=0.0, help="artificial latency per request (seconds)")
+
+    local = commands.add_parser("local", help="start all shards on localhost and run one search")
+    local.add_argument("--shards", type=int, default=3)
+    local.add_argument("--cv-dir", required=True)
+    local.add_argument("--keywords", nargs="+", required=True)
+    local.add_argument("--algorithm", default="Aho-Corasick", choices=SHARD_ALGORITHMS)
+    local.add_argument("--top", type=int, default=10)
+    local.add_argument("--timeout", type=float, default=DEFAULT_SHARD_TIMEOUT)
+    local.add_argument("--slow-shards", type=int, nargs="*", default=[], help="shards that answer after the timeout")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        _serve(args)
+    else:
+        _local(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import importlib
+import sys
+import threading
+import time
+from typing import Dict
+
+# Modules that are expensive to import and not needed to paint the first window
+HEAVY_MODULES = [
+    "mysql.connector",
+    "fitz",
+    "numpy",
+    "utils.pdf_processor",
+    "algorithms.aho_corasick",
+    "algorithms.kmp",
+    "algorithms.boyer_moore",
+    "algorithms.horspool",
+    "algorithms.sunday",
+    "algorithms.two_way",
+    "algorithms.shift_or",
+    "algorithms.levenshtein",
+    "algorithms.myers",
+    "algorithms.regex_search",
+    "algorithms.skills_matcher",
+    "algorithms.suffix_array",
+]
+
+_lock = threading.Lock()
+import_timings: Dict[str, float] = {}
+
+
+def timed_import(module_name: str):
+    """
+    Import a module and record how long the first import took (in seconds).
+    Subsequent calls return the already loaded module at no cost.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    with _lock:
+        import_timings.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+
+def format_timings(timings: Dict[str, float]) -> str:
+    """Format a {name: seconds} dict as aligned lines in milliseconds"""
+    if not timings:
+        return ""
+    width = max(len(name) for name in timings)
+    return "\n".join(f"  {name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in timings.items())
@@ -0,0 +1,84 @@
+import heapq
+import itertools
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class _Ascending:
+    """Wraps a sort key so that the smaller key compares as the larger one"""
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __gt__(self, other):
+        return self.key < other.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class TopN:
+    """
+    Bounded top-N collector backed by a min-heap.
+    Pushing costs O(log n) and memory stays at n entries no matter how many
+    results arrive. Ties keep arrival order, exactly like a stable sort by
+    descending score followed by slicing the first n, unless tie_break is
+    given: then equal scores are ordered by tie_break(item), smallest first,
+    so the ranking no longer depends on the order results arrive in.
+    """
+
+    def __init__(self, n: int, tie_break: Optional[Callable[[Any], Any]] = None):
+        self.n = n
+        self.tie_break = tie_break
+        self._heap = []  # (score, tie, -sequence, item): the root is the entry to evict next
+        self._sequence = itertools.count()
+        self.changed = False
+
+    def push(self, score, item: Any) -> bool:
+        """Offer an item; returns True if it entered the current top n"""
+        if self.n <= 0:
+            return False
+        tie = _Ascending(self.tie_break(item)) if self.tie_break is not None else 0
+        entry = (score, tie, -next(self._sequence), item)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry[:3] > self._heap[0][:3]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return False
+        self.changed = True
+        return True
+
+    def ranked(self) -> List[Any]:
+        """Items ordered by descending score, then tie_break or earlier arrivals first"""
+        return [item for _, item in self.ranked_with_scores()]
+
+    def ranked_with_scores(self) -> List[Tuple[Any, Any]]:
+        """(score, item) pairs in the order of ranked()"""
+        return [(score, item) for score, _, _, item in sorted(self._heap, key=lambda entry: entry[:3], reverse=True)]
+
+    def min_score(self):
+        """Score an item must beat to enter once the collector is full (None while empty)"""
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class RateLimiter:
+    """Lets an event through at most once per interval (seconds)"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._last = float("-inf")
+
+    def ready(self, force: bool = False) -> bool:
+        now = time.perf_counter()
+        if force or now - self._last >= self.interval:
+            self._last = now
+            return True
+        return False
@@ -0,0 +1,226 @@
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from utils.index_snapshot import LazyTable, pack_table, unpack_table
+
+import re._parser as _sre_parser
+import re._constants as _sre_constants
+
+# Boolean trigram queries are nested tuples:
+#   ('trigram', 'abc') | ('and', [q, ...]) | ('or', [q, ...]) | ('atleast', (n, [q, ...]))
+# and MATCH_ALL (None) means "no restriction, every document is a candidate".
+MATCH_ALL = None
+
+
+def _and(queries: List) -> Optional[tuple]:
+    queries = [q for q in queries if q is not MATCH_ALL]
+    if not queries:
+        return MATCH_ALL
+    return queries[0] if len(queries) == 1 else ('and', queries)
+
+
+def _or(queries: List) -> Optional[tuple]:
+    if not queries or any(q is MATCH_ALL for q in queries):
+        return MATCH_ALL
+    return queries[0] if len(queries) == 1 else ('or', queries)
+
+
+def literal_query(literal: str) -> Optional[tuple]:
+    """A literal occurs only in documents containing all of its trigrams"""
+    literal = literal.lower()
+    if len(literal) < 3:
+        return MATCH_ALL
+    trigrams = dict.fromkeys(literal[i:i + 3] for i in range(len(literal) - 2))
+    return _and([('trigram', t) for t in trigrams])
+
+
+def fuzzy_query(keyword: str, max_edits: int) -> Optional[tuple]:
+    """
+    q-gram lemma: an edit touches at most 3 trigram positions, so a substring
+    within max_edits edits of the keyword still contains at least
+    (distinct trigrams - 3 * max_edits) of the keyword's distinct trigrams.
+    Short keywords with a large budget get no constraint.
+    """
+    keyword = keyword.lower()
+    trigrams = list(dict.fromkeys(keyword[i:i + 3] for i in range(len(keyword) - 2)))
+    needed = len(trigrams) - 3 * max_edits
+    if needed <= 0:
+        return MATCH_ALL
+    if needed == len(trigrams):
+        return _and([('trigram', t) for t in trigrams])
+    return ('atleast', (needed, [('trigram', t) for t in trigrams]))
+
+
+def regex_query(pattern: str) -> Optional[tuple]:
+    """
+    Plan a boolean trigram query for a regex, in the style of code-search
+    engines: runs of literal characters that every match must contain become
+    AND-ed trigram sets, alternations become OR, and anything the planner
+    cannot reason about (classes, optional parts, ...) imposes no constraint.
+    The query is a necessary condition only; candidates are still verified by
+    running the real regex.
+    """
+    try:
+        parsed = _sre_parser.parse(pattern)
+    except re.error:
+        return MATCH_ALL
+    return _sequence_query(list(parsed))
+
+
+def _sequence_query(items) -> Optional[tuple]:
+    queries = []
+    run = []
+
+    def flush():
+        if run:
+            queries.append(literal_query("".join(run)))
+            run.clear()
+
+    for op, av in items:
+        if op is _sre_constants.LITERAL:
+            run.append(chr(av))
+        elif op is _sre_constants.SUBPATTERN:
+            sub_items = list(av[-1])
+            if all(sub_op is _sre_constants.LITERAL for sub_op, _ in sub_items):
+                # A plain group like (java) keeps the literal run going
+                run.extend(chr(sub_av) for _, sub_av in sub_items)
+            else:
+                flush()
+                queries.append(_sequence_query(sub_items))
+        elif op is _sre_constants.BRANCH:
+            flush()
+            queries.append(_or([_sequence_query(list(alt)) for alt in av[1]]))
+        elif op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT) or op is getattr(_sre_constants, 'POSSESSIVE_REPEAT', None):
+            flush()
+            min_count, _, sub = av
+            if min_count >= 1:
+                # At least one copy of the repeated part must be present
+                queries.append(_sequence_query(list(sub)))
+        elif op is _sre_constants.AT:
+            # Anchors (^, $, \b) consume no characters and do not break a literal run
+            continue
+        else:
+            flush()
+    flush()
+    return _and(queries)
+
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to the documents containing them,
+    built over the processed (lowercased, whitespace-collapsed) CV text and
+    keyed by content hash. Thread-safe: warm-up can add documents while a
+    search reads candidates. to_bytes()/load_bytes() persist the postings in
+    a snapshot so a restart only indexes new documents.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._doc_numbers: Dict[str, int] = {}
+        self._next_doc_number = 0
+        self._postings: Dict[str, Set[int]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._doc_numbers
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._doc_numbers)
+
+    def add_document(self, key: str, text: str):
+        trigrams = {text[i:i + 3] for i in range(len(text) - 2)}
+        with self._lock:
+            if key in self._doc_numbers:
+                return
+            doc_number = self._next_doc_number
+            self._next_doc_number += 1
+            self._doc_numbers[key] = doc_number
+            for trigram in trigrams:
+                self._postings.setdefault(trigram, set()).add(doc_number)
+
+    def to_bytes(self) -> bytes:
+        """Postings and document keys as a packed table (see index_snapshot.pack_table)"""
+        with self._lock:
+            keys = [None] * self._next_doc_number
+            for key, doc_number in self._doc_numbers.items():
+                keys[doc_number] = key
+            return pack_table({"keys": keys},
+                              ((trigram, sorted(self._postings[trigram])) for trigram in self._postings))
+
+    def load_bytes(self, data: bytes, live_keys: Iterable[str]) -> bool:
+        """
+        Load postings written by to_bytes() into an empty index. Documents
+        outside `live_keys` (removed or changed CVs) are dropped as the
+        postings are decoded. Returns False if the index is not empty.
+        """
+        live_keys = set(live_keys)
+        header, directory, values = unpack_table(data)
+        with self._lock:
+            if self._next_doc_number:
+                return False
+            keys = header["keys"]
+            self._doc_numbers = {key: doc_number for doc_number, key in enumerate(keys)
+                                 if key is not None and key in live_keys}
+            self._next_doc_number = len(keys)
+            if len(self._doc_numbers) == sum(key is not None for key in keys):
+                decode = set
+            else:
+                live_numbers = set(self._doc_numbers.values())
+                decode = lambda row: live_numbers.intersection(row)
+            self._postings = LazyTable(directory, values, decode)
+        return True
+
+    def _evaluate(self, query) -> Optional[Set[int]]:
+        if query is MATCH_ALL:
+            return MATCH_ALL
+        kind, value = query
+        if kind == 'trigram':
+            return self._postings.get(value, set())
+        if kind == 'atleast':
+            needed, queries = value
+            counts = Counter()
+            for q in queries:
+                counts.update(self._evaluate(q))
+            return {doc_number for doc_number, count in counts.items() if count >= needed}
+        results = [self._evaluate(q) for q in value]
+        if kind == 'and':
+            restricted = sorted((r for r in results if r is not MATCH_ALL), key=len)
+            if not restricted:
+                return MATCH_ALL
+            result = set(restricted[0])
+            for postings in restricted[1:]:
+                result &= postings
+                if not result:
+                    break
+            return result
+        if any(r is MATCH_ALL for r in results):
+            return MATCH_ALL
+        return set().union(*results)
+
+    def candidates(self, query, keys: Iterable[str]) -> List[str]:
+        """
+        Narrow `keys` down to the documents that may satisfy `query`.
+        Keys that are not indexed yet are always kept.
+        """
+        keys = list(keys)
+        with self._lock:
+            matching = self._evaluate(query)
+            if matching is MATCH_ALL:
+                return keys
+            return [key for key in keys
+                    if key not in self._doc_numbers or self._doc_numbers[key] in matching]
+
+
+def keywords_query(keywords: Iterable[str], algorithm: str) -> Optional[tuple]:
+    """A CV is a candidate if it may contain at least one of the keywords/patterns"""
+    if algorithm == "Regex":
+        return _or([regex_query(pattern) for pattern in keywords])
+    return _or([literal_query(keyword) for keyword in keywords])
+
+
+def fuzzy_keywords_query(keywords: Iterable[str], max_edits: Iterable[int]) -> Optional[tuple]:
+    """A CV is a fuzzy candidate if it may contain an approximate match of at least one keyword"""
+    return _or([fuzzy_query(keyword, k) for keyword, k in zip(keywords, max_edits)])
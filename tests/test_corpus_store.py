@@ -0,0 +1,75 @@
+import hashlib
+import os
+
+import pytest
+
+from utils.corpus_store import CorpusStore, open_corpus_store, write_corpus_store
+from utils.cv_cache import CVTextCache
+
+
+def digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def write_file(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_identical_files_share_one_group(tmp_path):
+    first = write_file(tmp_path / "a.pdf", b"%PDF same bytes")
+    copy = write_file(tmp_path / "a_copy.pdf", b"%PDF same bytes")
+    other = write_file(tmp_path / "b.pdf", b"%PDF other bytes")
+    sources = [{"cv_path": path, "applicant": {"detail_id": i}} for i, path in enumerate([first, copy, other], 1)]
+    sources.append({"cv_path": str(tmp_path / "missing.pdf"), "applicant": {"detail_id": 4}})
+
+    groups = CVTextCache().group_by_content(sources)
+
+    assert sorted(len(group) for group in groups.values()) == [1, 2]
+    assert groups[CVTextCache.hash_file(first)] == sources[:2]
+
+
+def test_content_hash_follows_file_changes(tmp_path):
+    path = write_file(tmp_path / "cv.pdf", b"%PDF version 1")
+    cache = CVTextCache()
+    before = cache.content_hash(path)
+    write_file(path, b"%PDF version 2, longer")
+    assert cache.content_hash(path) == CVTextCache.hash_file(path) != before
+    assert cache.content_hash(str(tmp_path / "missing.pdf")) is None
+
+
+def test_corpus_store_round_trip(tmp_path):
+    texts = {1: "python developer", 7: "data engineer, café", 3: "python developer", 12: ""}
+    path = str(tmp_path / "corpus.store")
+    assert write_corpus_store(path, [(detail_id, digest(text), text) for detail_id, text in texts.items()]) == 4
+
+    with CorpusStore(path) as store:
+        assert len(store) == 4
+        assert store.detail_ids() == [1, 3, 7, 12]
+        for detail_id, text in texts.items():
+            assert detail_id in store
+            assert store.get_text(detail_id) == text
+            assert store.content_hash(detail_id) == digest(text)
+        assert 5 not in store and "1" not in store
+        assert store.get_text(5) is None and store.content_hash(5) is None
+        data = store.get_bytes(7)
+        assert bytes(data) == texts[7].encode("utf-8")
+        data.release()
+
+
+def test_identical_contents_are_stored_once(tmp_path):
+    text = "x" * 10000
+    shared = str(tmp_path / "shared.store")
+    distinct = str(tmp_path / "distinct.store")
+    write_corpus_store(shared, [(1, digest(text), text), (2, digest(text), text)])
+    write_corpus_store(distinct, [(1, digest(text), text), (2, digest(text + "!"), text + "!")])
+    assert os.path.getsize(distinct) - os.path.getsize(shared) > len(text)
+
+
+def test_unreadable_corpus_store(tmp_path):
+    garbage = write_file(tmp_path / "garbage.store", b"not a corpus store at all")
+    with pytest.raises(ValueError):
+        CorpusStore(garbage)
+    assert open_corpus_store(garbage) is None
+    assert open_corpus_store(str(tmp_path / "missing.store")) is None
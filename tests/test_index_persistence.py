@@ -0,0 +1,80 @@
+import pytest
+
+from utils.cv_cache import CVTextCache
+from utils.inverted_index import InvertedIndex
+from utils.trigram_index import TrigramIndex, keywords_query
+
+DOCUMENTS = {
+    "h1": "python developer with django and sql experience python",
+    "h2": "java engineer, spring boot, sql databases and c++",
+    "h3": "data analyst: python, pandas, sql and machine learning",
+    "h4": "project manager with agile and scrum, some java",
+}
+
+
+def build(index_class, documents):
+    index = index_class()
+    for key, text in documents.items():
+        index.add_document(key, text)
+    return index
+
+
+def reload(index, live_keys):
+    loaded = type(index)()
+    assert loaded.load_bytes(index.to_bytes(), live_keys)
+    return loaded
+
+
+@pytest.mark.parametrize("keywords", [["python"], ["sql", "java"], ["c++"], ["scrum", "pandas"], ["rust"]])
+def test_trigram_index_round_trip(keywords):
+    live = ["h1", "h2", "h4"]  # h3 was removed or changed since the snapshot
+    loaded = reload(build(TrigramIndex, DOCUMENTS), live)
+    fresh = build(TrigramIndex, {key: DOCUMENTS[key] for key in live})
+    query = keywords_query(keywords, "KMP")
+    assert loaded.candidates(query, live) == fresh.candidates(query, live)
+    assert "h3" not in loaded and len(loaded) == 3
+
+
+@pytest.mark.parametrize("keywords", [["python"], ["sql", "java"], ["python sql"], ["sql NEAR/3 java"], ["agile"]])
+def test_inverted_index_round_trip_matches_fresh_build(keywords):
+    live = ["h1", "h2", "h4"]
+    loaded = reload(build(InvertedIndex, DOCUMENTS), live)
+    fresh = build(InvertedIndex, {key: DOCUMENTS[key] for key in live})
+    # Same N, average length, document frequencies and term frequencies: identical scores
+    assert loaded.top_k(keywords, 10) == fresh.top_k(keywords, 10)
+    for keyword in keywords:
+        assert loaded.match_counts(keyword) == fresh.match_counts(keyword)
+
+
+def test_documents_can_be_added_after_loading():
+    loaded = reload(build(InvertedIndex, DOCUMENTS), ["h1", "h2"])
+    loaded.add_document("h5", "python and rust")
+    fresh = build(InvertedIndex, {"h1": DOCUMENTS["h1"], "h2": DOCUMENTS["h2"], "h5": "python and rust"})
+    assert loaded.top_k(["python", "rust"], 5) == fresh.top_k(["python", "rust"], 5)
+    trigrams = reload(build(TrigramIndex, DOCUMENTS), ["h1", "h2"])
+    trigrams.add_document("h5", "python and rust")
+    assert trigrams.candidates(keywords_query(["rust"], "KMP"), ["h1", "h2", "h5"]) == ["h5"]
+
+
+def test_load_refuses_a_non_empty_index():
+    index = build(TrigramIndex, DOCUMENTS)
+    assert not index.load_bytes(index.to_bytes(), DOCUMENTS)
+
+
+def test_snapshot_carries_index_sections(tmp_path):
+    path = str(tmp_path / "cache.snap")
+    cache = CVTextCache()
+    trigrams = build(TrigramIndex, DOCUMENTS)
+    assert cache.save_snapshot(path, force=True, indexes={"trigram_index": trigrams, "inverted_index": InvertedIndex()})
+
+    reopened = CVTextCache()
+    reopened.load_snapshot(path)
+    data = reopened.snapshot_global("trigram_index")
+    assert data is not None
+    # The empty inverted index was not written; saving without indexes keeps the trigram section
+    assert reopened.snapshot_global("inverted_index") is None
+    assert reopened.save_snapshot(path, force=True)
+    reopened.load_snapshot(path)
+    loaded = TrigramIndex()
+    assert loaded.load_bytes(reopened.snapshot_global("trigram_index"), DOCUMENTS)
+    assert len(loaded) == len(DOCUMENTS)
@@ -0,0 +1,154 @@
+import math
+import random
+
+import pytest
+
+from algorithms.levenshtein import calculate_dynamic_threshold, levenshtein_distance
+from utils.inverted_index import BM25_B, BM25_K1, InvertedIndex, tokenize
+
+VOCABULARY = ["python", "pyhton", "java", "javas", "sql", "docker", "dokcer", "react", "agile", "scrum", "data"]
+
+
+def random_corpus(rng, count):
+    return {f"h{i}": " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(0, 30))) for i in range(count)}
+
+
+def build(documents):
+    index = InvertedIndex()
+    for key, text in documents.items():
+        index.add_document(key, text)
+    return index
+
+
+def brute_force_bm25(documents, keywords, fuzzy_penalty=0.0):
+    """Score every document term by term, straight from the BM25 definition"""
+    tokens = {key: tokenize(text) for key, text in documents.items()}
+    average_length = sum(map(len, tokens.values())) / len(tokens) or 1.0
+    vocabulary = {token for doc_tokens in tokens.values() for token in doc_tokens}
+
+    def contributions(term):
+        frequencies = {key: doc_tokens.count(term) for key, doc_tokens in tokens.items()}
+        frequencies = {key: tf for key, tf in frequencies.items() if tf}
+        idf = math.log(1 + (len(tokens) - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+        return {key: idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * len(tokens[key]) / average_length))
+                for key, tf in frequencies.items()}
+
+    scores = {}
+    for term in dict.fromkeys(token for keyword in keywords for token in tokenize(keyword)):
+        term_scores = contributions(term)
+        threshold = calculate_dynamic_threshold(term)
+        if fuzzy_penalty > 0 and threshold:
+            for variant in vocabulary:
+                if variant != term and levenshtein_distance(variant, term) <= threshold:
+                    for key, score in contributions(variant).items():
+                        term_scores[key] = max(term_scores.get(key, 0.0), fuzzy_penalty * score)
+        for key, score in term_scores.items():
+            scores[key] = scores.get(key, 0.0) + score
+    return scores
+
+
+def assert_top_k_matches(ranked, expected_scores, k):
+    expected = sorted(expected_scores.values(), reverse=True)[:k]
+    assert [score for _, score, _ in ranked] == pytest.approx(expected)
+    for key, score, _ in ranked:
+        assert score == pytest.approx(expected_scores[key])
+
+
+@pytest.mark.parametrize("fuzzy_penalty", [0.0, 0.5])
+def test_top_k_matches_brute_force_bm25(fuzzy_penalty):
+    rng = random.Random(44)
+    documents = random_corpus(rng, 120)
+    index = build(documents)
+    for _ in range(60):
+        keywords = rng.sample(VOCABULARY, rng.randint(1, 4))
+        k = rng.randint(1, 15)
+        expected = brute_force_bm25(documents, keywords, fuzzy_penalty)
+        assert_top_k_matches(index.top_k(keywords, k, fuzzy_penalty=fuzzy_penalty), expected, k)
+
+
+def test_top_k_only_ranks_the_given_keys():
+    rng = random.Random(440)
+    documents = random_corpus(rng, 80)
+    index = build(documents)
+    keys = rng.sample(sorted(documents), 30)
+    expected = brute_force_bm25(documents, ["python", "sql"])
+    ranked = index.top_k(["python", "sql"], 10, keys)
+    assert_top_k_matches(ranked, {key: score for key, score in expected.items() if key in keys}, 10)
+
+
+def test_top_k_reports_term_frequencies():
+    index = build({"h1": "python python sql", "h2": "pyhton developer", "h3": "java"})
+    ranked = index.top_k(["Python", "sql", "rust"], 5, fuzzy_penalty=0.5)
+    assert [key for key, _, _ in ranked] == ["h1", "h2"]
+    assert ranked[0][2] == {"python": 2, "sql": 1}
+    assert ranked[1][2] == {"python (fuzzy)": 1}
+    assert [(key, matches) for key, _, matches in index.top_k(["python"], 5)] == [("h1", {"python": 2})]
+    assert index.top_k(["rust"], 5) == []
+
+
+def test_upper_bound_is_the_best_contribution():
+    rng = random.Random(441)
+    documents = random_corpus(rng, 50)
+    index = build(documents)
+    for term in ["python", "scrum", "rust"]:
+        assert index.upper_bound(term) == pytest.approx(max(brute_force_bm25(documents, [term]).values(), default=0.0))
+
+
+def occurrences(tokens, phrase):
+    """Start positions of a phrase in a token list"""
+    return [i for i in range(len(tokens) - len(phrase) + 1) if tuple(tokens[i:i + len(phrase)]) == phrase]
+
+
+def brute_force_near(tokens, left, right, max_gap, ordered):
+    """Occurrences of `left` with an occurrence of `right` at most max_gap words away"""
+    right_starts = occurrences(tokens, right)
+    count = 0
+    for start in occurrences(tokens, left):
+        end = start + len(left)
+        after = any(0 <= r - end <= max_gap for r in right_starts)
+        before = not ordered and any(0 <= start - (r + len(right)) <= max_gap for r in right_starts)
+        count += after or before
+    return count
+
+
+def test_phrase_and_proximity_counts_match_brute_force():
+    rng = random.Random(45)
+    words = ["machine", "learning", "data", "python", "sql"]
+    documents = {f"h{i}": " ".join(rng.choice(words) for _ in range(rng.randint(0, 25))) for i in range(150)}
+    index = build(documents)
+    tokens = {key: tokenize(text) for key, text in documents.items()}
+    for _ in range(150):
+        left = tuple(rng.choice(words) for _ in range(rng.randint(1, 2)))
+        right = tuple(rng.choice(words) for _ in range(rng.randint(1, 2)))
+        max_gap = rng.randint(0, 3)
+        ordered = rng.random() < 0.5
+
+        phrase = left + right
+        expected = {key: len(occurrences(doc_tokens, phrase)) for key, doc_tokens in tokens.items()}
+        assert index.match_counts(" ".join(phrase)) == {key: n for key, n in expected.items() if n}
+
+        keyword = f"{' '.join(left)} {'ONEAR' if ordered else 'NEAR'}/{max_gap} {' '.join(right)}"
+        expected = {key: brute_force_near(doc_tokens, left, right, max_gap, ordered) for key, doc_tokens in tokens.items()}
+        assert index.match_counts(keyword) == {key: n for key, n in expected.items() if n}, keyword
+
+
+def test_phrase_and_proximity_terms_rank_like_words():
+    index = build({
+        "h1": "machine learning engineer",
+        "h2": "learning about machine tools",
+        "h3": "machine vision and deep learning",
+        "h4": "sql",
+    })
+    assert index.match_counts("machine learning") == {"h1": 1}
+    assert index.match_counts("machine NEAR/1 learning") == {"h1": 1, "h2": 1}
+    assert index.match_counts("machine ONEAR/3 learning") == {"h1": 1, "h3": 1}
+    assert index.match_counts("Machine  near/0  Learning", ["h2", "h4"]) == {}
+    ranked = index.top_k(["machine ONEAR/3 learning", "sql"], 5)
+    assert {key for key, _, _ in ranked} == {"h1", "h3", "h4"}
+    assert dict((key, matches) for key, _, matches in ranked)["h3"] == {"machine ONEAR/3 learning": 1}
+
+
+@pytest.mark.parametrize("keyword", ["a NEAR/2 b NEAR/2 c", "... NEAR/2 b", "a ONEAR/1 ++"])
+def test_malformed_proximity_queries_are_rejected(keyword):
+    with pytest.raises(ValueError):
+        InvertedIndex().match_counts(keyword)
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from algorithms.levenshtein import levenshtein_batch, levenshtein_distance
+from algorithms.myers import count_occurrences, myers_search, myers_search_many
+from utils.trigram_index import TrigramIndex, fuzzy_query
+
+
+def naive_end_positions(text, pattern, max_edits):
+    """End positions j where some substring text[i:j + 1] is within max_edits edits"""
+    text = text.lower()
+    pattern = pattern.lower()
+    return [j for j in range(len(text))
+            if min(levenshtein_distance(text[i:j + 1], pattern) for i in range(j + 2)) <= max_edits]
+
+
+@pytest.mark.parametrize("text, pattern, max_edits", [
+    ("experienced pyhton developer", "python", 2),
+    ("javascript and java", "java", 1),
+    ("kubernetes kubernets", "kubernetes", 1),
+    ("abc", "abcdef", 3),
+    ("Machine Learning", "learning", 0),
+])
+def test_myers_matches_dynamic_programming(text, pattern, max_edits):
+    assert myers_search(text, pattern, max_edits) == naive_end_positions(text, pattern, max_edits)
+
+
+def test_many_patterns_match_single_pattern_searches():
+    text = "pyhton, jaava and sql developer with docker experience"
+    patterns = ["python", "java", "sql", "dokcer", "rust"]
+    budgets = [2, 1, 0, 2, 1]
+    results = myers_search_many(text, patterns, budgets)
+    for pattern, k in zip(patterns, budgets):
+        assert results[pattern] == myers_search(text, pattern, k)
+
+
+def test_duplicate_patterns_share_one_lane():
+    text = "pyhton python"
+    results = myers_search_many(text, ["python", "sql", "python"], [2, 0, 2])
+    assert results["python"] == myers_search(text, "python", 2)
+    assert count_occurrences(results["python"], len("python"), 2) == 2
+
+
+def test_conflicting_budgets_are_rejected():
+    with pytest.raises(ValueError):
+        myers_search_many("python", ["python", "python"], [1, 2])
+    with pytest.raises(ValueError):
+        myers_search_many("python", ["python", "java"], [1])
+
+
+def test_fuzzy_trigram_filter_keeps_every_document_with_a_match():
+    rng = random.Random(46)
+    alphabet = "abcde "
+    index = TrigramIndex()
+    texts = {}
+    for i in range(300):
+        texts[f"doc{i}"] = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        index.add_document(f"doc{i}", texts[f"doc{i}"])
+    for _ in range(100):
+        keyword = "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 14)))
+        max_edits = rng.randint(1, 3)
+        candidates = set(index.candidates(fuzzy_query(keyword, max_edits), texts))
+        for key, text in texts.items():
+            if myers_search(text, keyword, max_edits):
+                assert key in candidates, (keyword, max_edits, text)
+
+
+def test_fuzzy_query_needs_enough_shared_trigrams():
+    assert fuzzy_query("python", 2) is None
+    kind, (needed, trigrams) = fuzzy_query("machine learning", 3)
+    assert kind == "atleast" and needed == len(trigrams) - 9
+
+
+def test_levenshtein_batch_matches_scalar_distance():
+    rng = random.Random(30)
+    words = ["", "python", "pyhton", "Java", "kubernetes", "café", "naïve", "x"]
+    words += ["".join(rng.choice("abcé ") for _ in range(rng.randint(0, 12))) for _ in range(200)]
+    for keyword in ["python", "cafe", "naive", "abcab"]:
+        distances = levenshtein_batch(keyword, words)
+        assert distances.tolist() == [levenshtein_distance(keyword, word) for word in words]
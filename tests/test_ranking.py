@@ -0,0 +1,41 @@
+import random
+
+from utils.sharding import detail_id_key, merge_ranked, rank_key
+from utils.streaming import TopN
+
+
+def make_results(rng, count):
+    results = []
+    for i in range(count):
+        detail_id = rng.randint(1, 50) if i % 4 else f"upload_detail_{rng.randint(0, 9)}"
+        results.append({"applicant": {"detail_id": detail_id}, "score": rng.randint(0, 4)})
+    return results
+
+
+def test_top_n_without_tie_break_keeps_arrival_order():
+    top = TopN(3)
+    for name, score in [("a", 1), ("b", 2), ("c", 1), ("d", 2), ("e", 1)]:
+        top.push(score, name)
+    assert top.ranked() == ["b", "d", "a"]
+
+
+def test_top_n_tie_break_matches_rank_key_order():
+    rng = random.Random(7)
+    for _ in range(200):
+        results = make_results(rng, rng.randint(0, 30))
+        n = rng.randint(1, 10)
+        top = TopN(n, tie_break=detail_id_key)
+        for result in results:
+            top.push(result["score"], result)
+        expected = sorted(results, key=rank_key)[:n]
+        assert [rank_key(r) for r in top.ranked()] == [rank_key(r) for r in expected]
+
+
+def test_local_and_sharded_rankings_agree():
+    rng = random.Random(11)
+    results = make_results(rng, 40)
+    local = TopN(10, tie_break=detail_id_key)
+    for result in reversed(results):
+        local.push(result["score"], result)
+    shards = [sorted(results[i::3], key=rank_key) for i in range(3)]
+    assert [rank_key(r) for r in local.ranked()] == [rank_key(r) for r in merge_ranked(shards, 10)]
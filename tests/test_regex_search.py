@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from algorithms.regex_search import (FieldExtractor, RegexPatternError, analyze_pattern_complexity,
+                                     extract_education_info, extract_email_addresses, pattern_needs_sandbox)
+from algorithms.skills_matcher import SkillsMatcher
+from utils.search_engine import regex_match_counts
+
+
+@pytest.mark.parametrize("pattern", [
+    "(a+)+", "(a|ab)*", "(.*a){12}x", r"\w*\w*\w*x", r"\d*\s*\d*\s*\d*", r".*\s+.*", r"(\w+\s){2}",
+])
+def test_catastrophic_patterns_are_rejected(pattern):
+    assert analyze_pattern_complexity(pattern)
+
+
+@pytest.mark.parametrize("pattern, sandboxed", [
+    ("python", False),
+    (r"\bsql\b", False),
+    (r"\w+@\w+\.\w+", False),
+    (r"python.*\d+", False),
+    (r"[A-Z]{2,}\d{4}", False),
+    (r"a.*b.*c", True),
+    (r"(?=.*java)python", True),
+])
+def test_only_polynomial_patterns_need_the_sandbox(pattern, sandboxed):
+    assert analyze_pattern_complexity(pattern) == []
+    assert pattern_needs_sandbox(pattern) is sandboxed
+
+
+def test_regex_match_counts_in_process():
+    counts, timed_out = regex_match_counts("python, Java and PYTHON; sql", ["python", r"\bsql\b", "rust"])
+    assert counts == {"python": 2, r"\bsql\b": 1}
+    assert timed_out == []
+
+
+def test_unsafe_pattern_raises():
+    with pytest.raises(RegexPatternError):
+        regex_match_counts("aaaa", ["(a+)+"])
+
+
+def test_runaway_pattern_is_stopped_at_the_budget():
+    text = "xy " * 1500 + "python"
+    start = time.perf_counter()
+    counts, timed_out = regex_match_counts(text, ["python", ".*x.*y.*z"], time_budget=0.2)
+    # Generous bound: the first call also boots the sandbox process
+    assert time.perf_counter() - start < 5
+    assert counts == {"python": 1}
+    assert timed_out == [".*x.*y.*z"]
+
+
+CV_TEXT = """John Doe  john.doe@mail.com, JOHN.DOE@mail.com, john.doe@mail.com
+Phone: (555) 123-4567 / 555-123-4567 / +62 812 3456 7890
+Bachelor of Computer Science, University of Indonesia 2019 - 2023. GPA: 3.85
+M.Tech in Data Science
+Skills: JavaScript, SQL, machine learning, java
+"""
+
+
+def field_extractor():
+    return FieldExtractor(SkillsMatcher.from_skills(["Java", "JavaScript", "SQL", "Python"]))
+
+
+def test_field_extractor_sorts_every_hit_into_its_field():
+    fields = field_extractor().extract(CV_TEXT)
+    assert fields["emails"] == ["john.doe@mail.com", "JOHN.DOE@mail.com"]
+    assert fields["phones"] == ["(555) 123-4567", "555-123-4567", "+62 812 3456 7890"]
+    assert fields["skills"] == ["Java", "JavaScript", "SQL"]
+    # The degree line is sliced out after the keyword, so the hits inside it are still found
+    assert fields["education"] == [
+        "Bachelor of Computer Science, University of Indonesia 2019 - 2023.",
+        "University of Indonesia",
+        "2019 - 2023",
+        "GPA: 3.85",
+        "M.Tech in Data Science\n",
+    ]
+
+
+def test_field_extractor_agrees_with_the_separate_patterns():
+    fields = field_extractor().extract(CV_TEXT)
+    assert fields["emails"] == list(dict.fromkeys(extract_email_addresses(CV_TEXT)))
+    assert sorted(fields["education"]) == sorted(extract_education_info(CV_TEXT))
+
+
+def test_year_ranges_are_not_phone_numbers_and_skills_are_whole_words():
+    fields = field_extractor().extract("Studied 2015 - 2019, built tools in JavaScript")
+    assert fields["phones"] == []
+    assert fields["education"] == ["2015 - 2019"]
+    assert fields["skills"] == ["JavaScript"]
+
+
+def test_extract_many_matches_extract():
+    extractor = field_extractor()
+    texts = {"a": CV_TEXT, "b": "", "c": "MBA. Contact: ana@x.org"}
+    assert extractor.extract_many(texts) == {key: extractor.extract(text) for key, text in texts.items()}
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from algorithms.horspool import horspool_search
+from algorithms.kmp import kmp_search
+from algorithms.shift_or import shift_or_search
+from algorithms.sunday import sunday_search
+from algorithms.two_way import critical_factorization, two_way_search
+
+ENGINES = [horspool_search, sunday_search, two_way_search, shift_or_search]
+
+
+def naive_search(text, pattern):
+    """Reference: every (overlapping) occurrence, case-insensitive like the engines"""
+    if not pattern or not text:
+        return []
+    text = text.lower()
+    pattern = pattern.lower()
+    matches = []
+    position = text.find(pattern)
+    while position != -1:
+        matches.append(position)
+        position = text.find(pattern, position + 1)
+    return matches
+
+
+CASES = [
+    ("", ""),
+    ("", "abc"),
+    ("abc", ""),
+    ("ab", "abc"),
+    ("abc", "abc"),
+    ("Python and PYTHON and python", "python"),
+    ("aaaaaaaa", "aa"),
+    ("aaaaaaaa", "aaa"),
+    ("abababababa", "aba"),
+    ("abababababab", "abab"),
+    ("abcabcabcabcab", "abcabc"),
+    ("aabaabaabaabaab", "aabaab"),
+    ("babbbabbbabbbab", "abbba"),
+    ("xyzxyzxyzxyx", "xyzxyx"),
+    ("zzzzzzzzzzza", "zzza"),
+    ("Pengalaman kerja di Jakarta, pengalaman", "pengalaman"),
+    ("café crème brûlée café", "café"),
+    ("Straße, STRASSE, straße", "straße"),
+    ("数据分析师 数据工程师 数据", "数据"),
+    ("日本語日本語日本", "日本語日本"),
+    ("😀😀😀 emoji 😀", "😀😀"),
+    ("résumé RÉSUMÉ Résumé", "résumé"),
+]
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: engine.__name__)
+@pytest.mark.parametrize("text, pattern", CASES)
+def test_engine_matches_reference(engine, text, pattern):
+    expected = naive_search(text, pattern)
+    assert kmp_search(text, pattern) == expected
+    assert engine(text, pattern) == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: engine.__name__)
+def test_random_small_alphabet(engine):
+    # A tiny alphabet makes periodic patterns and overlapping matches common
+    rng = random.Random(3)
+    for _ in range(500):
+        text = "".join(rng.choice("ab") for _ in range(rng.randint(0, 40)))
+        pattern = "".join(rng.choice("ab") for _ in range(rng.randint(1, 8)))
+        assert engine(text, pattern) == naive_search(text, pattern), (text, pattern)
+
+
+@pytest.mark.parametrize("pattern", ["a" * 50, "ab" * 30, "abaababaab" * 5, "aab" * 20 + "b"])
+def test_two_way_periodic_patterns(pattern):
+    # Periodic patterns take the memory branch of Two-Way
+    text = pattern[:7] + pattern * 3 + pattern[:-1] + "b" + pattern
+    ell, period = critical_factorization(pattern)
+    assert 0 < period <= len(pattern)
+    assert -1 <= ell < len(pattern)
+    assert two_way_search(text, pattern) == naive_search(text, pattern)
+
+
+@pytest.mark.parametrize("length", [63, 64, 65, 128, 200])
+def test_shift_or_pattern_longer_than_machine_word(length):
+    rng = random.Random(length)
+    pattern = "".join(rng.choice("abc") for _ in range(length))
+    text = "c" * 10 + pattern + pattern[:length // 2] + pattern + "abc" * 20
+    expected = naive_search(text, pattern)
+    assert expected
+    assert shift_or_search(text, pattern) == expected
+    assert shift_or_search(text, "a" * length) == naive_search(text, "a" * length)
@@ -0,0 +1,77 @@
+import pytest
+
+import utils.search_history as search_history
+from utils.search_history import SearchHistory, query_cache_key, restore_results, stored_results
+
+
+def source(detail_id, cv_path, name="Ana"):
+    return {"cv_path": cv_path, "applicant": {"detail_id": detail_id, "cv_path": cv_path, "first_name": name}}
+
+
+BASE_QUERY = (["python", "sql"], "KMP", True, "count", 0.5, 10)
+
+
+def test_query_cache_key_ignores_keyword_order_and_duplicates():
+    assert query_cache_key(*BASE_QUERY) == query_cache_key(["sql", "python", "sql"], *BASE_QUERY[1:])
+
+
+@pytest.mark.parametrize("position, value", [
+    (0, ["python"]), (1, "Boyer-Moore"), (2, False), (3, "bm25"), (4, 0.25), (5, 20),
+])
+def test_query_cache_key_changes_with_every_ranking_parameter(position, value):
+    changed = list(BASE_QUERY)
+    changed[position] = value
+    assert query_cache_key(*changed) != query_cache_key(*BASE_QUERY)
+
+
+def test_query_cache_key_follows_the_results_version(monkeypatch):
+    before = query_cache_key(*BASE_QUERY)
+    monkeypatch.setattr(search_history, "SEARCH_RESULTS_VERSION", search_history.SEARCH_RESULTS_VERSION + 1)
+    assert query_cache_key(*BASE_QUERY) != before
+
+
+def test_restore_results_round_trip():
+    sources = [source(7, "/cv/a.pdf"), source("upload_detail_1", "/uploads/b.pdf", "Budi")]
+    ranking = [
+        {"applicant": sources[1]["applicant"], "matches": {"python": 2}, "score": 3},
+        {"applicant": sources[0]["applicant"], "matches": {"sql": 1}, "score": 1},
+    ]
+    rows = stored_results(ranking)
+    assert [row["detail_id"] for row in rows] == [None, 7]
+
+    # Applicant data comes from the current sources, scores from the DOUBLE column
+    renamed = [source(7, "/cv/a.pdf", "Ana Maria"), sources[1]]
+    for row in rows:
+        row["score"] = float(row["score"])
+    restored = restore_results(rows, renamed)
+    assert [result["applicant"]["first_name"] for result in restored] == ["Budi", "Ana Maria"]
+    assert [result["score"] for result in restored] == [3, 1]
+    assert all(isinstance(result["score"], int) for result in restored)
+    assert [result["matches"] for result in restored] == [{"python": 2}, {"sql": 1}]
+    assert restore_results(rows, renamed, integer_scores=False)[0]["score"] == 3.0
+
+
+def test_restore_results_gives_up_when_a_cv_is_gone():
+    rows = stored_results([{"applicant": source(7, "/cv/a.pdf")["applicant"], "matches": {"sql": 1}, "score": 1}])
+    assert restore_results(rows, [source(8, "/cv/a.pdf")]) is None
+    assert restore_results([], []) == []
+
+
+def test_lookup_answers_recorded_searches_from_memory(monkeypatch):
+    def no_database():
+        raise ConnectionError("no database in tests")
+
+    monkeypatch.setattr(search_history, "open_db_connection", no_database)
+    history = SearchHistory(flush_interval=60)
+    try:
+        ranking = [{"applicant": source(7, "/cv/a.pdf")["applicant"], "matches": {"sql": 1}, "score": 1}]
+        key = query_cache_key(*BASE_QUERY)
+        history.record("python, sql", key, "fingerprint", "KMP", "count", 10, ranking, 0.1, 0.0, 1)
+        history.record("regex", "regex-key", "fingerprint", "Regex", "count", 10, ranking, 0.1, 0.0, 1,
+                       cacheable=False)
+        assert history.lookup(key, "fingerprint") == stored_results(ranking)
+        assert history.lookup(key, "other fingerprint") is None
+        assert history.lookup("regex-key", "fingerprint") is None
+        assert history.lookup("missing", "fingerprint", use_database=True) is None
+    finally:
+        history.close()
@@ -0,0 +1,23 @@
+import math
+
+import pytest
+
+from utils.service import SearchService
+
+
+@pytest.mark.parametrize("fuzzy_penalty", [0, 0.25, 1, "0.5"])
+def test_parse_search_accepts_fuzzy_penalty_in_range(fuzzy_penalty):
+    _, _, _, _, parsed = SearchService._parse_search({"keywords": ["python"], "fuzzy_penalty": fuzzy_penalty})
+    assert parsed == float(fuzzy_penalty)
+
+
+@pytest.mark.parametrize("fuzzy_penalty", [-0.1, 1.5, math.nan, math.inf, -math.inf, "abc", None])
+def test_parse_search_rejects_fuzzy_penalty_out_of_range(fuzzy_penalty):
+    with pytest.raises(ValueError):
+        SearchService._parse_search({"keywords": ["python"], "fuzzy_penalty": fuzzy_penalty})
+
+
+@pytest.mark.parametrize("top_n", [0, 201, "ten"])
+def test_parse_search_rejects_top_n_out_of_range(top_n):
+    with pytest.raises(ValueError):
+        SearchService._parse_search({"keywords": ["python"], "top_n": top_n})
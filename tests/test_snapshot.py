@@ -0,0 +1,103 @@
+import os
+import struct
+
+import pytest
+
+import utils.cv_cache as cv_cache
+from utils.cv_cache import CVTextCache
+from utils.index_snapshot import (SNAPSHOT_MAGIC, SNAPSHOT_VERSION, LazyTable, SnapshotReader, SnapshotWriter,
+                                  open_snapshot, pack_table, unpack_table)
+
+SCHEMA = "test_snapshot/1"
+
+
+def write_snapshot(path):
+    writer = SnapshotWriter(path, SCHEMA)
+    writer.add_entry("h1", {"normal": "Python Developer", "processed": b"python developer"}, {"summary_version": 3})
+    writer.add_entry("h2", {"normal": "Café ☕", "processed": "café ☕"})
+    writer.add_global("postings", b"\x00\x01\x02")
+    writer.commit(extra={"paths": {"/cv/a.pdf": [1, 2, "h1"]}})
+
+
+def test_snapshot_write_and_reopen(tmp_path):
+    path = str(tmp_path / "cache.snap")
+    write_snapshot(path)
+    assert os.listdir(tmp_path) == ["cache.snap"]
+
+    with SnapshotReader(path, SCHEMA) as reader:
+        assert sorted(reader.keys()) == ["h1", "h2"]
+        assert "h1" in reader and "h3" not in reader
+        assert reader.meta("h1") == {"summary_version": 3}
+        assert reader.meta("h2") == {}
+        assert reader.read_text("h1", "normal") == "Python Developer"
+        assert reader.read_section("h1", "processed") == b"python developer"
+        assert reader.read_text("h2", "processed") == "café ☕"
+        assert reader.read_global("postings") == b"\x00\x01\x02"
+        assert reader.read_global("missing") is None
+        assert reader.extra == {"paths": {"/cv/a.pdf": [1, 2, "h1"]}}
+
+
+def test_schema_mismatch_is_rejected(tmp_path):
+    path = str(tmp_path / "cache.snap")
+    write_snapshot(path)
+    with pytest.raises(ValueError, match="schema"):
+        SnapshotReader(path, "test_snapshot/2")
+    assert open_snapshot(path, "test_snapshot/2") is None
+    assert open_snapshot(path, SCHEMA) is not None
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not a snapshot",
+    struct.pack("<8sIIQQ", SNAPSHOT_MAGIC, SNAPSHOT_VERSION + 1, 0, 32, 2) + b"{}",
+    struct.pack("<8sIIQQ", SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, 32, 100) + b"{",
+])
+def test_unreadable_snapshot_is_ignored(tmp_path, data):
+    path = tmp_path / "cache.snap"
+    path.write_bytes(data)
+    assert open_snapshot(str(path), SCHEMA) is None
+    assert open_snapshot(str(tmp_path / "missing.snap"), SCHEMA) is None
+
+
+def test_aborted_write_leaves_nothing_behind(tmp_path):
+    path = str(tmp_path / "cache.snap")
+    writer = SnapshotWriter(path, SCHEMA)
+    writer.add_entry("h1", {"processed": "python"})
+    writer.abort()
+    assert os.listdir(tmp_path) == []
+
+
+def test_cv_cache_ignores_a_snapshot_of_another_schema(tmp_path, monkeypatch):
+    cv_path = tmp_path / "cv.pdf"
+    cv_path.write_bytes(b"%PDF not really")
+    path = str(tmp_path / "cache.snap")
+    cache = CVTextCache()
+    cache.content_hash(str(cv_path))
+    assert cache.save_snapshot(path)
+    # Only the path -> hash table was saved; it is what a matching reader picks up
+    current = CVTextCache()
+    current.load_snapshot(path)
+    assert str(cv_path) in current._path_hashes
+
+    monkeypatch.setattr(cv_cache, "SNAPSHOT_SCHEMA", "cv_text_cache/next")
+    stale = CVTextCache()
+    assert stale.load_snapshot(path) == 0
+    assert str(cv_path) not in stale._path_hashes
+
+
+def test_packed_table_round_trip():
+    rows = {"pyt": [0, 3, 7], "yth": [], "big": [2 ** 32 - 1]}
+    header, directory, values = unpack_table(pack_table({"keys": ["a", None]}, rows.items()))
+    assert header == {"keys": ["a", None]}
+    table = LazyTable(directory, values, list)
+    assert len(table) == 3 and "pyt" in table and "xyz" not in table
+    assert table["pyt"] == [0, 3, 7]
+    assert table.get("xyz") is None
+    assert sorted(table) == sorted(rows)
+    assert {name: table[name] for name in table.materialize()} == rows
+
+
+@pytest.mark.parametrize("data", [b"", b"\x05\x00\x00\x00\x00\x00\x00\x00{}", b"\x02\x00\x00\x00\x00\x00\x00\x00{}\x01"])
+def test_corrupt_packed_table(data):
+    with pytest.raises(ValueError):
+        unpack_table(data)
@@ -0,0 +1,64 @@
+import hashlib
+import random
+
+import pytest
+
+from algorithms.suffix_array import SuffixIndex, build_suffix_array, open_suffix_index, write_suffix_index
+
+
+def digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def naive_count(text, pattern):
+    """Overlapping occurrences, like the suffix array counts them"""
+    return sum(text.startswith(pattern, i) for i in range(len(text)))
+
+
+@pytest.mark.parametrize("text", ["", "a", "banana", "mississippi\0", "aaaaaaaa", "café\0naïve café"])
+def test_suffix_array_matches_sorted_suffixes(text):
+    assert build_suffix_array(text).tolist() == sorted(range(len(text)), key=lambda i: text[i:])
+
+
+def test_random_suffix_arrays():
+    rng = random.Random(36)
+    for _ in range(100):
+        text = "".join(rng.choice("ab\0é") for _ in range(rng.randint(0, 60)))
+        assert build_suffix_array(text).tolist() == sorted(range(len(text)), key=lambda i: text[i:])
+
+
+def test_count_per_doc_matches_naive_counting(tmp_path):
+    rng = random.Random(360)
+    texts = ["".join(rng.choice("abcé ") for _ in range(rng.randint(0, 80))) for _ in range(60)]
+    texts += ["python developer, python", "", "ééé"]
+    path = str(tmp_path / "corpus.suffix")
+    assert write_suffix_index(path, [(digest(text), text) for text in texts]) == len(set(texts))
+
+    with SuffixIndex(path) as index:
+        assert sorted(index.keys()) == sorted({digest(text) for text in texts})
+        patterns = ["python", "PYTHON", "é", "éé", "a b", "zzz"]
+        patterns += ["".join(rng.choice("abcé ") for _ in range(rng.randint(1, 4))) for _ in range(200)]
+        for pattern in patterns:
+            expected = {digest(text): naive_count(text, pattern.lower()) for text in set(texts)}
+            expected = {key: count for key, count in expected.items() if count}
+            assert index.count_per_doc(pattern) == expected, pattern
+            assert index.count(pattern) == sum(expected.values())
+
+
+def test_matches_never_span_two_documents(tmp_path):
+    path = str(tmp_path / "corpus.suffix")
+    write_suffix_index(path, [(digest("java"), "java"), (digest("script"), "script")])
+    with SuffixIndex(path) as index:
+        assert index.count_per_doc("javascript") == {}
+        assert index.count_per_doc("java\0script") == {}
+        assert index.count_per_doc("") == {}
+        assert index.count_per_doc("a") == {digest("java"): 2}
+
+
+def test_corpus_size_limit_and_unreadable_index(tmp_path):
+    path = str(tmp_path / "corpus.suffix")
+    with pytest.raises(ValueError):
+        write_suffix_index(path, [(digest("abc"), "abc"), (digest("def"), "def")], max_chars=5)
+    (tmp_path / "garbage.suffix").write_bytes(b"not a suffix index")
+    assert open_suffix_index(str(tmp_path / "garbage.suffix")) is None
+    assert open_suffix_index(path) is None
@@ -0,0 +1,90 @@
+import random
+import re
+
+import pytest
+
+from utils.trigram_index import MATCH_ALL, TrigramIndex, keywords_query, literal_query, regex_query
+
+ALPHABET = "abcx "
+
+
+def random_text(rng):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+
+
+def random_pattern(rng, depth=0):
+    """A small regex over the text alphabet built from the constructs the planner handles"""
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        kind = rng.randrange(10 if depth < 2 else 6)
+        if kind < 3:
+            parts.append("".join(rng.choice("abcxABC") for _ in range(rng.randint(1, 5))))
+        elif kind == 3:
+            parts.append(rng.choice([".", "[ab]", "[^x]", r"\s", r"\w", r"\b", "^", "$"]))
+        elif kind == 4:
+            parts.append(rng.choice("abc") + rng.choice(["?", "*", "+", "{2}", "{0,2}", "+?"]))
+        elif kind == 5:
+            parts.append(rng.choice(["(?=ab)", "(?!abc)", "(?<=a)"]))
+        elif kind < 8:
+            parts.append("(" + random_pattern(rng, depth + 1) + ")" + rng.choice(["", "", "?", "*", "+", "{1,2}"]))
+        else:
+            parts.append("(?:" + "|".join(random_pattern(rng, depth + 1) for _ in range(rng.randint(2, 3))) + ")")
+    return "".join(parts)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = random.Random(35)
+    texts = {f"doc{i}": random_text(rng) for i in range(400)}
+    index = TrigramIndex()
+    for key, text in texts.items():
+        index.add_document(key, text)
+    return texts, index
+
+
+def test_regex_plan_never_drops_a_matching_document(corpus):
+    texts, index = corpus
+    rng = random.Random(350)
+    constrained = 0
+    for _ in range(400):
+        pattern = random_pattern(rng)
+        query = regex_query(pattern)
+        constrained += query is not MATCH_ALL
+        candidates = set(index.candidates(query, texts))
+        for key, text in texts.items():
+            if re.search(pattern, text, re.IGNORECASE):
+                assert key in candidates, (pattern, text)
+    # The check above is vacuous if nothing is ever pruned
+    assert constrained > 100
+
+
+def test_keyword_plan_never_drops_a_matching_document(corpus):
+    texts, index = corpus
+    rng = random.Random(351)
+    for _ in range(200):
+        keywords = ["".join(rng.choice("abcxABC ") for _ in range(rng.randint(1, 6))) for _ in range(rng.randint(1, 3))]
+        candidates = set(index.candidates(keywords_query(keywords, "KMP"), texts))
+        for key, text in texts.items():
+            if any(keyword.lower() in text for keyword in keywords):
+                assert key in candidates, (keywords, text)
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    ("python", literal_query("python")),
+    ("py(thon)", literal_query("python")),
+    (r"\bsql\b", literal_query("sql")),
+    ("java|rust", ("or", [literal_query("java"), literal_query("rust")])),
+    ("(react)+ native", ("and", [literal_query("react"), literal_query(" native")])),
+    ("py.*on", MATCH_ALL),
+    ("(sql)? developer", literal_query(" developer")),
+    ("java|.*", MATCH_ALL),
+])
+def test_regex_plans(pattern, expected):
+    assert regex_query(pattern) == expected
+
+
+def test_unindexed_documents_are_always_candidates():
+    index = TrigramIndex()
+    index.add_document("indexed", "python developer")
+    assert index.candidates(literal_query("rust"), ["indexed", "new"]) == ["new"]
+    assert index.candidates(literal_query("python"), ["indexed", "new"]) == ["indexed", "new"]
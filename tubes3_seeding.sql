@@ -2,6 +2,8 @@ SET NAMES 'utf8mb4' COLLATE 'utf8mb4_unicode_ci';
 
 SET FOREIGN_KEY_CHECKS = 0;
 
+DROP TABLE IF EXISTS SearchResult;
+DROP TABLE IF EXISTS SearchLog;
 DROP TABLE IF EXISTS ApplicationDetail;
 DROP TABLE IF EXISTS ApplicantProfile;
 
@@ -13,7 +15,9 @@ CREATE TABLE ApplicantProfile (
     last_name VARCHAR(50),
     date_of_birth DATE,
     address VARCHAR(255),
-    phone_number VARCHAR(20)
+    phone_number VARCHAR(20),
+    -- Filter umur dijalankan sebagai range pada tanggal lahir
+    INDEX idx_profile_date_of_birth (date_of_birth)
 )ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 CREATE TABLE ApplicationDetail (
@@ -21,7 +25,42 @@ CREATE TABLE ApplicationDetail (
     applicant_id INT NOT NULL,
     application_role VARCHAR(100),
     cv_path TEXT,
-    FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id)
+    upload_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (applicant_id) REFERENCES ApplicantProfile(applicant_id),
+    -- Index sekunder untuk filter pencarian (role dan tanggal upload)
+    INDEX idx_detail_role (application_role),
+    INDEX idx_detail_upload_date (upload_date)
+)ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Riwayat pencarian; juga dipakai sebagai cache hasil per (query_key, corpus_fingerprint)
+CREATE TABLE SearchLog (
+    search_id CHAR(32) PRIMARY KEY,
+    search_query TEXT NOT NULL,
+    query_key CHAR(64) NOT NULL,
+    corpus_fingerprint CHAR(64) NOT NULL,
+    algorithm_used VARCHAR(50) NOT NULL,
+    ranking VARCHAR(50) NOT NULL,
+    top_n INT NOT NULL,
+    duration_exact DOUBLE,
+    duration_fuzzy DOUBLE,
+    total_scanned INT,
+    cacheable BOOLEAN NOT NULL DEFAULT TRUE,
+    searched_at DATETIME NOT NULL,
+    INDEX idx_searchlog_cache (query_key, corpus_fingerprint, searched_at)
+)ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- detail_id NULL untuk CV upload yang tidak ada di database (dikenali lewat cv_path)
+CREATE TABLE SearchResult (
+    search_id CHAR(32) NOT NULL,
+    result_rank INT NOT NULL,
+    detail_id INT NULL,
+    cv_path TEXT,
+    score DOUBLE NOT NULL,
+    matches_found INT NOT NULL,
+    matched_keywords JSON NOT NULL,
+    PRIMARY KEY (search_id, result_rank),
+    FOREIGN KEY (search_id) REFERENCES SearchLog(search_id) ON DELETE CASCADE,
+    FOREIGN KEY (detail_id) REFERENCES ApplicationDetail(detail_id) ON DELETE CASCADE
 )ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 INSERT INTO ApplicantProfile (applicant_id, first_name, last_name, date_of_birth, address, phone_number) VALUES